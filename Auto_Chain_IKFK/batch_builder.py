@@ -0,0 +1,522 @@
+"""
+Auto Chain IK/FK System - Batch Builder
+======================================
+
+Construye el sistema IK/FK completo de muchas cadenas a la vez (piernas, brazos,
+dedos o cadenas de N segmentos) con una sola llamada.
+
+En lugar de repetir el pipeline paso a paso por cada cadena, cada paso se hace
+una sola vez para todas:
+    1. Lectura de la jerarquía de todas las cadenas con una consulta
+    2. Renombrado de las cadenas FK en un lote MEL
+    3. Orientación de todas las cadenas (Tools.joint_orient)
+    4. Lectura de las matrices world de todos los joints en una pasada
+    5. Creación de cadenas IK/MAIN (rename_chain.clone_chains), grupos
+       ROOT/AUTO (create_fk_groups.build_fk_groups) y pole vectors con sus
+       nombres y transformaciones finales (sin duplicate ni constraints
+       temporales)
+    6. IK handles, atributo FKIK y red de blend en un lote (orient constraints +
+       reverse, o un blendMatrix por joint con blend="matrix")
+    7. Shapes de control de todas las cadenas en una evaluación
+
+Descripción de cada cadena (dict):
+    {
+        "root": "joint1",        # joint raíz de la cadena
+        "base_name": "Arm_L",    # nombre base de la nomenclatura
+        "segments": "arm",       # tabla de rename_chain.SEGMENT_TABLES, prefijo
+                                 # libre ("spine" → spine01...) o lista de nombres
+        "end": "joint3",         # opcional: último joint si la cadena se ramifica
+        "version": "001",        # opcional
+    }
+
+Cadenas anidadas:
+    Si el root de una cadena cuelga de un joint de otra (dedos bajo la mano),
+    sus grupos ROOT y sus cadenas IK/MAIN se crean bajo el joint MAIN del padre,
+    para que sigan a la cadena padre tanto en FK como en IK.
+
+Uso:
+    >>> from Auto_Chain_IKFK import batch_builder
+    >>> batch_builder.build_limbs([
+    ...     {"root": "joint1", "base_name": "Leg_L", "segments": "leg"},
+    ...     {"root": "joint4", "base_name": "Arm_L", "segments": "arm", "end": "joint6"},
+    ...     {"root": "joint7", "base_name": "Index_L", "segments": "finger"},
+    ... ])
+"""
+
+import maya.cmds as cmds
+import numpy as np
+
+from Auto_Chain_IKFK import create_fk_groups, matrix_blend, rename_chain
+from Auto_Chain_IKFK.rename_chain import get_segment_names
+from Tools import control_shapes, rig_math, scene_io
+from Tools.deferred_job import run_to_end
+from Tools.joint_orient import orient_joint_chains
+
+
+def _read_chains(limbs):
+    """
+    Lee la cadena (root → end) de cada descripción con una sola consulta de
+    descendientes para todas.
+
+    Cada joint pertenece al root más cercano por encima de él, así una cadena
+    termina donde empieza otra de la lista (la mano donde empiezan los dedos).
+
+    Args:
+        limbs (list[dict]): Descripciones de las cadenas
+
+    Returns:
+        list[list[str]]: Joints (fullPath) de cada cadena; None si no es válida
+    """
+    roots = [
+        (cmds.ls(limb["root"], type="joint", long=True) or [None])[0] for limb in limbs
+    ]
+    found = list(dict.fromkeys(r for r in roots if r))
+
+    descendants = []
+    if found:
+        descendants = (
+            cmds.listRelatives(found, allDescendents=True, type="joint", fullPath=True)
+            or []
+        )
+
+    owned = {root: [] for root in found}
+    for joint in dict.fromkeys(descendants):
+        if joint in owned:
+            continue
+        ancestor = joint.rsplit("|", 1)[0]
+        while ancestor and ancestor not in owned:
+            ancestor = ancestor.rsplit("|", 1)[0]
+        if ancestor:
+            owned[ancestor].append(joint)
+
+    chains = []
+    for limb, root in zip(limbs, roots):
+        if not root:
+            cmds.warning(f"⚠️ No existe el joint raíz {limb['root']}")
+            chains.append(None)
+            continue
+
+        end = limb.get("end")
+        if end:
+            end_long = (cmds.ls(end, type="joint", long=True) or [None])[0]
+            if not end_long or not end_long.startswith(root + "|"):
+                cmds.warning(f"⚠️ {end} no cuelga de {limb['root']}")
+                chains.append(None)
+                continue
+            parts = end_long[len(root) :].split("|")[1:]
+            chain = [root]
+            for part in parts:
+                chain.append(f"{chain[-1]}|{part}")
+            chains.append(chain)
+            continue
+
+        chain = [root] + sorted(owned[root], key=lambda j: j.count("|"))
+        depths = [j.count("|") for j in chain]
+        if len(set(depths)) != len(depths):
+            cmds.warning(
+                f"⚠️ La cadena de {limb['root']} se ramifica; indica su último "
+                "joint con 'end'."
+            )
+            chains.append(None)
+            continue
+        chains.append(chain)
+    return chains
+
+
+def _limb_names(base_name, segments, version, blend="constraint"):
+    """Nombres finales de todos los nodos de una cadena."""
+
+    def names(kind):
+        return [f"{seg}_{base_name}_{kind}_{version}" for seg in segments]
+
+    middle = segments[len(segments) // 2]
+    main = names("MAIN")
+    matrix = blend == "matrix"
+    return {
+        "base_name": base_name,
+        "version": version,
+        "segments": list(segments),
+        "fk": names("joint"),
+        "ik": names("IK"),
+        "main": main,
+        "root_groups": names("root"),
+        "auto_groups": names("auto"),
+        "controls": [f"{name}Shape" for name in names("ctrl")],
+        "pole_vector_grp": f"{middle}_{base_name}_IKpoleVector_{version}",
+        "pole_vector_root": f"{middle}_{base_name}_IKpoleVectorRoot_{version}",
+        "pole_vector_ctrl": f"{middle}_{base_name}_IKpoleVectorCtrl_{version}Shape",
+        "ik_handle": f"{middle}_{base_name}_IKhandle_{version}",
+        "effector": f"{middle}_{base_name}_effector_{version}",
+        "constraints": [] if matrix else [f"{m}_orientConstraint1" for m in main],
+        "reverse": None if matrix else f"{base_name}_reverse_{version}",
+        "blend_nodes": (
+            matrix_blend.get_blend_names(base_name, version, segments) if matrix else []
+        ),
+        "fkik_shape": f"{base_name}_attributes_{version}Shape",
+    }
+
+
+def _created_names(limb):
+    """Nombres de los nodos que el builder crea (no incluye las cadenas FK)."""
+    singles = [
+        limb["pole_vector_grp"],
+        limb["pole_vector_root"],
+        limb["ik_handle"],
+        limb["effector"],
+        limb["fkik_shape"],
+        limb["reverse"],
+    ]
+    return (
+        limb["ik"]
+        + limb["main"]
+        + limb["root_groups"]
+        + limb["auto_groups"]
+        + limb["constraints"]
+        + [
+            n
+            for node in limb["blend_nodes"]
+            for n in matrix_blend.get_network_names(node)
+        ]
+        + [name for name in singles if name]
+    )
+
+
+def _create_node_line(node_type, name, parent=None):
+    parent_flag = f" -p {scene_io.mel_string(parent)}" if parent else ""
+    return f"createNode {node_type} -n {scene_io.mel_string(name)}{parent_flag};"
+
+
+def _rig_lines(limb):
+    """Líneas MEL del IK handle, constraints, atributo FKIK y red de blend."""
+    q = scene_io.mel_string
+    fkik = f"{limb['fkik_shape']}.FKIK"
+
+    lines = [
+        # --- IK handle (RPsolver) del primer al último joint ---
+        f"{{ string $ik[] = `ikHandle -sj {q(limb['ik'][0])} -ee {q(limb['ik'][-1])} "
+        f'-sol "ikRPsolver" -n {q(limb["ik_handle"])}`; '
+        f"rename $ik[1] {q(limb['effector'])}; }}",
+        f"poleVectorConstraint {q(limb['pole_vector_grp'])} {q(limb['ik_handle'])};",
+        # --- Atributo FKIK en una shape de locator bajo el joint FK raíz ---
+        _create_node_line("locator", limb["fkik_shape"], limb["fk"][0]),
+        f'addAttr -ln "FKIK" -at "float" -min 0 -max 1 -dv 0 -k 1 '
+        f"{q(limb['fkik_shape'])};",
+    ]
+
+    # --- Modo matriz: un blendMatrix por joint MAIN ---
+    if limb["blend_nodes"]:
+        for args in zip(limb["fk"], limb["ik"], limb["main"], limb["blend_nodes"]):
+            lines += matrix_blend.mel_matrix_blend(*args, fkik)
+        return lines
+
+    lines += [
+        _create_node_line("reverse", limb["reverse"]),
+        f"connectAttr -f {q(fkik)} {q(limb['reverse'] + '.inputX')};",
+    ]
+
+    # --- Orient constraints FK + IK → MAIN con sus pesos conectados ---
+    for fk, ik, main, constraint in zip(
+        limb["fk"], limb["ik"], limb["main"], limb["constraints"]
+    ):
+        lines += [
+            f"orientConstraint -n {q(constraint)} {q(fk)} {q(ik)} {q(main)};",
+            f"connectAttr -f {q(limb['reverse'] + '.outputX')} "
+            f"{q(f'{constraint}.{fk}W0')};",
+            f"connectAttr -f {q(fkik)} {q(f'{constraint}.{ik}W1')};",
+        ]
+    return lines
+
+
+def build_limbs(
+    limbs,
+    radius=2.0,
+    up=(0.0, 0.0, 1.0),
+    offset_parent_matrix=False,
+    blend="constraint",
+    pole_distance=0.5,
+    fk_layout="groups",
+):
+    """
+    Construye FK, IK, MAIN, constraints y blend FKIK de varias cadenas a la vez.
+
+    Args:
+        limbs (list[dict]): Descripciones de las cadenas (ver docstring del módulo)
+        radius (float): Radio de los controles FK (default: 2.0)
+        up (tuple): Eje world del eje secundario al orientar (default: +Z)
+        offset_parent_matrix (bool): Alinear los grupos ROOT con
+            offsetParentMatrix (ver create_fk_groups.build_fk_groups)
+        blend (str): Red de blend FK/IK de los MAIN: "constraint" (orient
+            constraints + reverse) o "matrix" (un blendMatrix por joint, Maya 2020+)
+        pole_distance (float): Distancia de cada pole vector a su joint medio,
+            en múltiplos de la longitud del limb (default: 0.5)
+        fk_layout (str): "groups" (grupos ROOT/AUTO) o "matrix" (sin grupos, el
+            joint FK es el control; ver create_fk_groups, Maya 2020+)
+
+    Returns:
+        list[dict]: Nombres de los nodos creados por cadena
+            {"base_name", "fk", "ik", "main", "root_groups", "auto_groups",
+             "ik_handle", "pole_vector_grp", "constraints", "fkik_shape", ...}
+
+    Requisitos:
+        - Cadenas de al menos 3 joints
+        - base_name/version distintos por cadena
+
+    Ejemplo:
+        >>> rigs = build_limbs(
+        ...     [{"root": "joint1", "base_name": "Leg_L"},
+        ...      {"root": "joint4", "base_name": "Leg_R"}]
+        ... )
+        🦾 2 cadenas IK/FK construidas (6 joints)
+    """
+    cmds.undoInfo(openChunk=True, chunkName="Batch IK/FK build")
+    try:
+        return run_to_end(
+            iter_build_limbs(
+                limbs,
+                radius,
+                up,
+                offset_parent_matrix,
+                blend,
+                pole_distance,
+                fk_layout,
+            )
+        )
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+
+def iter_build_limbs(
+    limbs,
+    radius=2.0,
+    up=(0.0, 0.0, 1.0),
+    offset_parent_matrix=False,
+    blend="constraint",
+    pole_distance=0.5,
+    fk_layout="groups",
+):
+    """
+    Versión por etapas de build_limbs para los trabajos diferidos: hace yield
+    entre las etapas del lote con la fracción completada.
+    """
+    if blend not in ("constraint", "matrix"):
+        cmds.warning(f"⚠️ Modo de blend desconocido: {blend}")
+        return []
+    if fk_layout not in ("groups", "matrix"):
+        cmds.warning(f"⚠️ Layout FK desconocido: {fk_layout}")
+        return []
+
+    # --- 1. Leer y validar todas las cadenas ---
+    chains = _read_chains(limbs)
+    builds = []
+    for limb, chain in zip(limbs, chains):
+        if chain is None:
+            continue
+        if len(chain) < 3:
+            cmds.warning(f"⚠️ {limb['root']}: el IK necesita al menos 3 joints.")
+            continue
+        segments = get_segment_names(len(chain), limb.get("segments", "leg"))
+        if not segments:
+            continue
+        build = _limb_names(
+            limb["base_name"], segments, limb.get("version", "001"), blend
+        )
+        build["source"] = chain
+        builds.append(build)
+
+    if not builds:
+        cmds.warning("⚠️ No hay cadenas válidas para construir.")
+        return []
+
+    # Padres antes que hijos (los dedos después de la mano)
+    builds.sort(key=lambda b: b["source"][0].count("|"))
+
+    new_names = [n for b in builds for n in b["fk"] + _created_names(b)]
+    if len(set(new_names)) != len(new_names):
+        cmds.warning("⚠️ Hay cadenas con el mismo base_name y versión.")
+        return []
+    current = {j.split("|")[-1] for b in builds for j in b["source"]}
+    existing = [n for n in cmds.ls(new_names) or [] if n not in current]
+    if existing:
+        cmds.warning(f"⚠️ Ya existen nodos con los nombres finales: {existing[:5]}")
+        return []
+
+    print("\n" + "=" * 60)
+    print(f"🦾 Construyendo {len(builds)} cadenas IK/FK en lote.")
+    print("=" * 60)
+
+    yield from _iter_build(
+        builds, radius, up, offset_parent_matrix, pole_distance, fk_layout
+    )
+
+    joint_count = sum(len(b["fk"]) for b in builds)
+    print(f"\n🦾 {len(builds)} cadenas IK/FK construidas ({joint_count} joints)")
+    for build in builds:
+        build.pop("source")
+    return builds
+
+
+def _iter_build(builds, radius, up, offset_parent_matrix, pole_distance, fk_layout):
+    # --- 2. Renombrar todas las cadenas FK (los más profundos primero) ---
+    renames = [
+        (src, new)
+        for b in builds
+        for src, new in zip(b["source"], b["fk"])
+        if src.split("|")[-1] != new
+    ]
+    renames.sort(key=lambda r: -r[0].count("|"))
+    scene_io.run_mel_batch(
+        [
+            f"rename {scene_io.mel_string(src)} {scene_io.mel_string(new)};"
+            for src, new in renames
+        ]
+    )
+    yield 1 / 6
+
+    # --- 3. Orientar todas las cadenas en una pasada ---
+    orient_joint_chains([b["fk"][0] for b in builds], up=up)
+    yield 2 / 6
+
+    # --- 4. Matrices world de todos los joints y padres externos ---
+    fk_joints = [j for b in builds for j in b["fk"]]
+    world = scene_io.get_world_matrices(fk_joints)
+    owner = {}  # joint FK → (build, índice)
+    offset = 0
+    for b in builds:
+        b["world"] = world[offset : offset + len(b["fk"])]
+        offset += len(b["fk"])
+        for i, joint in enumerate(b["fk"]):
+            owner[joint] = (b, i)
+
+    for b in builds:
+        parent = cmds.listRelatives(b["fk"][0], parent=True, fullPath=True)
+        parent = parent[0] if parent else None
+        short = parent.split("|")[-1] if parent else None
+        if short in owner:
+            # Cadena anidada: cuelga del joint MAIN equivalente del padre
+            parent_build, index = owner[short]
+            b["parent"] = parent_build["main"][index]
+            b["parent_world"] = parent_build["world"][index]
+        else:
+            b["parent"] = parent
+            b["parent_world"] = (
+                scene_io.get_world_matrices([parent])[0] if parent else np.eye(4)
+            )
+
+    # Pole vectors de todas las cadenas en una sola operación vectorizada
+    positions = np.array(
+        [b["world"][[0, len(b["fk"]) // 2, -1], 3, :3] for b in builds]
+    )
+    poles = rig_math.solve_pole_vectors(
+        positions[:, 0], positions[:, 1], positions[:, 2], pole_distance
+    )
+    for b, pole in zip(builds, poles):
+        b["pole_position"] = pole
+    yield 3 / 6
+
+    # --- 5. Crear nodos con sus nombres y transformaciones finales ---
+    # Cadenas IK/MAIN clonadas de la FK con la orientación ya calculada
+    rename_chain.clone_chains(
+        [b["fk"] for b in builds],
+        [[b["ik"], b["main"]] for b in builds],
+        parents=[b["parent"] for b in builds],
+        world=world,
+        parent_world=[b["parent_world"] for b in builds],
+    )
+    pole_lines = []
+    for b in builds:
+        pole_lines += [
+            _create_node_line("transform", b["pole_vector_root"]),
+            _create_node_line("transform", b["pole_vector_grp"], b["pole_vector_root"]),
+            scene_io.mel_set_double3(
+                f"{b['pole_vector_grp']}.translate", b["pole_position"]
+            ),
+        ]
+    scene_io.run_mel_batch(pole_lines)
+
+    # Grupos ROOT/AUTO de todas las cadenas FK (cadenas anidadas bajo su MAIN)
+    create_fk_groups.build_fk_groups(
+        [b["fk"] for b in builds],
+        parents=[b["parent"] for b in builds],
+        offset_parent_matrix=offset_parent_matrix,
+        layout=fk_layout,
+    )
+    if fk_layout == "matrix":
+        # Sin grupos ROOT: el control (y su shape) es el propio joint FK
+        for b in builds:
+            b["root_groups"] = list(b["fk"])
+    yield 4 / 6
+
+    # --- 6. IK, constraints y blend FKIK de todas las cadenas ---
+    scene_io.run_mel_batch([line for b in builds for line in _rig_lines(b)])
+    yield 5 / 6
+
+    # --- 7. Shapes de control ---
+    control_shapes.create_control_shapes(
+        [g for b in builds for g in b["root_groups"]],
+        "circle",
+        radius=radius,
+        world_matrices=world,
+        names=[c for b in builds for c in b["controls"]],
+    )
+    control_shapes.create_control_shapes(
+        [b["pole_vector_grp"] for b in builds],
+        "circle",
+        radius=1.5,
+        normal=(1, 0, 0),
+        names=[b["pole_vector_ctrl"] for b in builds],
+    )
+
+    for b in builds:
+        b.pop("world")
+        b.pop("parent_world")
+        b.pop("pole_position")
+        print(f"✅ {b['base_name']}: {' > '.join(b['segments'])}")
+
+
+def build_selected_limbs(segments="leg", version="001"):
+    """
+    Construye una cadena IK/FK por cada joint raíz seleccionado.
+
+    El base_name de cada cadena es el nombre del joint raíz seleccionado.
+
+    Args:
+        segments (str | list[str]): Tabla de segmentos para todas las cadenas
+        version (str): Versión del sistema (default: "001")
+
+    Returns:
+        list[dict]: Resultado de build_limbs
+    """
+    limbs = _selected_limbs(segments, version)
+    return build_limbs(limbs) if limbs else []
+
+
+def iter_build_selected_limbs(segments="leg", version="001"):
+    """
+    Versión por etapas de build_selected_limbs para los trabajos diferidos.
+    """
+    limbs = _selected_limbs(segments, version)
+    if not limbs:
+        return []
+    return (yield from iter_build_limbs(limbs))
+
+
+def _selected_limbs(segments, version):
+    """Descripciones de cadena de los joints raíz seleccionados."""
+    selection = cmds.ls(selection=True, type="joint")
+    if not selection:
+        cmds.warning("⚠️ Selecciona los joints raíz de las cadenas a construir.")
+        return []
+
+    return [
+        {
+            "root": root,
+            "base_name": root.split("|")[-1],
+            "segments": segments,
+            "version": version,
+        }
+        for root in selection
+    ]
+
+
+if __name__ == "__main__":
+    build_selected_limbs()
@@ -30,11 +30,14 @@ Convención de Nombres:
 import maya.cmds as cmds
 import re
 
+from Tools import control_shapes, scene_io
 
-def auto_assign_curve_shapes():
+
+def auto_assign_curve_shapes(instance=False, roots=None):
     """
     PASO 5 PARA AUTO CHAIN IK/FK:
-    Crea y asigna curvas de control a los grupos root.
+    Crea y asigna curvas de control a los grupos root (o a los joints FK del
+    layout "matrix" de create_fk_groups, que no tiene grupos).
 
     Proceso Técnico:
         1. Identificación de grupos root
@@ -42,22 +45,21 @@ def auto_assign_curve_shapes():
            - Extrae información de nombre base
            - Obtiene versión del control
 
-        2. Creación de Curvas
-           - Genera círculo como shape base
+        2. Lectura de Joints
+           - Matrices world de todos los joints en una sola pasada
+
+        3. Creación de Shapes
+           - Círculo de la librería Tools.control_shapes
            - Radio: 2 unidades
            - Normal: Y-up orientation
-           - Nombrado según convención
+           - CVs alineados al joint y creados directamente bajo el root
+           - Una sola evaluación MEL para todos los roots
 
-        3. Alineación y Cleanup
-           - Posiciona en joint correspondiente
-           - Aplica rotación del joint
-           - Freeze transformaciones
-           - Elimina historial
-
-        4. Parenting de Shapes
-           - Transfiere shapes al root
-           - Elimina transform temporal
-           - Mantiene jerarquía limpia
+    Args:
+        instance (bool): Si es True, todos los roots comparten una única shape
+            (sin alinear al joint, en el espacio local de cada root)
+        roots (str | list[str]): Nodo(s) bajo los que buscar los grupos root;
+            la búsqueda se limita a sus subárboles (default: toda la escena)
 
     Requisitos:
         - Grupos root ya creados
@@ -76,10 +78,22 @@ def auto_assign_curve_shapes():
     Ejemplo:
         >>> auto_assign_curve_shapes()
         🔄 Asignando curvas de control a 3 roots
-        ✅ Shape de upperLeg_ctrl_001 → upperLeg_root_001
+        ✅ Shape upperLeg_ctrl_001Shape → upperLeg_root_001
     """
-    all_roots = [
-        obj for obj in cmds.ls(type="transform") if re.search(r"_root_\d{3}$", obj)
+    if roots:
+        transforms = [
+            n.split("|")[-1] for n in scene_io.list_subtree(roots, "transform")
+        ]
+    else:
+        transforms = cmds.ls(type="transform")
+    all_roots = [obj for obj in transforms if re.search(r"_root_\d{3}$", obj)]
+    # Layout "matrix" de create_fk_groups: sin grupo ROOT, el control es el joint
+    matrix_autos = set(cmds.ls("*_auto_???", type="multMatrix") or [])
+    all_roots += [
+        obj
+        for obj in transforms
+        if re.search(r"_joint_\d{3}$", obj)
+        and re.sub(r"_joint_", "_auto_", obj) in matrix_autos
     ]
 
     if not all_roots:
@@ -90,8 +104,9 @@ def auto_assign_curve_shapes():
     print(f"🔄 Asignando curvas de control a {len(all_roots)} roots.")
     print("=" * 60)
 
+    targets, joints, names = [], [], []
     for root in all_roots:
-        base_name = re.sub(r"_root_\d{3}$", "", root)
+        base_name = re.sub(r"_(root|joint)_\d{3}$", "", root)
         version_match = re.search(r"_(\d{3})$", root)
         if not version_match:
             cmds.warning(f"⚠️ No se pudo obtener versión de {root}")
@@ -99,51 +114,31 @@ def auto_assign_curve_shapes():
         version = version_match.group(1)
 
         joint_name = f"{base_name}_joint_{version}"
-
-        # Obtener posición y rotación world del joint
-        if cmds.objExists(joint_name):
-            joint_pos = cmds.xform(
-                joint_name, query=True, worldSpace=True, translation=True
-            )
-            joint_rot = cmds.xform(
-                joint_name, query=True, worldSpace=True, rotation=True
-            )
-        else:
+        if not cmds.objExists(joint_name):
             cmds.warning(f"⚠️ No existe el joint correspondiente: {joint_name}")
             continue
 
         ctrl_name = f"{base_name}_ctrl_{version}"
-
-        # Crear curva si no existe
-        if not cmds.objExists(ctrl_name):
-            ctrl_name = cmds.circle(name=ctrl_name, normal=(0, 1, 0), radius=2)[0]
-            print(f"➕ Creada curva: {ctrl_name}")
-
-        # Mover la curva a la posición y rotación del joint
-        cmds.xform(ctrl_name, worldSpace=True, translation=joint_pos)
-        cmds.xform(ctrl_name, worldSpace=True, rotation=joint_rot)
-        print(f"  📍 Posicionada en: {joint_pos}")
-
-        # Congelar transformaciones y eliminar historial antes de parentar
-        cmds.makeIdentity(
-            ctrl_name, apply=True, translate=True, rotate=True, scale=True
-        )
-        cmds.delete(ctrl_name, constructionHistory=True)
-
-        # Obtener shapes de la curva
-        shapes = cmds.listRelatives(ctrl_name, shapes=True, fullPath=True)
-        if not shapes:
-            cmds.warning(f"⚠️ {ctrl_name} no tiene shapes.")
+        if cmds.objExists(f"{root}|{ctrl_name}Shape"):
+            print(f"⏭️ {root} ya tiene la shape {ctrl_name}Shape")
             continue
 
-        # Parentar los shapes al root
-        for sh in shapes:
-            cmds.parent(sh, root, add=True, shape=True)
-
-        # Eliminar el transform vacío del control
-        cmds.delete(ctrl_name)
-
-        print(f"✅ Shape de {ctrl_name} → {root}")
+        targets.append(root)
+        joints.append(joint_name)
+        names.append(f"{ctrl_name}Shape")
+
+    # Matrices world de todos los joints en una lectura; la shape se crea en una
+    # sola evaluación con los CVs ya alineados a cada joint
+    control_shapes.create_control_shapes(
+        targets,
+        "circle",
+        radius=2,
+        world_matrices=None if instance else scene_io.get_world_matrices(joints),
+        names=names,
+        instance=instance,
+    )
+    for root, name in zip(targets, names):
+        print(f"✅ Shape {name} → {root}")
 
     print("\n" + "=" * 60)
     print("🎉 Curvas asignadas correctamente.")
@@ -27,8 +27,10 @@ Node Network:
 
 import maya.cmds as cmds
 
+from Auto_Chain_IKFK.rename_chain import DEFAULT_SEGMENTS
 
-def connect_fkik_nodes(base_name="Leg_practice_L", version="001"):
+
+def connect_fkik_nodes(base_name="Leg_practice_L", version="001", segments=None):
     """
     PASO 7 PARA AUTO CHAIN IK/FK:
     Conecta el sistema de blend entre FK e IK mediante nodos.
@@ -36,6 +38,7 @@ def connect_fkik_nodes(base_name="Leg_practice_L", version="001"):
     Args:
         base_name (str): Nombre base para la nomenclatura (default: "Leg_practice_L")
         version (str): Número de versión del sistema (default: "001")
+        segments (list[str]): Segmentos de la cadena (default: upperLeg/middleLeg/endLeg)
 
     Proceso Técnico:
         1. Validación del atributo FKIK
@@ -77,10 +80,7 @@ def connect_fkik_nodes(base_name="Leg_practice_L", version="001"):
     # Conectar FKIK → reverse.inputX
     cmds.connectAttr(f"{attr_shape}.FKIK", f"{reverse_node}.inputX", force=True)
 
-    # Segmentos principales de la pierna
-    segments = ["upperLeg", "middleLeg", "endLeg"]
-
-    for seg in segments:
+    for seg in segments or DEFAULT_SEGMENTS:
         constraint = f"{seg}_{base_name}_MAIN_{version}_orientConstraint1"
         if not cmds.objExists(constraint):
             cmds.warning(f"⚠️ No se encontró constraint: {constraint}")
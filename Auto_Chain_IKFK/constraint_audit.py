@@ -0,0 +1,293 @@
+"""
+Auto Chain IK/FK System - Constraint Audit
+=========================================
+
+Auditoría de todos los constraints de la escena en una sola lectura del grafo
+con la API de OpenMaya 2.0, sin consultas de cmds por constraint.
+
+Por cada constraint se obtiene:
+    - Tipo y objeto restringido
+    - Targets con su índice, peso, atributo de peso y nodo que lo mueve
+    - Si tiene offset (maintainOffset)
+
+Sobre esa tabla se revisa la red de blend IK/FK: en cada constraint con un
+target FK (_joint_) y uno IK (_IK_), el peso IK debe venir directamente del
+atributo FKIK y el peso FK de FKIK invertido (reverse).
+
+Uso:
+    >>> from Auto_Chain_IKFK import constraint_audit
+    >>> rows = constraint_audit.audit_constraints()
+    >>> constraint_audit.find_fkik_issues(rows)
+    [{'constraint': 'upperLeg_..._orientConstraint1', 'problem': '...'}]
+    >>> constraint_audit.export_json("C:/temp/constraints.json", rows)
+"""
+
+import json
+import math
+
+import maya.api.OpenMaya as om
+
+
+FK_TOKEN = "_joint_"
+IK_TOKEN = "_IK_"
+FKIK_ATTRIBUTE = "FKIK"
+
+# Nodos que pasan el valor de entrada a la salida (unitConversion, etc.)
+_PASS_THROUGH = {"unitConversion": "input"}
+
+
+def _node_name(node):
+    if node.hasFn(om.MFn.kDagNode):
+        return om.MFnDagNode(node).partialPathName()
+    return om.MFnDependencyNode(node).name()
+
+
+def _plug_name(plug):
+    return f"{_node_name(plug.node())}.{plug.partialName(useLongNames=True)}"
+
+
+def _source(plug):
+    """Plug que alimenta a otro, o None si no está conectado."""
+    source = plug.source()
+    return None if source.isNull else source
+
+
+def _fkik_mode(plug, depth=4):
+    """
+    Sigue las conexiones de entrada de un plug hasta el atributo FKIK.
+
+    Returns:
+        str: "direct" (FKIK), "inverted" (FKIK pasando por un reverse) o None
+    """
+    inverted = False
+    source = _source(plug)
+    while source is not None and depth > 0:
+        if source.partialName(useLongNames=True) == FKIK_ATTRIBUTE:
+            return "inverted" if inverted else "direct"
+        fn = om.MFnDependencyNode(source.node())
+        if fn.typeName == "reverse":
+            inverted = not inverted
+            input_name = "input" + source.partialName(useLongNames=True)[-1]
+        elif fn.typeName in _PASS_THROUGH:
+            input_name = _PASS_THROUGH[fn.typeName]
+        else:
+            return None
+        if not fn.hasAttribute(input_name):
+            return None
+        source = _source(fn.findPlug(input_name, False))
+        depth -= 1
+    return None
+
+
+def _has_offset(fn, elements):
+    """True si el constraint guarda algún offset distinto del neutro."""
+    checks = []
+    if fn.hasAttribute("offset"):
+        rest = 1.0 if fn.typeName == "scaleConstraint" else 0.0
+        checks.append((fn.findPlug("offset", False), rest))
+    for name in ("targetOffsetTranslate", "targetOffsetRotate"):
+        if fn.hasAttribute(name):
+            attr = fn.attribute(name)
+            checks += [(element.child(attr), 0.0) for element in elements]
+
+    for plug, rest in checks:
+        values = [plug.child(i).asDouble() for i in range(plug.numChildren())]
+        if any(not math.isclose(v, rest, abs_tol=1e-6) for v in values):
+            return True
+    return False
+
+
+def _read_constraint(node):
+    fn = om.MFnDependencyNode(node)
+
+    # Objeto restringido: el que alimenta constraintParentInverseMatrix
+    constrained = None
+    if fn.hasAttribute("constraintParentInverseMatrix"):
+        source = _source(fn.findPlug("constraintParentInverseMatrix", False))
+        if source is not None:
+            constrained = _node_name(source.node())
+    if constrained is None and node.hasFn(om.MFn.kDagNode):
+        dag = om.MFnDagNode(node)
+        if dag.parentCount():
+            constrained = _node_name(dag.parent(0))
+
+    targets, elements = [], []
+    if fn.hasAttribute("target"):
+        target_array = fn.findPlug("target", False)
+        weight_attr = fn.attribute("targetWeight")
+        matrix_attr = (
+            fn.attribute("targetParentMatrix")
+            if fn.hasAttribute("targetParentMatrix")
+            else None
+        )
+        for index in target_array.getExistingArrayAttributeIndices():
+            element = target_array.elementByLogicalIndex(index)
+            elements.append(element)
+
+            target = None
+            if matrix_attr is not None:
+                source = _source(element.child(matrix_attr))
+                if source is not None:
+                    target = _node_name(source.node())
+
+            # El peso real vive en el alias {target}W{index} del constraint
+            weight_plug = element.child(weight_attr)
+            alias = _source(weight_plug)
+            if alias is not None and alias.node() == node:
+                weight_plug = alias
+            driver = _source(weight_plug)
+            targets.append(
+                {
+                    "index": index,
+                    "target": target,
+                    "weight": weight_plug.asDouble(),
+                    "weight_attr": _plug_name(weight_plug),
+                    "driver": _plug_name(driver) if driver is not None else None,
+                    "fkik": _fkik_mode(weight_plug),
+                }
+            )
+
+    return {
+        "constraint": _node_name(node),
+        "type": fn.typeName,
+        "constrained": constrained,
+        "maintain_offset": _has_offset(fn, elements),
+        "targets": targets,
+    }
+
+
+def audit_constraints(types=None, nodes=None):
+    """
+    Lee todos los constraints de la escena en una sola pasada.
+
+    Args:
+        types (list[str]): Tipos a incluir, por ejemplo ["orientConstraint"]
+            (default: todos)
+        nodes (list[str]): Revisar solo estos nodos de constraint, por ejemplo
+            los de un subárbol (default: todos los de la escena)
+
+    Returns:
+        list[dict]: Una fila por constraint
+            {
+                "constraint": str,
+                "type": str,
+                "constrained": str,
+                "maintain_offset": bool,
+                "targets": [{"index", "target", "weight", "weight_attr",
+                             "driver", "fkik"}],
+            }
+    """
+    types = set(types) if types else None
+    if nodes is not None:
+        selection = om.MSelectionList()
+        for name in nodes:
+            selection.add(name)
+        found = [selection.getDependNode(i) for i in range(selection.length())]
+    else:
+        found = []
+        it = om.MItDependencyNodes(om.MFn.kConstraint)
+        while not it.isDone():
+            found.append(it.thisNode())
+            it.next()
+
+    return [
+        _read_constraint(node)
+        for node in found
+        if node.hasFn(om.MFn.kConstraint)
+        and (types is None or om.MFnDependencyNode(node).typeName in types)
+    ]
+
+
+def find_fkik_issues(rows):
+    """
+    Revisa la red de blend IK/FK sobre la tabla de audit_constraints.
+
+    Args:
+        rows (list[dict]): Filas de audit_constraints
+
+    Returns:
+        list[dict]: [{"constraint", "constrained", "problem"}, ...]
+    """
+    issues = []
+    for row in rows:
+        names = [t["target"] or "" for t in row["targets"]]
+        fk = [t for t, n in zip(row["targets"], names) if FK_TOKEN in n]
+        ik = [t for t, n in zip(row["targets"], names) if IK_TOKEN in n]
+        if not fk and not ik:
+            continue
+
+        problems = []
+        if not fk or not ik:
+            problems.append("falta el target FK o el IK")
+        problems += [
+            f"peso FK {t['weight_attr']} no viene de FKIK invertido (driver: {t['driver']})"
+            for t in fk
+            if t["fkik"] != "inverted"
+        ]
+        problems += [
+            f"peso IK {t['weight_attr']} no viene de FKIK (driver: {t['driver']})"
+            for t in ik
+            if t["fkik"] != "direct"
+        ]
+        issues += [
+            {
+                "constraint": row["constraint"],
+                "constrained": row["constrained"],
+                "problem": problem,
+            }
+            for problem in problems
+        ]
+    return issues
+
+
+def format_table(rows):
+    """
+    Devuelve la tabla de constraints como texto (una línea por target).
+
+    Args:
+        rows (list[dict]): Filas de audit_constraints
+
+    Returns:
+        str: Tabla lista para imprimir
+    """
+    header = ("constraint", "type", "constrained", "mo", "target", "weight", "driver")
+    lines = []
+    for row in rows:
+        for t in row["targets"] or [{}]:
+            lines.append(
+                (
+                    row["constraint"],
+                    row["type"],
+                    str(row["constrained"]),
+                    "yes" if row["maintain_offset"] else "no",
+                    str(t.get("target")),
+                    f"{t['weight']:.3f}" if "weight" in t else "-",
+                    str(t.get("driver")),
+                )
+            )
+    widths = [max(len(r[i]) for r in [header] + lines) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(value.ljust(width) for value, width in zip(r, widths))
+        for r in [header] + lines
+    )
+
+
+def export_json(path, rows=None, include_issues=True):
+    """
+    Guarda la auditoría en un archivo JSON.
+
+    Args:
+        path (str): Ruta del archivo
+        rows (list[dict]): Filas ya leídas (default: audit_constraints())
+        include_issues (bool): Añadir la revisión IK/FK
+
+    Returns:
+        dict: Contenido escrito {"constraints": [...], "fkik_issues": [...]}
+    """
+    rows = audit_constraints() if rows is None else rows
+    data = {"constraints": rows}
+    if include_issues:
+        data["fkik_issues"] = find_fkik_issues(rows)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    return data
@@ -1,6 +1,9 @@
 import maya.cmds as cmds
+import numpy as np
 import re
 
+from Tools import rig_math, scene_io
+
 
 """
 Auto Chain IK/FK System - FK Groups Setup
@@ -25,23 +28,41 @@ Estructura Jerárquica:
                 └── child_auto_group
                     └── child_joint
 
+Layout "matrix" (Maya 2020+, sin grupos):
+    joint (control; rotate/translate a cero en reposo)
+    └── child_joint
+    {segment}_{basename}_auto_{version} (multMatrix)
+        matrixIn[0]: capa AUTO (identidad; conectar aquí automatizaciones)
+        matrixIn[1]: offset de reposo (matriz local del joint)
+        matrixSum ──> joint.offsetParentMatrix
+
 Convención de Nombres:
     {segment}_{basename}_{type}_{version}
     Tipos:
         - _root_: Grupo de offset/space switch
-        - _auto_: Grupo de automatización
+        - _auto_: Grupo de automatización (multMatrix en el layout "matrix")
         - _joint_: Joint original
 """
 
 
-def create_fk_groups():
+def create_fk_groups(roots=None, offset_parent_matrix=False, layout="groups"):
     """
     PASO 2 PARA AUTO CHAIN IK/FK:
     Crea los grupos ROOT y AUTO para cada joint FK.
 
+    Args:
+        roots (str | list[str]): Joint(s) raíz de las cadenas FK. La búsqueda se
+            limita a sus subárboles (default: primera cadena '_joint_###' sin
+            padre de la escena)
+        offset_parent_matrix (bool): Guardar la alineación de los grupos ROOT en
+            offsetParentMatrix, con los canales a cero (Maya 2020+)
+        layout (str): "groups" (ROOT/AUTO por joint) o "matrix" (sin grupos:
+            offset en offsetParentMatrix del joint y capa AUTO como multMatrix)
+
     Returns:
         list[tuple]: Lista de grupos creados
-            [(root_grp, auto_grp, joint), ...]
+            [(root_grp, auto_grp, joint), ...]; en layout "matrix"
+            [(joint, auto_multMatrix, joint), ...] (el control es el joint)
 
     Proceso Técnico:
         1. Identificación de joints FK
@@ -55,8 +76,9 @@ def create_fk_groups():
            - Mantiene nombres originales
 
         3. Estructura Jerárquica
-           - Alinea grupos a joints
-           - Establece parentesco
+           - Matrices world de todos los joints en una sola lectura
+           - Grupos creados directamente bajo su padre y alineados escribiendo
+             su matriz local (sin constraints temporales ni historial)
            - Preserva transformaciones
 
     Requisitos:
@@ -65,10 +87,53 @@ def create_fk_groups():
         - Jerarquía válida (padre→hijo)
 
     Ejemplo:
-        >>> groups = create_fk_groups()
+        >>> groups = create_fk_groups("upperLeg_Leg_practice_L_joint_001")
         >>> print(groups[0])  # (root, auto, joint) del primer set
     """
-    # Buscar todos los joints válidos en escena
+    if roots:
+        chains = _scoped_chains(roots)
+    else:
+        chains = _scene_chain()
+    if not chains:
+        return []
+    fk_joints = [j for chain in chains for j in chain]
+
+    print("\n" + "=" * 60)
+    print(f"🎯 Creando grupos ROOT/AUTO para cadena FK con {len(fk_joints)} joints.")
+    print("=" * 60)
+
+    created_groups = build_fk_groups(
+        chains, offset_parent_matrix=offset_parent_matrix, layout=layout
+    )
+    for root_grp, auto_grp, jnt in created_groups:
+        print(f"✅ {root_grp} > {auto_grp} > {jnt}")
+
+    print("\n📦 Estructura ROOT/AUTO/JNT generada correctamente en orden jerárquico.\n")
+    print("=" * 60)
+    return created_groups
+
+
+def _scoped_chains(roots):
+    """Cadenas FK bajo los roots indicados, leídas con una sola consulta."""
+    nodes = scene_io.list_subtree(roots, "joint")
+    found = set(nodes)
+    root_joints = [n for n in cmds.ls(roots, long=True) or [] if n in found]
+    if not root_joints:
+        cmds.warning(f"⚠️ No se encontraron joints raíz en {roots}")
+        return []
+
+    chains = []
+    for root, joints in scene_io.split_by_root(nodes, root_joints).items():
+        chain = [j for j in joints if re.search(r"_joint_\d{3}$", j)]
+        if chain:
+            chains.append(chain)
+        else:
+            cmds.warning(f"⚠️ No hay joints '_joint_###' bajo {root}")
+    return chains
+
+
+def _scene_chain():
+    """Primera cadena FK sin padre de la escena (comportamiento sin roots)."""
     all_joints = [j for j in cmds.ls(type="joint") if re.search(r"_joint_\d{3}$", j)]
     if not all_joints:
         cmds.warning("⚠️ No se encontraron joints con sufijo '_joint_###'.")
@@ -89,73 +154,230 @@ def create_fk_groups():
     fk_joints = cmds.listRelatives(root_joint, ad=True, type="joint") or []
     fk_joints.append(root_joint)
     fk_joints.reverse()  # Invertimos porque ad=True devuelve de hijo → padre
+    return [fk_joints]
 
-    print("\n" + "=" * 60)
-    print(f"🎯 Creando grupos ROOT/AUTO para cadena FK con {len(fk_joints)} joints.")
-    print("=" * 60)
 
-    created_groups = []
-    prev_auto = None
+def get_group_names(joint):
+    """
+    Devuelve los nombres de los grupos ROOT y AUTO de un joint FK.
 
-    for jnt in fk_joints:
-        root_name = re.sub(r"_joint_", "_root_", jnt)
-        auto_name = re.sub(r"_joint_", "_auto_", jnt)
+    Args:
+        joint (str): Joint con sufijo '_joint_###'
 
-        # Crear grupos vacíos si no existen
-        root_grp = (
-            cmds.group(em=True, name=root_name)
-            if not cmds.objExists(root_name)
-            else root_name
-        )
-        auto_grp = (
-            cmds.group(em=True, name=auto_name)
-            if not cmds.objExists(auto_name)
-            else auto_name
-        )
+    Returns:
+        tuple: (root_grp, auto_grp)
+    """
+    short = joint.split("|")[-1]
+    return re.sub(r"_joint_", "_root_", short), re.sub(r"_joint_", "_auto_", short)
 
-        # Alinear al joint
-        align_group_to_joint(root_grp, jnt)
-        align_group_to_joint(auto_grp, jnt)
 
-        # Parentar jerárquicamente
-        cmds.parent(auto_grp, root_grp)
-        try:
-            cmds.parent(jnt, auto_grp)
-        except RuntimeError:
-            pass  # Ya está parentado correctamente
+def get_fk_control(joint):
+    """
+    Devuelve el nodo que anima un joint FK: su grupo ROOT o, en el layout
+    "matrix" (sin grupos), el propio joint.
+    """
+    root_grp = get_group_names(joint)[0]
+    return root_grp if cmds.objExists(root_grp) else joint.split("|")[-1]
 
-        # Parentar el siguiente root bajo el auto anterior
-        if prev_auto and cmds.objExists(prev_auto):
-            cmds.parent(root_grp, prev_auto)
 
-        prev_auto = auto_grp
-        created_groups.append((root_grp, auto_grp, jnt))
-        print(f"✅ {root_grp} > {auto_grp} > {jnt}")
+def _chain_parents(chains):
+    """
+    Índice (en la lista aplanada de joints) del joint de la misma cadena del
+    que cuelga cada joint, o None si cuelga del padre de la cadena.
 
-    print("\n📦 Estructura ROOT/AUTO/JNT generada correctamente en orden jerárquico.\n")
-    print("=" * 60)
-    return created_groups
+    Las cadenas con ramas (mano → dedos) se resuelven con su jerarquía real,
+    no con el orden de la lista.
+    """
+    indices, offset = [], 0
+    for chain in chains:
+        paths = scene_io.get_full_paths(chain)
+        position = {path: offset + i for i, path in enumerate(paths)}
+        for path in paths:
+            ancestor = path.rsplit("|", 1)[0]
+            while ancestor and ancestor not in position:
+                ancestor = ancestor.rsplit("|", 1)[0]
+            indices.append(position.get(ancestor))
+        offset += len(chain)
+    return indices
+
+
+def build_fk_groups(chains, parents=None, offset_parent_matrix=False, layout="groups"):
+    """
+    Crea los grupos ROOT/AUTO de una o varias cadenas FK en un solo lote.
+
+    Las matrices world de todos los joints se leen una vez; cada grupo ROOT se
+    crea directamente bajo el AUTO del joint padre (o el padre de la cadena)
+    con la transformación del joint y el grupo AUTO queda en identidad debajo.
+    No se crean constraints temporales ni queda historial.
+
+    Args:
+        chains (list[list[str]]): Joints FK de cada cadena, padres antes que
+            hijos (nombres únicos); puede tener ramas
+        parents (list[str]): Padre del primer grupo ROOT de cada cadena
+            (default: el padre actual del joint raíz)
+        offset_parent_matrix (bool): Si es True la alineación se guarda en
+            offsetParentMatrix y los canales del ROOT quedan a cero (Maya 2020+)
+        layout (str): "groups" o "matrix" (ver _build_matrix_layout)
+
+    Returns:
+        list[tuple]: [(root_grp, auto_grp, joint), ...]
+    """
+    joints = [j.split("|")[-1] for chain in chains for j in chain]
+    if not joints:
+        return []
+
+    if parents is None:
+        parents = []
+        for chain in chains:
+            parent = cmds.listRelatives(chain[0], parent=True, fullPath=True)
+            parents.append(parent[0] if parent else None)
+
+    group_names = [get_group_names(j) for j in joints]
+    existing = cmds.ls([name for pair in group_names for name in pair]) or []
+    if existing:
+        cmds.warning(f"⚠️ Ya existen grupos ROOT/AUTO: {existing[:5]}")
+        return []
+    if layout == "matrix" and cmds.about(apiVersion=True) < 20200000:
+        cmds.warning("⚠️ El layout 'matrix' necesita Maya 2020 o superior.")
+        return []
 
+    # Una lectura para todos los joints y otra para los padres externos
+    world = scene_io.get_world_matrices(joints)
+    external = [p for p in parents if p]
+    external_world = dict(zip(external, scene_io.get_world_matrices(external)))
+
+    if layout == "matrix":
+        return _build_matrix_layout(chains, parents, joints, world, external_world)
+
+    chain_parents = _chain_parents(chains)
+    create_lines, parent_lines, created = [], [], []
+    parent_world = np.empty_like(world)
+    index = 0
+    for chain, parent in zip(chains, parents):
+        for _ in chain:
+            joint = joints[index]
+            root_grp, auto_grp = group_names[index]
+            # El ROOT cuelga del AUTO de su joint padre, no del anterior de la lista
+            up = chain_parents[index]
+            if up is None:
+                prev_auto = parent
+                prev_world = external_world[parent] if parent else np.eye(4)
+            else:
+                prev_auto, prev_world = group_names[up][1], world[up]
+            root_parent = f" -p {scene_io.mel_string(prev_auto)}" if prev_auto else ""
+            create_lines += [
+                f"createNode transform -n {scene_io.mel_string(root_grp)}{root_parent};",
+                f"createNode transform -n {scene_io.mel_string(auto_grp)} "
+                f"-p {scene_io.mel_string(root_grp)};",
+            ]
+            parent_lines.append(
+                f"parent -r {scene_io.mel_string(joint)} {scene_io.mel_string(auto_grp)};"
+            )
+            parent_world[index] = prev_world
+            created.append((root_grp, auto_grp, joint))
+            index += 1
+
+    local = rig_math.local_matrices(world, parent_world)
+    roots = [root_grp for root_grp, _, _ in created]
+
+    # 1) Grupos con sus nombres y padres finales
+    scene_io.run_mel_batch(create_lines)
+
+    # 2) Alineación: canales del ROOT u offsetParentMatrix (AUTO queda en identidad)
+    if offset_parent_matrix:
+        scene_io.run_mel_batch(
+            [
+                scene_io.mel_set_matrix(f"{root_grp}.offsetParentMatrix", matrix)
+                for root_grp, matrix in zip(roots, local)
+            ]
+        )
+    else:
+        scene_io.set_local_transforms(roots, local)
+
+    # 3) Cada joint dentro de su AUTO, ya alineado: transformación local nula
+    scene_io.run_mel_batch(parent_lines)
+    scene_io.set_local_transforms(
+        joints, rig_math.identity_matrices(len(joints)), joints=joints
+    )
+    return created
 
-def align_group_to_joint(group, joint):
+
+def _build_matrix_layout(chains, parents, joints, world, external_world):
+    """
+    Layout FK sin grupos: cada joint guarda su offset de reposo en
+    offsetParentMatrix a través de un multMatrix '_auto_' cuya primera entrada
+    es la capa AUTO (identidad hasta que se conecte una automatización).
+
+    Un transform por joint en lugar de tres: el joint es el control y sus
+    canales quedan a cero en reposo.
+    """
+    q = scene_io.mel_string
+    lines, created = [], []
+    # Los joints conservan su jerarquía (también con ramas): el offset de cada
+    # uno es respecto a su padre real; solo el joint raíz puede cambiar de padre
+    parent_world = scene_io.get_parent_matrices(joints)
+    index = 0
+    for chain, parent in zip(chains, parents):
+        current = cmds.listRelatives(chain[0], parent=True, fullPath=True)
+        current = current[0] if current else None
+        if parent and (current or "").split("|")[-1] != parent.split("|")[-1]:
+            # Cadena anidada: el joint raíz pasa a colgar del padre indicado
+            lines.append(f"parent -r {q(joints[index])} {q(parent)};")
+        parent_world[index] = external_world[parent] if parent else np.eye(4)
+        index += len(chain)
+
+    local = rig_math.local_matrices(world, parent_world)
+    for joint, matrix in zip(joints, local):
+        auto = get_group_names(joint)[1]
+        lines += [
+            f"createNode multMatrix -n {q(auto)};",
+            scene_io.mel_set_matrix(f"{auto}.matrixIn[0]", np.eye(4)),
+            scene_io.mel_set_matrix(f"{auto}.matrixIn[1]", matrix),
+            f"connectAttr -f {q(auto + '.matrixSum')} {q(joint + '.offsetParentMatrix')};",
+        ]
+        created.append((joint, auto, joint))
+
+    scene_io.run_mel_batch(lines)
+    # Reposo en offsetParentMatrix: translate/rotate/jointOrient a cero
+    scene_io.set_local_transforms(
+        joints, rig_math.identity_matrices(len(joints)), joints=joints
+    )
+    return created
+
+
+def align_group_to_joint(group, joint, offset_parent_matrix=False):
     """
     Alinea un grupo vacío a un joint específico.
 
     Args:
         group (str): Nombre del grupo a alinear
         joint (str): Nombre del joint objetivo
+        offset_parent_matrix (bool): Guardar la alineación en offsetParentMatrix
+            y dejar los canales a cero
 
     Returns:
         str: Nombre del grupo alineado
 
     Proceso:
-        1. Parent constraint temporal
-        2. Limpieza del constraint
-        3. Freeze transformaciones
+        1. Lectura de la matriz world del joint y la del padre del grupo
+        2. Escritura directa de la matriz local (sin constraints temporales)
     """
-    tmp = cmds.parentConstraint(joint, group, mo=False)
-    cmds.delete(tmp)
-    cmds.makeIdentity(group, apply=True, t=True, r=True, s=True)
+    world = scene_io.get_world_matrices([joint])
+    local = rig_math.local_matrices(world, scene_io.get_parent_matrices([group]))
+    if offset_parent_matrix:
+        scene_io.run_mel_batch(
+            [
+                scene_io.mel_set_double3(f"{group}.{attr}", value)
+                for attr, value in (
+                    ("translate", (0, 0, 0)),
+                    ("rotate", (0, 0, 0)),
+                    ("scale", (1, 1, 1)),
+                )
+            ]
+            + [scene_io.mel_set_matrix(f"{group}.offsetParentMatrix", local[0])]
+        )
+    else:
+        scene_io.set_local_transforms([group], local)
     return group
 
 
@@ -27,8 +27,10 @@ Convención de Nombres:
 
 import maya.cmds as cmds
 
+from Auto_Chain_IKFK.rename_chain import DEFAULT_SEGMENTS
 
-def create_fkik_attribute(base_name="Leg_practice_L", version="001"):
+
+def create_fkik_attribute(base_name="Leg_practice_L", version="001", segments=None):
     """
     PASO 6 PARA AUTO CHAIN IK/FK:
     Crea y configura el atributo de blend entre sistemas FK e IK.
@@ -36,6 +38,8 @@ def create_fkik_attribute(base_name="Leg_practice_L", version="001"):
     Args:
         base_name (str): Nombre base para la nomenclatura (default: "Leg_practice_L")
         version (str): Número de versión para el sistema (default: "001")
+        segments (list[str]): Segmentos de la cadena; el atributo va en el
+            joint FK del primero (default: upperLeg/middleLeg/endLeg)
 
     Returns:
         str: Nombre del shape creado con el atributo FKIK, None si hay error
@@ -68,7 +72,7 @@ def create_fkik_attribute(base_name="Leg_practice_L", version="001"):
         - 1 = IK control total
         - Valores intermedios = blend proporcional
     """
-    root_joint = f"upperLeg_{base_name}_joint_{version}"
+    root_joint = f"{(segments or DEFAULT_SEGMENTS)[0]}_{base_name}_joint_{version}"
     if not cmds.objExists(root_joint):
         cmds.warning(f"⚠️ No existe el joint raíz: {root_joint}")
         return None
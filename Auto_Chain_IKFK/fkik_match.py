@@ -0,0 +1,266 @@
+"""
+Auto Chain IK/FK System - FK/IK Matching
+=======================================
+
+Igualado de poses entre FK e IK para cambiar el atributo FKIK sin saltos, en
+un frame o en un rango completo de una sola vez.
+
+    - match_fk_to_ik: rotaciones de los controles FK a partir de la cadena IK
+    - match_ik_to_fk: posición del IK handle y del pole vector a partir de la FK
+
+Estrategia (por rango, no por frame):
+    1. Muestreo de todas las matrices world necesarias en todos los frames con
+       scene_io.sample_matrices (MDGContext, sin mover currentTime ni consultar
+       xform por frame)
+    2. Resolución en NumPy de todos los frames a la vez
+    3. Escritura de las claves con scene_io.bake_channels, todo en una
+       evaluación MEL deshacible: las curvas que ya existen solo cambian en los
+       frames igualados y los canales sin animar reciben una curva nueva
+
+Controles:
+    - FK: el grupo ROOT de cada joint FK (donde create_control_shapes pone la
+      curva) o el propio joint FK en el layout "matrix" sin grupos
+    - IK: {middle}_{basename}_IKhandle_{version} y
+      {middle}_{basename}_IKpoleVector_{version}
+
+Limitaciones:
+    - Orden de rotación xyz en los controles FK (el que usa todo el pipeline)
+    - El IK handle solo fija la posición del último joint; su rotación no se
+      iguala
+
+Uso:
+    >>> from Auto_Chain_IKFK import fkik_match
+    >>> fkik_match.match_fk_to_ik("Leg_practice_L", "001", frames=(1, 500))
+    >>> fkik_match.match_ik_to_fk("Leg_practice_L", "001")  # frame actual
+"""
+
+import maya.cmds as cmds
+import numpy as np
+
+from Auto_Chain_IKFK.create_fk_groups import get_fk_control
+from Auto_Chain_IKFK.rename_chain import DEFAULT_SEGMENTS
+from Tools import rig_math, scene_io
+
+
+def get_match_nodes(base_name, version, segments=None):
+    """
+    Devuelve los nodos que intervienen en el igualado de una cadena.
+
+    Returns:
+        dict: {"fk", "fk_controls", "ik", "ik_handle", "pole_vector", "fkik"}
+    """
+    segments = list(segments or DEFAULT_SEGMENTS)
+    middle = segments[len(segments) // 2]
+    fk = [f"{seg}_{base_name}_joint_{version}" for seg in segments]
+    return {
+        "fk": fk,
+        "fk_controls": [get_fk_control(joint) for joint in fk],
+        "ik": [f"{seg}_{base_name}_IK_{version}" for seg in segments],
+        "ik_handle": f"{middle}_{base_name}_IKhandle_{version}",
+        "pole_vector": f"{middle}_{base_name}_IKpoleVector_{version}",
+        "fkik": f"{base_name}_attributes_{version}Shape.FKIK",
+    }
+
+
+def _missing(nodes):
+    missing = [n for n in nodes if not cmds.objExists(n)]
+    if missing:
+        cmds.warning(f"⚠️ Faltan nodos para igualar FK/IK: {missing}")
+    return missing
+
+
+def _rotation(matrices):
+    """Parte de rotación (sin escala) de matrices (..., 4, 4)."""
+    shape = matrices.shape[:-2]
+    rotation = rig_math.decompose_matrices(matrices.reshape(-1, 4, 4))[1]
+    return rotation.reshape(shape + (3, 3))
+
+
+def _to_parent_space(points, parent_matrices):
+    """Puntos world (F, 3) al espacio de sus padres (F, 4, 4)."""
+    inverse = np.linalg.inv(parent_matrices)
+    return np.einsum("fi,fij->fj", points, inverse[:, :3, :3]) + inverse[:, 3, :3]
+
+
+def _key_fkik(channels, nodes, frames, value):
+    if cmds.objExists(nodes["fkik"]):
+        channels[nodes["fkik"]] = np.full(len(frames), float(value))
+
+
+def solve_fk_rotations(ik_world, fk_world, control_world, control_parent):
+    """
+    Calcula las rotaciones locales de los controles FK que dejan cada joint FK
+    con la orientación world de su joint IK.
+
+    Cada control se resuelve con el padre ya corregido del control anterior,
+    vectorizado en todos los frames.
+
+    Args:
+        ik_world (np.ndarray): Matrices world IK (F, N, 4, 4)
+        fk_world (np.ndarray): Matrices world FK actuales (F, N, 4, 4)
+        control_world (np.ndarray): Matrices world de los controles (F, N, 4, 4)
+        control_parent (np.ndarray): Matrices world de sus padres (F, N, 4, 4)
+
+    Returns:
+        np.ndarray: Rotaciones locales de los controles (F, N, 3, 3)
+    """
+    inverse = np.linalg.inv
+    # Offset de cada joint FK respecto a su control (grupos ROOT/AUTO)
+    joint_offset = _rotation(fk_world @ inverse(control_world))
+    target = np.swapaxes(joint_offset, -1, -2) @ _rotation(ik_world)
+
+    frames, count = ik_world.shape[:2]
+    local = np.empty((frames, count, 3, 3))
+    parent = control_parent[:, 0]
+    for i in range(count):
+        if i:
+            # El padre del control cuelga del control anterior: se mueve con él
+            parent_offset = control_parent[:, i] @ inverse(control_world[:, i - 1])
+            rest_local = control_world[:, i - 1] @ inverse(control_parent[:, i - 1])
+            new_world = (
+                rig_math.compose_matrices(
+                    rest_local[:, 3, :3],
+                    local[:, i - 1],
+                    np.linalg.norm(rest_local[:, :3, :3], axis=2),
+                )
+                @ parent
+            )
+            parent = parent_offset @ new_world
+        local[:, i] = target[:, i] @ np.swapaxes(_rotation(parent), -1, -2)
+    return local
+
+
+def match_fk_to_ik(
+    base_name="Leg_practice_L",
+    version="001",
+    segments=None,
+    frames=None,
+    set_fkik=True,
+):
+    """
+    Iguala los controles FK a la pose IK en un frame o en un rango.
+
+    Args:
+        base_name (str): Nombre base de la cadena (default: "Leg_practice_L")
+        version (str): Versión del sistema (default: "001")
+        segments (list[str]): Segmentos de la cadena (default: upperLeg/middleLeg/endLeg)
+        frames: None (frame actual), tupla (inicio, fin) o lista de frames
+        set_fkik (bool): Poner claves de FKIK = 0 en los mismos frames
+
+    Returns:
+        dict: {"frames": np.ndarray, "rotations": np.ndarray (F, N, 3)} o None
+
+    Ejemplo:
+        >>> match_fk_to_ik("Leg_practice_L", "001", frames=(1, 500))
+        🔁 FK igualado a IK: 3 controles, 500 frames
+    """
+    nodes = get_match_nodes(base_name, version, segments)
+    controls = nodes["fk_controls"]
+    if _missing(nodes["fk"] + nodes["ik"] + controls):
+        return None
+
+    frames = scene_io.get_frame_range(frames)
+    sampled = scene_io.sample_matrices(nodes["ik"] + nodes["fk"] + controls, frames)
+    ik_world, fk_world, control_world = np.split(sampled, 3, axis=1)
+    control_parent = scene_io.sample_matrices(controls, frames, "parentMatrix")
+    if cmds.about(apiVersion=True) >= 20200000:
+        # El espacio de los canales incluye offsetParentMatrix (layout "matrix")
+        offset = scene_io.sample_matrices(controls, frames, "offsetParentMatrix")
+        control_parent = offset @ control_parent
+
+    local = solve_fk_rotations(ik_world, fk_world, control_world, control_parent)
+
+    # Joints como control: la rotación local incluye el jointOrient (R @ JO)
+    for i, control in enumerate(controls):
+        if cmds.objectType(control) == "joint":
+            orient = cmds.getAttr(f"{control}.jointOrient")[0]
+            local[:, i] = local[:, i] @ rig_math.rotations_from_euler_xyz([orient])[0].T
+
+    angles = rig_math.euler_xyz_from_matrices(local.reshape(-1, 3, 3))
+    angles = rig_math.unwrap_degrees(angles.reshape(len(frames), -1, 3))
+
+    channels = {}
+    for i, control in enumerate(controls):
+        for axis, name in enumerate("XYZ"):
+            channels[f"{control}.rotate{name}"] = angles[:, i, axis]
+    if set_fkik:
+        _key_fkik(channels, nodes, frames, 0.0)
+    if not scene_io.bake_channels(channels, frames):
+        return None
+
+    print(f"🔁 FK igualado a IK: {len(controls)} controles, {len(frames)} frames")
+    return {"frames": frames, "rotations": angles}
+
+
+def match_ik_to_fk(
+    base_name="Leg_practice_L",
+    version="001",
+    segments=None,
+    frames=None,
+    set_fkik=True,
+):
+    """
+    Iguala el IK handle y el pole vector a la pose FK en un frame o en un rango.
+
+    El handle se coloca en el último joint FK y el pole vector en el plano de
+    la cadena FK (rig_math.solve_pole_vectors), a la misma distancia relativa
+    que tenía en cada frame.
+
+    Args:
+        base_name (str): Nombre base de la cadena (default: "Leg_practice_L")
+        version (str): Versión del sistema (default: "001")
+        segments (list[str]): Segmentos de la cadena (default: upperLeg/middleLeg/endLeg)
+        frames: None (frame actual), tupla (inicio, fin) o lista de frames
+        set_fkik (bool): Poner claves de FKIK = 1 en los mismos frames
+
+    Returns:
+        dict: {"frames", "handle" (F, 3), "pole_vector" (F, 3)} o None
+
+    Ejemplo:
+        >>> match_ik_to_fk("Leg_practice_L", "001", frames=(1, 500))
+        🔁 IK igualado a FK: 500 frames
+    """
+    nodes = get_match_nodes(base_name, version, segments)
+    handle, pole = nodes["ik_handle"], nodes["pole_vector"]
+    if _missing(nodes["fk"] + nodes["ik"] + [handle, pole]):
+        return None
+
+    middle = len(nodes["fk"]) // 2
+    chain = [nodes["fk"][0], nodes["fk"][middle], nodes["fk"][-1]]
+    ik_chain = [nodes["ik"][0], nodes["ik"][middle], nodes["ik"][-1]]
+
+    frames = scene_io.get_frame_range(frames)
+    sampled = scene_io.sample_matrices(chain + ik_chain + [pole], frames)
+    points = sampled[:, :, 3, :3]
+    parents = scene_io.sample_matrices([handle, pole], frames, "parentMatrix")
+    if cmds.about(apiVersion=True) >= 20200000:
+        # Cambio de espacio (space_switch): el offsetParentMatrix es parte del padre
+        offset = scene_io.sample_matrices([handle, pole], frames, "offsetParentMatrix")
+        parents = offset @ parents
+
+    # Distancia actual del pole vector, en múltiplos de la longitud del limb IK
+    ik_start, ik_middle, ik_end, pole_world = (points[:, 3 + i] for i in range(4))
+    limb_length = np.linalg.norm(ik_middle - ik_start, axis=1) + np.linalg.norm(
+        ik_end - ik_middle, axis=1
+    )
+    distance = np.linalg.norm(pole_world - ik_middle, axis=1) / np.maximum(
+        limb_length, 1e-9
+    )
+
+    pole_points = rig_math.solve_pole_vectors(
+        points[:, 0], points[:, 1], points[:, 2], distance
+    )
+    handle_local = _to_parent_space(points[:, 2], parents[:, 0])
+    pole_local = _to_parent_space(pole_points, parents[:, 1])
+
+    channels = {}
+    for axis, name in enumerate("XYZ"):
+        channels[f"{handle}.translate{name}"] = handle_local[:, axis]
+        channels[f"{pole}.translate{name}"] = pole_local[:, axis]
+    if set_fkik:
+        _key_fkik(channels, nodes, frames, 1.0)
+    if not scene_io.bake_channels(channels, frames):
+        return None
+
+    print(f"🔁 IK igualado a FK: {len(frames)} frames")
+    return {"frames": frames, "handle": handle_local, "pole_vector": pole_local}
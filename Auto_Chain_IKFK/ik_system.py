@@ -27,8 +27,13 @@ Convención de Nombres:
 
 import maya.cmds as cmds
 
+from Auto_Chain_IKFK.rename_chain import DEFAULT_SEGMENTS
+from Tools import control_shapes, rig_math, scene_io
 
-def create_ik_system(base_name="Leg_practice_L", version="001"):
+
+def create_ik_system(
+    base_name="Leg_practice_L", version="001", segments=None, pole_distance=0.5
+):
     """
     PASO 3 PARA AUTO CHAIN IK/FK:
     Construye un sistema IK completo para una cadena de 3 joints.
@@ -36,6 +41,11 @@ def create_ik_system(base_name="Leg_practice_L", version="001"):
     Args:
         base_name (str): Nombre base para la nomenclatura (default: "Leg_practice_L")
         version (str): Número de versión para el sistema (default: "001")
+        segments (list[str]): Segmentos de la cadena (default: upperLeg/middleLeg/endLeg).
+            El IK va del primero al último y el pole vector se coloca en el
+            segmento central.
+        pole_distance (float): Distancia del pole vector al joint medio, en
+            múltiplos de la longitud del limb (default: 0.5)
 
     Returns:
         dict: Referencias a los elementos creados
@@ -49,8 +59,8 @@ def create_ik_system(base_name="Leg_practice_L", version="001"):
     Proceso Técnico:
         1. Validación de joints IK existentes
         2. Creación del grupo Pole Vector
-           - Posicionamiento en joint medio
-           - Offset de 5 unidades en Y+
+           - Posición analítica en el plano del limb (rig_math.solve_pole_vectors)
+           - Escrita directamente, sin constraints temporales
         3. Setup del IK Handle
            - RPsolver para rotación natural
            - Conexión start/end joints
@@ -75,9 +85,11 @@ def create_ik_system(base_name="Leg_practice_L", version="001"):
         "middleLeg_Leg_practice_L_IKhandle_001"
     """
     # --- Definir nombres base ---
-    upper_joint = f"upperLeg_{base_name}_IK_{version}"
-    middle_joint = f"middleLeg_{base_name}_IK_{version}"
-    end_joint = f"endLeg_{base_name}_IK_{version}"
+    segments = list(segments or DEFAULT_SEGMENTS)
+    first, middle, last = segments[0], segments[len(segments) // 2], segments[-1]
+    upper_joint = f"{first}_{base_name}_IK_{version}"
+    middle_joint = f"{middle}_{base_name}_IK_{version}"
+    end_joint = f"{last}_{base_name}_IK_{version}"
 
     # Validar que la cadena IK exista
     for jnt in [upper_joint, middle_joint, end_joint]:
@@ -86,22 +98,22 @@ def create_ik_system(base_name="Leg_practice_L", version="001"):
             return
 
     # --- 1. Crear el grupo del Pole Vector ---
-    pv_grp = f"middleLeg_{base_name}_IKpoleVector_{version}"
-    pv_root = f"middleLeg_{base_name}_IKpoleVectorRoot_{version}"
-    pv_ctrl_curve = f"middleLeg_{base_name}_IKpoleVectorCtrl_{version}"
+    pv_grp = f"{middle}_{base_name}_IKpoleVector_{version}"
+    pv_root = f"{middle}_{base_name}_IKpoleVectorRoot_{version}"
+    pv_ctrl_curve = f"{middle}_{base_name}_IKpoleVectorCtrl_{version}"
 
     if not cmds.objExists(pv_grp):
         pv_grp = cmds.group(em=True, name=pv_grp)
-        # Snap al joint medio
-        cmds.delete(cmds.pointConstraint(middle_joint, pv_grp))
-        # Moverlo 5 unidades en Y+
-        cmds.move(0, 5, 0, pv_grp, relative=True, os=True)
+        # Posición en el plano del limb a partir de los tres joints
+        positions = scene_io.get_world_matrices([upper_joint, middle_joint, end_joint])
+        pole = rig_math.solve_pole_vectors(*positions[:, 3, :3], pole_distance)
+        cmds.setAttr(f"{pv_grp}.translate", *pole[0], type="double3")
         print(f"✅ Grupo Pole Vector creado: {pv_grp}")
 
     # --- 2. Crear el IK Handle ---
     ik_handle, effector = cmds.ikHandle(sj=upper_joint, ee=end_joint, sol="ikRPsolver")
-    ik_handle = cmds.rename(ik_handle, f"middleLeg_{base_name}_IKhandle_{version}")
-    effector = cmds.rename(effector, f"middleLeg_{base_name}_effector_{version}")
+    ik_handle = cmds.rename(ik_handle, f"{middle}_{base_name}_IKhandle_{version}")
+    effector = cmds.rename(effector, f"{middle}_{base_name}_effector_{version}")
     print(f"✅ IK Handle creado: {ik_handle}")
     print(f"✅ Effector creado: {effector}")
 
@@ -118,15 +130,11 @@ def create_ik_system(base_name="Leg_practice_L", version="001"):
         print(f"✅ Grupo Root creado: {pv_root}")
 
     # --- 5. Crear curva de control para el Pole Vector ---
-    if not cmds.objExists(pv_ctrl_curve):
-        curve = cmds.circle(name=pv_ctrl_curve, normal=(1, 0, 0), radius=1.5)[0]
-        # Snap a la posición del pole vector
-        cmds.delete(cmds.pointConstraint(pv_grp, curve))
-        # Combinar shape con el grupo pole vector
-        shapes = cmds.listRelatives(curve, shapes=True, fullPath=True)
-        for shape in shapes:
-            cmds.parent(shape, pv_grp, r=True, s=True)
-        cmds.delete(curve)
+    if not cmds.objExists(f"{pv_ctrl_curve}Shape"):
+        # Shape creada directamente bajo el grupo pole vector
+        control_shapes.create_control_shape(
+            pv_grp, "circle", radius=1.5, normal=(1, 0, 0), name=f"{pv_ctrl_curve}Shape"
+        )
         print(f"✅ Curva de control combinada en {pv_grp}")
 
     print("🎯 Cadena IK creada correctamente según la documentación.")
@@ -0,0 +1,190 @@
+"""
+Auto Chain IK/FK System - MAIN Bake
+==================================
+
+Horneado de las cadenas MAIN (o de cualquier grupo de joints con constraints)
+a claves, para exportar a motores de juego o formatos sin constraints.
+
+A diferencia de bakeResults, no se avanza el tiempo frame a frame:
+    1. Se muestrean las matrices world y de padre de todos los joints en todos
+       los frames (scene_io.sample_matrices, con MDGContext)
+    2. Las rotaciones locales (y traslaciones si se piden) se calculan en NumPy
+       para todo el rango
+    3. Las claves de cada canal se escriben de una vez (scene_io.bake_channels),
+       con reducción de claves opcional. Si el canal ya estaba animado, su curva
+       se conserva y solo cambian las claves del rango horneado
+
+Tras hornear, los constraints de los joints y los blendMatrix del modo matriz
+(matrix_blend) se eliminan para que las claves manden.
+
+Limitaciones:
+    - Orden de rotación xyz y rotateAxis a 0 (lo que deja el pipeline)
+    - La escala no se hornea
+
+Uso:
+    >>> from Auto_Chain_IKFK import main_bake
+    >>> main_bake.bake_main_chains(frames=(1, 500), tolerance=0.01)
+"""
+
+import re
+
+import maya.cmds as cmds
+import numpy as np
+
+from Auto_Chain_IKFK import matrix_blend
+from Tools import rig_math, scene_io
+
+
+def list_main_joints(roots=None):
+    """Joints MAIN (fullPath) de los subárboles indicados o de toda la escena."""
+    if roots:
+        joints = scene_io.list_subtree(roots, "joint")
+    else:
+        joints = cmds.ls(type="joint", long=True) or []
+    return [j for j in joints if re.search(r"_MAIN_\d{3}$", j.split("|")[-1])]
+
+
+def list_constrained_joints(roots=None):
+    """Joints (fullPath) con algún constraint como hijo directo."""
+    if roots:
+        joints = scene_io.list_subtree(roots, "joint")
+    else:
+        joints = cmds.ls(type="joint", long=True) or []
+    constraints = (
+        cmds.listRelatives(joints, children=True, type="constraint", fullPath=True)
+        or []
+    )
+    owners = {c.rsplit("|", 1)[0] for c in constraints}
+    return [j for j in joints if j in owners]
+
+
+def _driver_nodes(joints):
+    """Constraints y redes de matrix_blend que mueven los joints horneados."""
+    nodes = (
+        cmds.listRelatives(joints, children=True, type="constraint", fullPath=True)
+        or []
+    )
+    for network in matrix_blend.list_blend_networks(joints).values():
+        nodes += network
+    return nodes
+
+
+def bake_joints(
+    joints,
+    frames=None,
+    tolerance=None,
+    translate=False,
+    remove_drivers=True,
+):
+    """
+    Hornea la rotación local de varios joints en un rango de frames.
+
+    Args:
+        joints (list[str]): Joints a hornear
+        frames: None (rango de reproducción), tupla (inicio, fin) o lista de frames
+        tolerance (float): Reducción de claves: error máximo en grados (y en
+            unidades de escena para translate). None conserva todas las claves
+        translate (bool): Hornear también translate
+        remove_drivers (bool): Eliminar después sus constraints y blendMatrix
+
+    Returns:
+        dict: {"frames": np.ndarray, "channels": int} o None
+
+    Ejemplo:
+        >>> bake_joints(["upperLeg_Leg_practice_L_MAIN_001"], frames=(1, 500))
+        🔥 Horneados 1 joints en 500 frames (3 canales)
+    """
+    joints = cmds.ls(joints, type="joint", long=True) or []
+    if not joints:
+        cmds.warning("⚠️ No hay joints para hornear.")
+        return None
+
+    if frames is None:
+        frames = (
+            cmds.playbackOptions(query=True, minTime=True),
+            cmds.playbackOptions(query=True, maxTime=True),
+        )
+    frames = scene_io.get_frame_range(frames)
+
+    # --- 1. Muestreo de todo el rango ---
+    world = scene_io.sample_matrices(joints, frames)
+    parent = scene_io.sample_matrices(joints, frames, "parentMatrix")
+    local = (world @ np.linalg.inv(parent)).reshape(-1, 4, 4)
+
+    # --- 2. Canales en NumPy: rotate = local @ inv(jointOrient) ---
+    orient = np.array([cmds.getAttr(f"{j}.jointOrient")[0] for j in joints])
+    orient = rig_math.rotations_from_euler_xyz(orient)
+    translation, rotation, _ = rig_math.decompose_matrices(local)
+    rotation = rotation.reshape(len(frames), len(joints), 3, 3)
+    rotation = rotation @ np.swapaxes(orient, -1, -2)
+    angles = rig_math.euler_xyz_from_matrices(rotation.reshape(-1, 3, 3))
+    angles = rig_math.unwrap_degrees(angles.reshape(len(frames), len(joints), 3))
+    translation = translation.reshape(len(frames), len(joints), 3)
+
+    channels = {}
+    for i, joint in enumerate(joints):
+        for axis, name in enumerate("XYZ"):
+            channels[f"{joint}.rotate{name}"] = angles[:, i, axis]
+            if translate:
+                channels[f"{joint}.translate{name}"] = translation[:, i, axis]
+
+    # Los drivers referenciados no se pueden borrar: se avisa antes de escribir
+    drivers = _driver_nodes(joints) if remove_drivers else []
+    referenced = cmds.ls(drivers, referencedNodes=True) if drivers else []
+    if referenced:
+        cmds.warning(
+            f"⚠️ Drivers de una referencia, no se hornea nada: {referenced} "
+            "(usa remove_drivers=False)"
+        )
+        return None
+
+    # --- 3. Escritura por canal y limpieza de drivers, en un solo undo ---
+    cmds.undoInfo(openChunk=True, chunkName="Bake MAIN chains")
+    try:
+        if not scene_io.bake_channels(channels, frames, tolerance=tolerance):
+            return None
+        if drivers:
+            q = scene_io.mel_string
+            scene_io.run_mel_batch([f"delete {' '.join(q(n) for n in drivers)};"])
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+    print(
+        f"🔥 Horneados {len(joints)} joints en {len(frames)} frames "
+        f"({len(channels)} canales)"
+    )
+    return {"frames": frames, "channels": len(channels)}
+
+
+def bake_main_chains(
+    roots=None,
+    frames=None,
+    tolerance=None,
+    include_constrained=False,
+    remove_drivers=True,
+):
+    """
+    Hornea las cadenas MAIN de la escena (o de los subárboles indicados).
+
+    Args:
+        roots (str | list[str]): Limitar la búsqueda a estos subárboles, por
+            ejemplo el grupo de cada personaje de una multitud
+        frames: None (rango de reproducción), tupla (inicio, fin) o lista de frames
+        tolerance (float): Reducción de claves (ver bake_joints)
+        include_constrained (bool): Añadir cualquier otro joint con constraints
+        remove_drivers (bool): Eliminar después sus constraints y blendMatrix
+
+    Returns:
+        dict: Resultado de bake_joints o None
+    """
+    joints = list_main_joints(roots)
+    if include_constrained:
+        joints = list(dict.fromkeys(joints + list_constrained_joints(roots)))
+    if not joints:
+        cmds.warning("⚠️ No se encontraron joints MAIN para hornear.")
+        return None
+    return bake_joints(joints, frames, tolerance, remove_drivers=remove_drivers)
+
+
+if __name__ == "__main__":
+    bake_main_chains()
@@ -0,0 +1,205 @@
+"""
+Auto Chain IK/FK System - Matrix Blend
+=====================================
+
+Modo de blend alternativo a orient constraints + reverse: la orientación de
+cada joint MAIN sale de un único nodo blendMatrix que mezcla las matrices
+world de sus joints FK e IK, con el peso conectado directamente al atributo
+FKIK. Como con el orientConstraint, solo se mezcla la rotación: el MAIN
+conserva su jerarquía y su translate de reposo.
+
+Pipeline Steps:
+    1. Orient Joint Chain
+    2. Create FK Groups
+    3. Create IK/MAIN Chains
+    4. Create IK System
+    5. Create FKIK Attribute
+    6. Create Matrix Blend (este módulo, sustituye a los pasos de
+       orient constraints y conexión de nodos FKIK)
+
+Node Network (por joint):
+    FK.worldMatrix ──> blendMatrix.inputMatrix
+    IK.worldMatrix ──> blendMatrix.target[0].targetMatrix
+    FKIK ────────────> blendMatrix.target[0].weight
+    blendMatrix.outputMatrix ──> multMatrix.matrixIn[0]
+    MAIN.parentInverseMatrix ──> multMatrix.matrixIn[1]
+    multMatrix.matrixSum ──> decomposeMatrix ──> MAIN.rotate (jointOrient = 0)
+
+Comparado con orientConstraint + reverse:
+    - Un blendMatrix por joint en lugar de constraint + pesos + reverse
+      compartido; multMatrix y decomposeMatrix solo pasan la rotación a local
+    - Sin nodos DAG ni pesos por target: evaluación en paralelo más sencilla
+    - Poses idénticas con FKIK = 0, 0.5 y 1. En valores intermedios la
+      orientación se interpola con slerp en lugar de la media normalizada del
+      constraint: con la rodilla FK a 40° de la IK la diferencia es < 0.1°
+      (ver Tools.limb_eval.blend_main, modos "constraint" y "matrix")
+
+Requisitos:
+    - Maya 2020+ (blendMatrix)
+
+Convención de Nombres:
+    {segment}_{basename}_blendMatrix_{version}
+    {segment}_{basename}_blendLocal_{version}   (multMatrix)
+    {segment}_{basename}_blendRotate_{version}  (decomposeMatrix)
+"""
+
+import maya.cmds as cmds
+
+from Auto_Chain_IKFK.rename_chain import DEFAULT_SEGMENTS
+from Tools import scene_io
+
+
+def get_blend_names(base_name, version, segments=None):
+    """Nombres de los nodos blendMatrix de una cadena."""
+    return [
+        f"{seg}_{base_name}_blendMatrix_{version}"
+        for seg in segments or DEFAULT_SEGMENTS
+    ]
+
+
+def get_network_names(node):
+    """Nodos de la red de blend de un joint a partir de su blendMatrix."""
+    return [
+        node,
+        node.replace("_blendMatrix_", "_blendLocal_"),
+        node.replace("_blendMatrix_", "_blendRotate_"),
+    ]
+
+
+def list_blend_networks(joints):
+    """
+    Redes de blend que mueven los joints indicados.
+
+    Args:
+        joints (list[str]): Joints a revisar
+
+    Returns:
+        dict: {joint: [blendMatrix, multMatrix, decomposeMatrix]} de los joints
+            cuyo rotate viene de una red de matrix_blend
+    """
+    networks = {}
+    if cmds.about(apiVersion=True) < 20200000:
+        return networks
+    for joint in joints:
+        rotate = cmds.listConnections(
+            f"{joint}.rotate", source=True, destination=False, type="decomposeMatrix"
+        )
+        local = rotate and cmds.listConnections(
+            f"{rotate[0]}.inputMatrix",
+            source=True,
+            destination=False,
+            type="multMatrix",
+        )
+        blend = local and cmds.listConnections(
+            f"{local[0]}.matrixIn[0]",
+            source=True,
+            destination=False,
+            type="blendMatrix",
+        )
+        if blend:
+            networks[joint] = [blend[0], local[0], rotate[0]]
+    return networks
+
+
+def mel_matrix_blend(fk, ik, main, node, fkik_plug):
+    """
+    Devuelve las líneas MEL que crean y conectan el blend de un joint MAIN.
+
+    Args:
+        fk (str): Joint FK
+        ik (str): Joint IK
+        main (str): Joint MAIN que se mueve con el blend
+        node (str): Nombre del nodo blendMatrix (ver get_network_names)
+        fkik_plug (str): Atributo de blend ("shape.FKIK")
+
+    Returns:
+        list[str]: Líneas MEL
+    """
+    q = scene_io.mel_string
+    _, local, rotate = get_network_names(node)
+    return [
+        f"createNode blendMatrix -n {q(node)};",
+        f"connectAttr -f {q(fk + '.worldMatrix[0]')} {q(node + '.inputMatrix')};",
+        f"connectAttr -f {q(ik + '.worldMatrix[0]')} "
+        f"{q(node + '.target[0].targetMatrix')};",
+        f"connectAttr -f {q(fkik_plug)} {q(node + '.target[0].weight')};",
+        # Orientación world mezclada → local bajo el padre del MAIN; la
+        # translación del blend se descarta y manda la jerarquía MAIN
+        f"createNode multMatrix -n {q(local)};",
+        f"connectAttr -f {q(node + '.outputMatrix')} {q(local + '.matrixIn[0]')};",
+        f"connectAttr -f {q(main + '.parentInverseMatrix[0]')} "
+        f"{q(local + '.matrixIn[1]')};",
+        f"createNode decomposeMatrix -n {q(rotate)};",
+        f"connectAttr -f {q(local + '.matrixSum')} {q(rotate + '.inputMatrix')};",
+        f"connectAttr -f {q(main + '.rotateOrder')} {q(rotate + '.inputRotateOrder')};",
+        scene_io.mel_set_double3(f"{main}.jointOrient", (0, 0, 0)),
+        f"connectAttr -f {q(rotate + '.outputRotate')} {q(main + '.rotate')};",
+    ]
+
+
+def create_matrix_blend(base_name="Leg_practice_L", version="001", segments=None):
+    """
+    PASO 6 (MODO MATRIZ) PARA AUTO CHAIN IK/FK:
+    Conecta la rotación de cada joint MAIN a sus joints FK e IK con un nodo
+    blendMatrix.
+
+    Si la cadena ya tenía la red de orient constraints + reverse, se elimina
+    antes de crear el blend.
+
+    Args:
+        base_name (str): Nombre base para la nomenclatura (default: "Leg_practice_L")
+        version (str): Número de versión del sistema (default: "001")
+        segments (list[str]): Segmentos de la cadena (default: upperLeg/middleLeg/endLeg)
+
+    Returns:
+        list[str]: Nodos blendMatrix creados (uno por joint)
+
+    Requisitos:
+        - Cadenas FK, IK y MAIN creadas
+        - Atributo FKIK ya creado (create_fkik_atr)
+
+    Ejemplo:
+        >>> create_matrix_blend("Leg_practice_L", "001")
+        🎚️ Blend de matrices conectado (0=FK, 1=IK): 3 joints
+    """
+    if cmds.about(apiVersion=True) < 20200000:
+        cmds.warning("⚠️ El blend de matrices necesita Maya 2020 o superior.")
+        return []
+
+    segments = list(segments or DEFAULT_SEGMENTS)
+    fkik_shape = f"{base_name}_attributes_{version}Shape"
+    if not cmds.objExists(f"{fkik_shape}.FKIK"):
+        cmds.warning(f"⚠️ No existe el atributo FKIK en {fkik_shape}")
+        return []
+
+    fk = [f"{seg}_{base_name}_joint_{version}" for seg in segments]
+    ik = [f"{seg}_{base_name}_IK_{version}" for seg in segments]
+    main = [f"{seg}_{base_name}_MAIN_{version}" for seg in segments]
+    missing = [n for n in fk + ik + main if not cmds.objExists(n)]
+    if missing:
+        cmds.warning(f"⚠️ Faltan joints de la cadena: {missing}")
+        return []
+
+    # Sustituir la red de constraints si existe
+    old_nodes = cmds.listRelatives(main, children=True, type="orientConstraint") or []
+    reverse_node = f"{base_name}_reverse_{version}"
+    if cmds.objExists(reverse_node):
+        old_nodes.append(reverse_node)
+    if old_nodes:
+        cmds.delete(old_nodes)
+        print(f"🧹 Red de constraints anterior eliminada ({len(old_nodes)} nodos)")
+
+    nodes = get_blend_names(base_name, version, segments)
+    lines = []
+    for args in zip(fk, ik, main, nodes):
+        lines += mel_matrix_blend(*args, f"{fkik_shape}.FKIK")
+    scene_io.run_mel_batch(lines)
+
+    for node, joint in zip(nodes, main):
+        print(f"✅ {node} → {joint}")
+    print(f"\n🎚️ Blend de matrices conectado (0=FK, 1=IK): {len(nodes)} joints")
+    return nodes
+
+
+if __name__ == "__main__":
+    create_matrix_blend()
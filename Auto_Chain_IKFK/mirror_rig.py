@@ -0,0 +1,408 @@
+"""
+Auto Chain IK/FK System - Mirror Builder
+=======================================
+
+Este módulo genera el lado opuesto de un rig ya construido (normalmente el lado
+izquierdo) sin repetir el proceso procedural paso a paso.
+
+Proceso:
+    1. Captura: lee una sola vez la jerarquía de cada rama (joints, grupos y
+       shapes de control) con sus matrices world
+    2. Reflejo: refleja todas las matrices y CVs en memoria con NumPy
+       (comportamiento "behavior", igual que Mirror Joint en Maya)
+    3. Creación: crea todos los nodos con sus nombres finales (_L → _R) y escribe
+       sus transformaciones locales en un único lote
+    4. Sistema IK/FK: recrea IK handle, pole vector, orient constraints y el
+       atributo FKIK sobre el nuevo lado
+
+Layout FK "matrix" (create_fk_groups, sin grupos ROOT/AUTO):
+    Si el lado origen lo usa, se refleja la cadena FK como joints y se rehace el
+    layout con create_fk_groups.build_fk_groups(layout="matrix").
+
+Blend FK/IK por matrices (matrix_blend):
+    Si los MAIN del lado origen se mueven con blendMatrix, el nuevo lado se
+    conecta con matrix_blend.create_matrix_blend en lugar de orient
+    constraints + reverse.
+
+Ramas de un limb IK/FK:
+    - {segment}_{basename}_root_{version}                  (FK + grupos)
+    - {segment}_{basename}_IK_{version}                    (cadena IK)
+    - {segment}_{basename}_MAIN_{version}                  (cadena MAIN)
+    - middleLeg_{basename}_IKpoleVectorRoot_{version}      (pole vector)
+"""
+
+import re
+
+import maya.cmds as cmds
+import numpy as np
+
+from Auto_Chain_IKFK import (
+    conect_fkik_nodes,
+    create_fk_groups,
+    create_fkik_atr,
+    matrix_blend,
+)
+from Auto_Chain_IKFK.rename_chain import DEFAULT_SEGMENTS
+from Tools import rig_math, scene_io
+
+
+# Tipos que se recrean en el nuevo lado (constraints, effectors, etc. se omiten)
+_CAPTURED_TYPES = ["joint", "transform"]
+
+
+def mirror_name(name, source_side="_L", target_side="_R"):
+    """
+    Cambia el token de lado de un nombre.
+
+    Args:
+        name (str): Nombre original
+        source_side (str): Token del lado origen (default: "_L")
+        target_side (str): Token del lado destino (default: "_R")
+
+    Returns:
+        str: Nombre con el lado cambiado
+
+    Ejemplo:
+        >>> mirror_name("upperLeg_Leg_practice_L_joint_001")
+        "upperLeg_Leg_practice_R_joint_001"
+    """
+    return re.sub(rf"{re.escape(source_side)}(?=_|$)", target_side, name)
+
+
+def capture_branch(root):
+    """
+    Lee una rama completa en memoria con una sola consulta por tipo de dato.
+
+    Args:
+        root (str): Nodo raíz de la rama
+
+    Returns:
+        dict: Snapshot de la rama
+            {
+                "names": [str],          # nombres cortos (padres antes que hijos)
+                "parents": [int],        # índice del padre en names, -1 = externo
+                "external_parent": str,  # padre del root en escena (o None)
+                "joints": set[str],
+                "radius": {str: float},
+                "world": np.ndarray,     # matrices world (N, 4, 4)
+                "curves": [(int, dict)], # (índice del nodo, datos de curva)
+            }
+    """
+    root_long = cmds.ls(root, long=True)[0]
+    descendants = (
+        cmds.listRelatives(root_long, allDescendents=True, fullPath=True) or []
+    )
+    nodes = [root_long] + [
+        n for n in cmds.ls(descendants, type=_CAPTURED_TYPES, long=True) or []
+    ]
+    excluded = set(
+        cmds.ls(nodes, type=["constraint", "ikEffector", "ikHandle"], long=True) or []
+    )
+    nodes = [n for n in nodes if n not in excluded]
+    nodes.sort(key=lambda n: n.count("|"))
+
+    index = {n: i for i, n in enumerate(nodes)}
+    parents = [index.get(n.rsplit("|", 1)[0], -1) for n in nodes]
+
+    joints = set(cmds.ls(nodes, type="joint", long=True) or [])
+    names = [n.split("|")[-1] for n in nodes]
+
+    external = cmds.listRelatives(root_long, parent=True, fullPath=True)
+    shapes = (
+        cmds.listRelatives(nodes, shapes=True, type="nurbsCurve", fullPath=True) or []
+    )
+    curve_data = scene_io.get_curve_data(shapes) if shapes else []
+
+    return {
+        "names": names,
+        "parents": parents,
+        "external_parent": external[0] if external else None,
+        "joints": {n.split("|")[-1] for n in joints},
+        "radius": {
+            n.split("|")[-1]: cmds.getAttr(f"{n}.radius") for n in sorted(joints)
+        },
+        "world": scene_io.get_world_matrices(nodes),
+        "curves": [
+            (index[s.rsplit("|", 1)[0]], data) for s, data in zip(shapes, curve_data)
+        ],
+    }
+
+
+def mirror_snapshot(snapshot, plane="YZ", source_side="_L", target_side="_R"):
+    """
+    Refleja un snapshot en memoria y renombra sus nodos.
+
+    Args:
+        snapshot (dict): Resultado de capture_branch
+        plane (str): Plano de simetría (default: "YZ")
+        source_side (str): Token del lado origen (default: "_L")
+        target_side (str): Token del lado destino (default: "_R")
+
+    Returns:
+        dict: Nuevo snapshot con matrices, CVs y nombres reflejados
+    """
+
+    def rename(n):
+        return mirror_name(n, source_side, target_side)
+
+    external = snapshot["external_parent"]
+    if external:
+        mirrored_parent = "|".join(rename(p) for p in external.split("|"))
+        if cmds.objExists(mirrored_parent):
+            external = mirrored_parent
+
+    curves = []
+    for idx, data in snapshot["curves"]:
+        mirrored = dict(data)
+        mirrored["points"] = rig_math.mirror_points(data["points"], plane)
+        curves.append((idx, mirrored))
+
+    return {
+        "names": [rename(n) for n in snapshot["names"]],
+        "parents": list(snapshot["parents"]),
+        "external_parent": external,
+        "joints": {rename(n) for n in snapshot["joints"]},
+        "radius": {rename(n): r for n, r in snapshot["radius"].items()},
+        "world": rig_math.mirror_matrices(snapshot["world"], plane),
+        "curves": curves,
+    }
+
+
+def build_snapshots(snapshots):
+    """
+    Crea en escena los nodos de uno o varios snapshots en un solo lote.
+
+    Args:
+        snapshots (list[dict]): Snapshots (normalmente ya reflejados)
+
+    Returns:
+        list[str]: Nombres de todos los nodos creados
+    """
+    existing = [n for snap in snapshots for n in snap["names"] if cmds.objExists(n)]
+    if existing:
+        cmds.warning(f"⚠️ Ya existen nodos del lado destino: {existing[:5]}")
+        return []
+
+    create_lines = []
+    nodes, locals_, joints = [], [], set()
+
+    for snap in snapshots:
+        names = snap["names"]
+        world = snap["world"]
+        external = snap["external_parent"]
+        external_world = (
+            scene_io.get_world_matrices([external]) if external else np.eye(4)[None]
+        )
+
+        parent_world = np.empty_like(world)
+        for i, parent in enumerate(snap["parents"]):
+            parent_world[i] = world[parent] if parent >= 0 else external_world[0]
+
+            node_type = "joint" if names[i] in snap["joints"] else "transform"
+            parent_name = names[parent] if parent >= 0 else external
+            parent_flag = (
+                f" -p {scene_io.mel_string(parent_name)}" if parent_name else ""
+            )
+            create_lines.append(
+                f"createNode {node_type} -n {scene_io.mel_string(names[i])}{parent_flag};"
+            )
+
+        nodes.extend(names)
+        locals_.append(rig_math.local_matrices(world, parent_world))
+        joints |= snap["joints"]
+
+    # 1) Crear todos los nodos con sus nombres finales
+    scene_io.run_mel_batch(create_lines)
+
+    # 2) Escribir transformaciones locales y radios en un solo lote
+    scene_io.set_local_transforms(nodes, np.concatenate(locals_), joints=joints)
+    scene_io.run_mel_batch(
+        [
+            scene_io.mel_set_value(f"{j}.radius", r)
+            for snap in snapshots
+            for j, r in snap["radius"].items()
+        ]
+    )
+
+    # 3) Shapes de control con los CVs reflejados (en espacio local del nodo)
+    shape_lines, shape_count = [], {}
+    for snap in snapshots:
+        for idx, data in snap["curves"]:
+            owner = snap["names"][idx]
+            inv_world = np.linalg.inv(snap["world"][idx])
+            count = shape_count.get(owner, 0)
+            shape_count[owner] = count + 1
+            shape_lines += scene_io.mel_create_curve_shape(
+                owner,
+                f"{owner}Shape{count or ''}",
+                data["degree"],
+                data["form"],
+                data["knots"],
+                rig_math.transform_points(data["points"], inv_world),
+            )
+    scene_io.run_mel_batch(shape_lines)
+
+    return nodes
+
+
+def mirror_branch(root, plane="YZ", source_side="_L", target_side="_R"):
+    """
+    Refleja una rama cualquiera (por ejemplo una columna o una cola).
+
+    Args:
+        root (str): Nodo raíz de la rama a reflejar
+        plane (str): Plano de simetría (default: "YZ")
+        source_side (str): Token del lado origen (default: "_L")
+        target_side (str): Token del lado destino (default: "_R")
+
+    Returns:
+        list[str]: Nodos creados
+    """
+    if not cmds.objExists(root):
+        cmds.warning(f"⚠️ No existe la rama {root}")
+        return []
+
+    snapshot = mirror_snapshot(capture_branch(root), plane, source_side, target_side)
+    created = build_snapshots([snapshot])
+    print(f"🪞 Rama {root} reflejada: {len(created)} nodos creados")
+    return created
+
+
+def mirror_ikfk_limb(
+    base_name="Leg_practice_L",
+    version="001",
+    plane="YZ",
+    source_side="_L",
+    target_side="_R",
+    segments=DEFAULT_SEGMENTS,
+):
+    """
+    Genera el limb IK/FK del lado opuesto a partir del lado ya construido.
+
+    Args:
+        base_name (str): Nombre base del lado origen (default: "Leg_practice_L")
+        version (str): Versión del sistema (default: "001")
+        plane (str): Plano de simetría (default: "YZ")
+        source_side (str): Token del lado origen (default: "_L")
+        target_side (str): Token del lado destino (default: "_R")
+        segments (tuple): Segmentos de la cadena (default: upperLeg/middleLeg/endLeg)
+
+    Returns:
+        dict: Referencias del lado creado
+            {"base_name", "nodes", "ik_handle", "constraints", "blend_nodes",
+             "fkik_shape"}
+
+    Requisitos:
+        - Lado origen construido con todos los pasos (FK, IK, MAIN, pole vector)
+
+    Ejemplo:
+        >>> mirror_ikfk_limb("Leg_practice_L", "001")
+        🪞 Limb Leg_practice_R generado desde Leg_practice_L
+    """
+    target_base = mirror_name(base_name, source_side, target_side)
+    if target_base == base_name:
+        cmds.warning(f"⚠️ '{base_name}' no contiene el token de lado {source_side}")
+        return None
+
+    first, middle, last = segments[0], segments[len(segments) // 2], segments[-1]
+
+    fk_root = f"{first}_{base_name}_root_{version}"
+    fk_layout = _fk_layout(f"{first}_{base_name}_joint_{version}")
+    uses_blend_matrix = _uses_blend_matrix(
+        [f"{seg}_{base_name}_MAIN_{version}" for seg in segments]
+    )
+    if fk_layout == "matrix" or not cmds.objExists(fk_root):
+        fk_root = f"{first}_{base_name}_joint_{version}"
+    roots = [
+        fk_root,
+        f"{first}_{base_name}_IK_{version}",
+        f"{first}_{base_name}_MAIN_{version}",
+        f"{middle}_{base_name}_IKpoleVectorRoot_{version}",
+    ]
+    missing = [r for r in roots if not cmds.objExists(r)]
+    if missing:
+        cmds.warning(f"⚠️ Faltan ramas del lado origen: {missing}")
+        return None
+
+    # --- 1/2. Captura y reflejo en memoria ---
+    snapshots = [
+        mirror_snapshot(capture_branch(r), plane, source_side, target_side)
+        for r in roots
+    ]
+
+    # --- 3. Creación por lotes ---
+    nodes = build_snapshots(snapshots)
+    if not nodes:
+        return None
+
+    if fk_layout == "matrix":
+        # Los joints reflejados llevan el reposo en sus canales: se pasa al
+        # offsetParentMatrix con la capa AUTO, como en el lado origen
+        created = create_fk_groups.build_fk_groups(
+            [[f"{seg}_{target_base}_joint_{version}" for seg in segments]],
+            layout="matrix",
+        )
+        nodes += [auto for _, auto, _ in created]
+
+    # --- 4. IK handle + pole vector ---
+    ik_start = f"{first}_{target_base}_IK_{version}"
+    ik_end = f"{last}_{target_base}_IK_{version}"
+    pv_grp = f"{middle}_{target_base}_IKpoleVector_{version}"
+
+    ik_handle, effector = cmds.ikHandle(sj=ik_start, ee=ik_end, sol="ikRPsolver")
+    ik_handle = cmds.rename(ik_handle, f"{middle}_{target_base}_IKhandle_{version}")
+    cmds.rename(effector, f"{middle}_{target_base}_effector_{version}")
+    if cmds.objExists(pv_grp):
+        cmds.poleVectorConstraint(pv_grp, ik_handle)
+
+    # --- 5. Orient constraints FK + IK → MAIN (no con blend de matrices) ---
+    constraints = []
+    for seg in segments:
+        fk = f"{seg}_{target_base}_joint_{version}"
+        ik = f"{seg}_{target_base}_IK_{version}"
+        main = f"{seg}_{target_base}_MAIN_{version}"
+        if not uses_blend_matrix and all(cmds.objExists(n) for n in (fk, ik, main)):
+            constraints.append(
+                cmds.orientConstraint(fk, ik, main, maintainOffset=False)[0]
+            )
+
+    # --- 6. Atributo FKIK y red de blend (la misma que el lado origen) ---
+    fkik_shape = create_fkik_atr.create_fkik_attribute(target_base, version, segments)
+    blend_nodes = []
+    if uses_blend_matrix:
+        blend_nodes = matrix_blend.create_matrix_blend(target_base, version, segments)
+    else:
+        conect_fkik_nodes.connect_fkik_nodes(target_base, version, segments)
+
+    print(f"\n🪞 Limb {target_base} generado desde {base_name} ({len(nodes)} nodos)")
+    return {
+        "base_name": target_base,
+        "nodes": nodes,
+        "ik_handle": ik_handle,
+        "constraints": constraints,
+        "blend_nodes": blend_nodes,
+        "fkik_shape": fkik_shape,
+    }
+
+
+def _fk_layout(fk_joint):
+    """Layout FK de un joint: "matrix" si su offsetParentMatrix viene de la capa AUTO."""
+    if not cmds.objExists(fk_joint) or not cmds.attributeQuery(
+        "offsetParentMatrix", node=fk_joint, exists=True
+    ):
+        return "groups"
+    auto = create_fk_groups.get_group_names(fk_joint)[1]
+    sources = cmds.listConnections(
+        f"{fk_joint}.offsetParentMatrix", source=True, destination=False
+    )
+    return "matrix" if sources and auto in sources else "groups"
+
+
+def _uses_blend_matrix(main_joints):
+    """Indica si los joints MAIN se mueven con blendMatrix (matrix_blend)."""
+    existing = [j for j in main_joints if cmds.objExists(j)]
+    return bool(existing and matrix_blend.list_blend_networks(existing))
+
+
+if __name__ == "__main__":
+    mirror_ikfk_limb()
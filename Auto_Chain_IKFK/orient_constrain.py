@@ -27,17 +27,50 @@ Convención de Nombres:
 import maya.cmds as cmds
 import re
 
+from Auto_Chain_IKFK import constraint_audit
+from Tools import scene_io
+from Tools.deferred_job import CHUNK_SIZE, run_to_end
 
-def create_leg_orient_constraints():
+
+def _list_joints(roots=None):
+    """Joints (fullPath) de los subárboles indicados o de toda la escena."""
+    if roots:
+        return scene_io.list_subtree(roots, "joint")
+    return cmds.ls(type="joint", long=True) or []
+
+
+def _partner_lookup(main_root, all_joints, scoped):
+    """
+    Joints candidatos a FK/IK de una cadena MAIN, por nombre corto.
+
+    Con roots explícitos se buscan en los subárboles leídos; si no, bajo el
+    padre del root MAIN (toda la escena si el root no tiene padre).
+    """
+    if not scoped:
+        parent = cmds.listRelatives(main_root, parent=True, fullPath=True)
+        if parent:
+            all_joints = scene_io.list_subtree(parent[0], "joint")
+    lookup = {}
+    for joint in all_joints:
+        lookup.setdefault(joint.split("|")[-1], []).append(joint)
+    return lookup
+
+
+def create_leg_orient_constraints(roots=None):
     """
     PASO 4 PARA AUTO CHAIN IK/FK:
     Crea orient constraints para el sistema de blend IK/FK.
 
+    Args:
+        roots (str | list[str]): Nodo(s) bajo los que buscar las cadenas MAIN;
+            la búsqueda se limita a sus subárboles (default: toda la escena)
+
     Proceso:
-        1. Identifica todos los joints MAIN en la escena
+        1. Identifica los joints MAIN (de la escena o de los subárboles)
         2. Agrupa por cadenas (root → end)
         3. Para cada joint MAIN:
-            - Localiza su correspondiente FK e IK
+            - Localiza su correspondiente FK e IK dentro de los subárboles
+              indicados o bajo el padre del root MAIN (avisa si hay varios)
             - Crea orient constraint en orden: FK + IK → MAIN
             - Configura weights para blend
 
@@ -55,8 +88,13 @@ def create_leg_orient_constraints():
         - Nomenclatura correcta (_joint/_IK/_MAIN)
         - Jerarquías completas (3 joints por cadena)
     """
+    return run_to_end(iter_leg_orient_constraints(roots))
+
+
+def iter_leg_orient_constraints(roots=None, chunk_size=CHUNK_SIZE):
+    """Orient constraints → MAIN, con un yield cada chunk_size joints MAIN."""
     # 1) Buscar todos los joints cuyo nombre corto termine en _MAIN_###.
-    all_joints = cmds.ls(type="joint", long=True) or []
+    all_joints = _list_joints(roots)
     mains = [j for j in all_joints if re.search(r"_MAIN_\d{3}$", j.split("|")[-1])]
 
     if not mains:
@@ -81,6 +119,7 @@ def create_leg_orient_constraints():
         main_roots = [mains[0]]
 
     created_constraints = []
+    done = 0
 
     # 3) Procesar cada cadena MAIN por separado (root -> end)
     for root in main_roots:
@@ -90,21 +129,32 @@ def create_leg_orient_constraints():
         )
         chain = descendants + [root]
         chain.reverse()  # ahora chain = [root, ..., end]
+        partners = _partner_lookup(root, all_joints, bool(roots))
 
         print("\n" + "=" * 50)
         print(f"Procesando cadena MAIN cuyo root es: {root}  (joints: {len(chain)})")
         print("=" * 50)
 
         for idx, main_full in enumerate(chain):
+            if done and done % chunk_size == 0:
+                yield done / len(mains)
+            done += 1
             main_short = main_full.split("|")[-1]
 
             # construir nombres esperados FK e IK (solo en el nombre corto)
             fk_short = re.sub(r"_MAIN_", "_joint_", main_short, count=1)
             ik_short = re.sub(r"_MAIN_", "_IK_", main_short, count=1)
 
-            # resolver a nombres completos en la escena (si existen)
-            fk_long = cmds.ls(fk_short, long=True) or []
-            ik_long = cmds.ls(ik_short, long=True) or []
+            # resolver a nombres completos dentro del ámbito de la cadena
+            fk_long = partners.get(fk_short, [])
+            ik_long = partners.get(ik_short, [])
+            ambiguous = [n for n in (fk_long, ik_long) if len(n) > 1]
+            if ambiguous:
+                cmds.warning(
+                    f"⚠️ Nombre ambiguo para MAIN '{main_short}': "
+                    f"{[n for names in ambiguous for n in names]}. Se omite este joint."
+                )
+                continue
 
             if not fk_long or not ik_long:
                 missing = []
@@ -136,13 +186,16 @@ def create_leg_orient_constraints():
     return created_constraints
 
 
-def list_main_chains():
+def list_main_chains(roots=None):
     """
     Utilidad de diagnóstico para el sistema IK/FK.
 
     Lista todas las cadenas MAIN detectadas en la escena,
     mostrando sus roots para verificar la estructura correcta.
 
+    Args:
+        roots (str | list[str]): Limitar la búsqueda a estos subárboles
+
     Returns:
         list[str]: Lista de joints root MAIN encontrados
 
@@ -151,9 +204,7 @@ def list_main_chains():
         >>> print(f"Encontradas {len(roots)} cadenas MAIN")
     """
     mains = [
-        j
-        for j in cmds.ls(type="joint", long=True)
-        if re.search(r"_MAIN_\d{3}$", j.split("|")[-1])
+        j for j in _list_joints(roots) if re.search(r"_MAIN_\d{3}$", j.split("|")[-1])
     ]
     roots = []
     for m in mains:
@@ -166,49 +217,51 @@ def list_main_chains():
     return roots
 
 
-def verify_constraints():
+def verify_constraints(types=None, roots=None):
     """
     Sistema de verificación para constraints IK/FK.
 
-    Analiza todos los orient constraints en la escena y muestra:
+    Lee todos los constraints de la escena en una sola pasada
+    (Auto_Chain_IKFK.constraint_audit) y muestra:
         - Objetos restringidos (MAIN joints)
         - Drivers (FK/IK joints)
-        - Configuración de weights
+        - Configuración de weights y qué los mueve
         - Estado de maintainOffset
+        - Pesos FK/IK que no están conectados a FKIK
+
+    Args:
+        types (list[str]): Tipos de constraint a revisar (default: todos)
+        roots (str | list[str]): Revisar solo los constraints de estos
+            subárboles (default: toda la escena)
+
+    Returns:
+        list[dict]: Tabla de constraint_audit.audit_constraints
 
     Uso:
-        Ejecutar después de create_leg_orient_constraints()
-        para validar la configuración correcta.
-
-    Output Format:
-        ✓ [constraint_name]
-          Constrained: [MAIN_joint]
-          Targets: [FK_joint, IK_joint]
-          Weights: [w1, w2]
-          MaintainOffset: [True/False]
+        Ejecutar después de create_leg_orient_constraints() y
+        connect_fkik_nodes() para validar la configuración correcta.
     """
-    constraints = cmds.ls(type="orientConstraint") or []
-    if not constraints:
-        print("⚠️ No hay orient constraints en la escena")
-        return
+    nodes = None
+    if roots:
+        nodes = scene_io.list_subtree(roots, "constraint")
+    rows = constraint_audit.audit_constraints(types, nodes)
+    if not rows:
+        print("⚠️ No hay constraints en la escena")
+        return rows
 
     print(f"\n{'=' * 50}")
-    print(f"Verificando {len(constraints)} constraints...")
+    print(f"Verificando {len(rows)} constraints...")
     print(f"{'=' * 50}")
-
-    for cons in constraints:
-        targets = cmds.orientConstraint(cons, query=True, targetList=True) or []
-        constrained = (
-            cmds.orientConstraint(cons, query=True, constrainedObject=True) or []
-        )
-        weights = cmds.orientConstraint(cons, query=True, weight=True) or []
-        maintain_offset = cmds.orientConstraint(cons, query=True, maintainOffset=True)
-
-        print(f"\n✓ {cons}")
-        print(f"  Constrained: {constrained}")
-        print(f"  Targets (Drivers): {targets}")
-        print(f"  Weights: {weights}")
-        print(f"  MaintainOffset: {maintain_offset}")
+    print(constraint_audit.format_table(rows))
+
+    issues = constraint_audit.find_fkik_issues(rows)
+    if issues:
+        print(f"\n⚠️ {len(issues)} problemas en la red FK/IK:")
+        for issue in issues:
+            print(f"  - {issue['constraint']}: {issue['problem']}")
+    else:
+        print("\n✅ Todos los pesos FK/IK están conectados a FKIK.")
+    return rows
 
 
 if __name__ == "__main__":
@@ -0,0 +1,229 @@
+"""
+Auto Chain IK/FK System - Pose Library
+=====================================
+
+Biblioteca de poses para los rigs creados por estas herramientas.
+
+Una pose guarda los valores de todos los controles de uno o varios rigs:
+    - Grupos ROOT y AUTO de la cadena FK (translate, rotate), o los joints FK
+      en el layout "matrix" de create_fk_groups
+    - IK handle y pole vector (translate)
+    - Atributo FKIK
+
+Lectura y escritura por lotes:
+    - Captura: todos los atributos en una sola pasada con la API
+      (scene_io.get_plug_values), sin un getAttr por atributo
+    - Aplicación y mezcla: un único bloque MEL deshacible para todos los
+      atributos de todos los personajes
+
+Formato de archivo (.npz comprimido, sin pickle):
+    channels  Nombres "nodo.atributo" sin namespace
+    values    Valores float32 en unidades de la UI
+
+Uso:
+    >>> from Auto_Chain_IKFK import pose_library
+    >>> pose = pose_library.capture_pose(namespace="hero")
+    >>> pose_library.save_pose("C:/poses/run_contact.npz", pose)
+    >>> run = pose_library.load_pose("C:/poses/run_contact.npz")
+    >>> pose_library.apply_pose(run, namespaces=["crowd01", "crowd02"])
+"""
+
+import re
+from collections import Counter
+
+import maya.cmds as cmds
+import numpy as np
+
+from Tools import rig_math, scene_io
+
+
+# Patrón de nombre de cada tipo de control y atributos que se guardan
+CONTROL_CHANNELS = (
+    (r"_root_\d{3}$", ("translate", "rotate")),
+    (r"_auto_\d{3}$", ("translate", "rotate")),
+    (r"_joint_\d{3}$", ("rotate",)),  # control FK en el layout "matrix"
+    (r"_IKhandle_\d{3}$", ("translate",)),
+    (r"_IKpoleVector_\d{3}$", ("translate",)),
+)
+FKIK_PATTERN = r"_attributes_\d{3}Shape$"
+
+
+def _strip_namespace(channel):
+    node, attr = channel.split(".", 1)
+    return f"{node.rsplit(':', 1)[-1]}.{attr}"
+
+
+def _with_namespace(channel, namespace):
+    return f"{namespace}:{channel}" if namespace else channel
+
+
+def list_control_channels(namespace=None):
+    """
+    Lista los atributos de control de los rigs de la escena.
+
+    Args:
+        namespace (str): Namespace de los controles (default: solo el namespace
+            raíz; los personajes referenciados se capturan uno a uno, porque sin
+            namespace sus nombres coincidirían en la pose)
+
+    Returns:
+        list[str]: Atributos "nodo.atributoX"
+    """
+    pattern = f"{namespace}:*" if namespace else "*"
+    transforms = cmds.ls(pattern, type="transform", recursive=False) or []
+    shapes = cmds.ls(pattern, type="locator", recursive=False) or []
+
+    channels = []
+    for node in transforms:
+        for regex, attributes in CONTROL_CHANNELS:
+            if re.search(regex, node):
+                channels += [f"{node}.{a}{axis}" for a in attributes for axis in "XYZ"]
+                break
+    channels += [f"{s}.FKIK" for s in shapes if re.search(FKIK_PATTERN, s)]
+    return channels
+
+
+def capture_pose(channels=None, namespace=None):
+    """
+    Lee en una sola pasada los valores de todos los controles.
+
+    Args:
+        channels (list[str]): Atributos a guardar (default: list_control_channels)
+        namespace (str): Namespace a capturar si no se pasan channels
+
+    Returns:
+        dict: {"channels": list[str] sin namespace, "values": np.ndarray float32},
+            o None si dos atributos coinciden al quitar el namespace
+
+    Ejemplo:
+        >>> pose = capture_pose()
+        📸 Pose capturada: 84 atributos
+    """
+    channels = channels if channels is not None else list_control_channels(namespace)
+    counts = Counter(_strip_namespace(c) for c in channels)
+    duplicates = sorted(c for c, n in counts.items() if n > 1)
+    if duplicates:
+        cmds.warning(
+            f"⚠️ Atributos repetidos sin namespace (captura un personaje a la "
+            f"vez): {duplicates[:5]}"
+        )
+        return None
+    names, values = scene_io.get_plug_values(channels, settable_only=True)
+    print(f"📸 Pose capturada: {len(names)} atributos")
+    return {
+        "channels": [_strip_namespace(c) for c in names],
+        "values": values.astype(np.float32),
+    }
+
+
+def save_pose(path, pose):
+    """Guarda una pose en un archivo .npz comprimido."""
+    np.savez_compressed(
+        path,
+        channels=np.array(pose["channels"], dtype=str),
+        values=np.asarray(pose["values"], dtype=np.float32),
+    )
+    print(f"💾 Pose guardada: {path}")
+
+
+def load_pose(path):
+    """Carga una pose guardada con save_pose."""
+    with np.load(path, allow_pickle=False) as data:
+        return {"channels": data["channels"].tolist(), "values": data["values"]}
+
+
+def blend_poses(poses, weights=None):
+    """
+    Mezcla varias poses con pesos.
+
+    Translate y FKIK se mezclan linealmente; las rotaciones de cada nodo se
+    mezclan como cuaterniones (rig_math.blend_quaternions) para evitar los
+    saltos de interpolar ángulos Euler. Solo se conservan los atributos
+    presentes en todas las poses.
+
+    Args:
+        poses (list[dict]): Poses de capture_pose / load_pose
+        weights (list[float]): Peso de cada pose (default: iguales); se normalizan
+
+    Returns:
+        dict: Pose mezclada
+    """
+    weights = np.ones(len(poses)) if weights is None else np.asarray(weights, float)
+    weights = weights / max(weights.sum(), 1e-12)
+
+    lookups = [dict(zip(p["channels"], p["values"])) for p in poses]
+    channels = [c for c in poses[0]["channels"] if all(c in lk for lk in lookups)]
+    table = np.array([[lk[c] for c in channels] for lk in lookups], dtype=float)
+    values = weights @ table
+
+    # Rotaciones: tripletas rotateX/Y/Z de un mismo nodo
+    index = {c: i for i, c in enumerate(channels)}
+    triplets = [
+        [index[f"{c[: -len('.rotateX')]}.rotate{axis}"] for axis in "XYZ"]
+        for c in channels
+        if c.endswith(".rotateX")
+        and all(f"{c[: -len('.rotateX')]}.rotate{a}" in index for a in "YZ")
+    ]
+    if triplets:
+        triplets = np.array(triplets)
+        angles = table[:, triplets]  # (P, N, 3)
+        quaternions = rig_math.quaternions_from_matrices(
+            rig_math.rotations_from_euler_xyz(angles.reshape(-1, 3))
+        ).reshape(len(poses), -1, 4)
+        blended = rig_math.matrices_from_quaternions(
+            rig_math.blend_quaternions(quaternions, weights)
+        )
+        euler = rig_math.euler_xyz_from_matrices(blended)
+        # Misma vuelta que la primera pose (evita saltos de ±360° al aplicar)
+        euler += 360.0 * np.round((angles[0] - euler) / 360.0)
+        values[triplets] = euler
+
+    return {"channels": channels, "values": values.astype(np.float32)}
+
+
+def apply_pose(pose, namespaces=None, weight=1.0):
+    """
+    Aplica una pose a uno o varios personajes con una sola escritura.
+
+    Args:
+        pose (dict): Pose de capture_pose / load_pose / blend_poses
+        namespaces (list[str]): Personajes destino (default: sin namespace)
+        weight (float): Mezcla entre la pose actual (0) y la guardada (1)
+
+    Returns:
+        int: Número de atributos escritos
+
+    Ejemplo:
+        >>> apply_pose(load_pose("run_contact.npz"), namespaces=["crowd01", "crowd02"])
+        🎭 Pose aplicada: 168 atributos en 2 personajes
+    """
+    if isinstance(namespaces, str):
+        namespaces = [namespaces]
+    namespaces = namespaces or [None]
+
+    targets, values = [], []
+    for namespace in namespaces:
+        for channel, value in zip(pose["channels"], pose["values"]):
+            targets.append(_with_namespace(channel, namespace))
+            values.append(value)
+
+    existing = set(cmds.ls([t.split(".", 1)[0] for t in targets]) or [])
+    wanted = {t: v for t, v in zip(targets, values) if t.split(".", 1)[0] in existing}
+
+    # Solo los atributos que se pueden escribir (ni bloqueados ni conectados)
+    targets, current = scene_io.get_plug_values(list(wanted), settable_only=True)
+    values = np.array([wanted[t] for t in targets], dtype=float)
+    if weight < 1.0:
+        values = blend_poses(
+            [
+                {"channels": targets, "values": current},
+                {"channels": targets, "values": values},
+            ],
+            [1.0 - weight, weight],
+        )["values"]
+
+    scene_io.run_mel_batch(
+        [scene_io.mel_set_value(t, v) for t, v in zip(targets, values)]
+    )
+    print(f"🎭 Pose aplicada: {len(targets)} atributos en {len(namespaces)} personajes")
+    return len(targets)
@@ -1,6 +1,62 @@
 import maya.cmds as cmds
+import numpy as np
 import re
 
+from Tools import rig_math, scene_io
+from Tools.joint_orient import orient_joint_chains
+from Tools.tool_registry import show_cached_window
+
+
+# Nombres de segmento por tipo de cadena (root → end)
+SEGMENT_TABLES = {
+    "leg": ("upperLeg", "middleLeg", "endLeg"),
+    "arm": ("upperArm", "lowerArm", "hand"),
+    "finger": ("fingerBase", "fingerMid", "fingerTip", "fingerEnd"),
+}
+DEFAULT_SEGMENTS = SEGMENT_TABLES["leg"]
+
+
+def get_segment_names(count, segments="leg"):
+    """
+    Devuelve los nombres de segmento para una cadena de 'count' joints.
+
+    Args:
+        count (int): Número de joints de la cadena
+        segments (str | list[str]): Clave de SEGMENT_TABLES, prefijo libre o
+            lista explícita de nombres (default: "leg")
+
+    Returns:
+        list[str]: Un nombre por joint, o None si la lista explícita o la
+            tabla de SEGMENT_TABLES no tienen un nombre por joint
+
+    Ejemplo:
+        >>> get_segment_names(3, "arm")
+        ['upperArm', 'lowerArm', 'hand']
+        >>> get_segment_names(5, "spine")
+        ['spine01', 'spine02', 'spine03', 'spine04', 'spine05']
+    """
+    if not isinstance(segments, str):
+        segments = list(segments)
+        if len(segments) != count:
+            cmds.warning(
+                f"⚠️ La tabla de segmentos tiene {len(segments)} nombres y la "
+                f"cadena {count} joints."
+            )
+            return None
+        return segments
+
+    table = SEGMENT_TABLES.get(segments)
+    if table:
+        if len(table) != count:
+            cmds.warning(
+                f"⚠️ La tabla '{segments}' tiene {len(table)} segmentos y la "
+                f"cadena {count} joints."
+            )
+            return None
+        return list(table)
+    # Cadena de N segmentos: prefijo + índice
+    return [f"{segments}{i:02d}" for i in range(1, count + 1)]
+
 
 def orient_joint_chain(root_joint):
     """
@@ -20,6 +76,8 @@ def orient_joint_chain(root_joint):
     Note:
         - Limpia automáticamente el jointOrient del último joint en la cadena
         - Sigue el estándar de rigging para orientación de joints
+        - Usa Tools.joint_orient (NumPy): para varias cadenas a la vez llama
+          directamente a orient_joint_chains([...])
     """
     if not cmds.objExists(root_joint):
         cmds.warning(f"⚠️ No existe el joint raíz {root_joint}")
@@ -27,30 +85,13 @@ def orient_joint_chain(root_joint):
 
     print(f"\n🧭 Orientando jerarquía completa desde: {root_joint}")
 
-    cmds.select(clear=True)
     try:
-        cmds.joint(
-            root_joint,
-            e=True,
-            orientJoint="xyz",  # Primary X, Secondary Y
-            secondaryAxisOrient="zup",  # World orientation Z+
-            children=True,  # Orientar hijos
-            zeroScaleOrient=True,  # Reorientar local scale axes
-        )
+        orient_joint_chains([root_joint])
     except Exception as e:
         cmds.warning(f"⚠️ Error aplicando joint orientation en {root_joint}: {e}")
         return
 
-    # Resetear jointOrient del último joint
-    end_joint = get_last_joint(root_joint)
-    if end_joint:
-        for axis in ["jointOrientX", "jointOrientY", "jointOrientZ"]:
-            try:
-                cmds.setAttr(f"{end_joint}.{axis}", 0)
-            except Exception:
-                pass
-        print(f"🔹 Último joint limpio (sin jointOrient): {end_joint}")
-
+    print(f"🔹 Último joint limpio (sin jointOrient): {get_last_joint(root_joint)}")
     print("✅ Orientación aplicada correctamente (X primary, Y secondary, Z+ world).")
 
 
@@ -76,6 +117,7 @@ def rename_hierarchy(
     chain_type: str = "joint",
     increment_version: bool = True,
     base_name: str = "Leg_practice_L",
+    segments="leg",
 ):
     """
     PASO 2 PARA AUTO CHAIN IK/FK:
@@ -85,15 +127,17 @@ def rename_hierarchy(
         chain_type (str): Tipo de cadena (default: "joint")
         increment_version (bool): Si se debe incrementar la versión (default: True)
         base_name (str): Nombre base para la nomenclatura (default: "Leg_practice_L")
+        segments (str | list[str]): Tabla de segmentos (ver get_segment_names)
 
     Returns:
         list: Lista de nombres de joints renombrados en orden jerárquico (root→end)
 
     Requisitos:
-        - La cadena debe tener exactamente 3 joints
         - Se debe seleccionar el joint raíz antes de ejecutar
+        - Con una lista explícita de segmentos, la cadena debe tener el mismo
+          número de joints
 
-    Convención de nombres:
+    Convención de nombres (tabla "leg" con 3 joints):
         - upperLeg_{base_name}_{chain_type}_{version}
         - middleLeg_{base_name}_{chain_type}_{version}
         - endLeg_{base_name}_{chain_type}_{version}
@@ -118,23 +162,13 @@ def rename_hierarchy(
         cmds.warning(f"⚠️ No se encontraron joints hijos de {original_root}")
         return []
 
-    # 🔒 VALIDACIÓN: solo se permiten 3 joints
-    if len(joints) != 3:
-        cmds.warning(
-            f"⚠️ La cadena debe tener exactamente 3 joints (tiene {len(joints)}). "
-            "Por favor ajusta la jerarquía antes de renombrar."
-        )
+    # 🔒 VALIDACIÓN: un nombre de segmento por joint
+    segment_names = get_segment_names(len(joints), segments)
+    if not segment_names:
         return []
 
     renamed = []
-    for i, obj in enumerate(joints, 1):
-        if i == 1:
-            segment = "upperLeg"
-        elif i == 2:
-            segment = "middleLeg"
-        else:
-            segment = "endLeg"
-
+    for i, (obj, segment) in enumerate(zip(joints, segment_names), 1):
         if increment_version:
             match = version_pattern.search(obj)
             current_version = int(match.group(1)) + 1 if match else i
@@ -161,24 +195,99 @@ def rename_hierarchy(
     return renamed
 
 
-def create_ik_main_chains(base_name: str = "Leg_practice_L", chain_type: str = "joint"):
+def clone_chains(chains, names, parents=None, world=None, parent_world=None):
+    """
+    Motor de clonado: crea cadenas derivadas (IK, MAIN, twist, driver...) de
+    una o varias cadenas fuente en una sola operación.
+
+    Los joints se crean directamente con su nombre final, su padre y su
+    transformación local (posición y jointOrient de la fuente), sin duplicate,
+    sin renombrado joint a joint y sin volver a orientar: la fuente ya está
+    orientada y los clones heredan esa orientación exacta.
+
+    Args:
+        chains (list[list[str]]): Cadenas fuente (root → end), ya orientadas
+        names (list[list[list[str]]]): Por cada cadena, los nombres de cada
+            cadena derivada (mismo número de joints que la fuente)
+        parents (list[str]): Padre del root de los clones de cada cadena
+            (default: el padre del root fuente)
+        world (np.ndarray): Matrices world de todos los joints fuente ya leídas
+            (N, 4, 4) (default: se leen en una pasada)
+        parent_world (list[np.ndarray]): Matriz world de cada padre; necesaria
+            si el padre aún no existe (default: se lee de la escena)
+
+    Returns:
+        list[list[list[str]]]: Los nombres creados, o None si alguno ya existía
+
+    Ejemplo:
+        >>> clone_chains([fk], [[ik_names, main_names]])
+    """
+    if world is None:
+        world = scene_io.get_world_matrices([j for chain in chains for j in chain])
+    world = np.asarray(world, dtype=float).reshape(-1, 4, 4)
+
+    if parents is None:
+        parents = [
+            (cmds.listRelatives(chain[0], parent=True, fullPath=True) or [None])[0]
+            for chain in chains
+        ]
+    if parent_world is None:
+        existing = [p for p in parents if p]
+        read = dict(zip(existing, scene_io.get_world_matrices(existing)))
+        parent_world = [read[p] if p else np.eye(4) for p in parents]
+
+    new_names = [n for derived in names for target in derived for n in target]
+    existing = cmds.ls(new_names) or []
+    if existing:
+        cmds.warning(f"⚠️ Ya existen joints con esos nombres: {existing[:5]}")
+        return None
+
+    q = scene_io.mel_string
+    lines, nodes, matrices = [], [], []
+    offset = 0
+    for chain, derived, parent, top in zip(chains, names, parents, parent_world):
+        source_world = world[offset : offset + len(chain)]
+        offset += len(chain)
+        local = rig_math.local_matrices(
+            source_world, np.concatenate([np.asarray(top)[None], source_world[:-1]])
+        )
+        for target in derived:
+            for i, name in enumerate(target):
+                owner = parent if i == 0 else target[i - 1]
+                parent_flag = f" -p {q(owner)}" if owner else ""
+                lines.append(f"createNode joint -n {q(name)}{parent_flag};")
+            nodes += target
+            matrices.append(local)
+
+    scene_io.run_mel_batch(lines)
+    scene_io.set_local_transforms(nodes, np.concatenate(matrices), joints=nodes)
+    return names
+
+
+def create_ik_main_chains(
+    base_name: str = "Leg_practice_L",
+    segments="leg",
+    suffixes=("IK", "MAIN"),
+):
     """
     PASO 3 PARA AUTO CHAIN IK/FK:
     Genera las cadenas IK y MAIN a partir de la cadena base renombrada.
 
     Args:
         base_name (str): Nombre base para la nomenclatura (default: "Leg_practice_L")
-        chain_type (str): Tipo de cadena (default: "joint")
+        segments (str | list[str]): Tabla de segmentos (ver get_segment_names)
+        suffixes (tuple[str]): Cadenas derivadas a crear (default: IK y MAIN);
+            se pueden añadir otras, por ejemplo ("IK", "MAIN", "twist")
 
     Returns:
         dict: Diccionario con las referencias a las cadenas creadas
               {'ik': [joints_ik], 'main': [joints_main]}
 
     Proceso:
-        1. Duplica la cadena original
-        2. Crea versión IK y la orienta
-        3. Crea versión MAIN y la orienta
-        4. Mantiene la jerarquía y orientación correcta
+        1. Lee la cadena fuente (una consulta) y sus matrices world (una pasada);
+           las cadenas ramificadas se rechazan
+        2. Crea todas las cadenas derivadas con sus nombres finales y la
+           orientación de la fuente en un solo lote (clone_chains)
     """
     selection = cmds.ls(selection=True, type="joint")
     if not selection:
@@ -190,115 +299,43 @@ def create_ik_main_chains(base_name: str = "Leg_practice_L", chain_type: str = "
     root = selection[0]  # este debe ser el nuevo nombre devuelto por rename_hierarchy
     version_pattern = re.compile(r"(\d+)$")
 
-    print("\n--- Creando cadenas IK y MAIN ---")
+    print(f"\n--- Creando cadenas {' y '.join(suffixes)} ---")
 
-    def walk_chain(node):
-        yield node
-        children = cmds.listRelatives(node, type="joint", children=True) or []
-        for child in children:
-            yield from walk_chain(child)
-
-    joints = list(walk_chain(root))
+    joints = scene_io.list_subtree(root, "joint")
     if not joints:
         cmds.warning(f"⚠️ No se encontraron joints bajo {root}")
         return None
+    depths = [j.count("|") for j in joints]
+    if len(set(depths)) != len(depths):
+        cmds.warning(
+            f"⚠️ La cadena de {root} se ramifica; crea las cadenas IK/MAIN con "
+            "batch_builder.build_limbs indicando su último joint con 'end'."
+        )
+        return None
+
+    segment_names = get_segment_names(len(joints), segments)
+    if not segment_names:
+        return None
 
     first_joint_name = joints[0].split("|")[-1]
     version_match = version_pattern.search(first_joint_name)
     original_version = version_match.group(1) if version_match else "001"
 
-    result = {}
-
-    # Crear cadena IK
-    print("📋 Creando cadena IK...")
-    try:
-        ik_duplicate = cmds.duplicate(root, renameChildren=True)[0]
-    except Exception as e:
-        cmds.warning(f"⚠️ Error duplicando para IK: {e}")
+    names = [
+        [f"{seg}_{base_name}_{suffix}_{original_version}" for seg in segment_names]
+        for suffix in suffixes
+    ]
+    if clone_chains([joints], [names]) is None:
         return None
 
-    ik_renamed = rename_duplicate_chain(ik_duplicate, base_name, "IK", original_version)
-    # orientamos la cadena IK usando su nuevo root (primer elemento)
-    if ik_renamed:
-        orient_joint_chain(ik_renamed[0])
-        print("✅ Cadena IK creada y orientada correctamente")
-        result["ik"] = ik_renamed
-    else:
-        cmds.warning("⚠️ Renombrado de IK falló.")
-
-    # Crear cadena MAIN
-    print("📋 Creando cadena MAIN...")
-    try:
-        main_duplicate = cmds.duplicate(root, renameChildren=True)[0]
-    except Exception as e:
-        cmds.warning(f"⚠️ Error duplicando para MAIN: {e}")
-        return result
-
-    main_renamed = rename_duplicate_chain(
-        main_duplicate, base_name, "MAIN", original_version
-    )
-    if main_renamed:
-        orient_joint_chain(main_renamed[0])
-        print("✅ Cadena MAIN creada y orientada correctamente")
-        result["main"] = main_renamed
-    else:
-        cmds.warning("⚠️ Renombrado de MAIN falló.")
-
+    result = {}
+    for suffix, chain in zip(suffixes, names):
+        result[suffix.lower()] = chain
+        print(f"✅ Cadena {suffix} creada: {' > '.join(chain)}")
     return result
 
 
-def rename_duplicate_chain(root_node, base_name, suffix, version):
-    """
-    Utilitario para renombrar cadenas duplicadas IK/MAIN.
-
-    Args:
-        root_node (str): Nombre del joint raíz de la cadena duplicada
-        base_name (str): Nombre base para la nomenclatura
-        suffix (str): Sufijo a aplicar (IK o MAIN)
-        version (str): Número de versión a usar
-
-    Returns:
-        list: Lista de joints renombrados en orden jerárquico
-
-    Convención:
-        {segmento}_{base_name}_{suffix}_{version}
-        donde segmento es: upperLeg, middleLeg o endLeg
-    """
-
-    def walk_chain(node):
-        yield node
-        children = cmds.listRelatives(node, type="joint", children=True) or []
-        for child in children:
-            yield from walk_chain(child)
-
-    joints = list(walk_chain(root_node))
-    if not joints:
-        return []
-
-    renamed = []
-    for i, joint in enumerate(joints, 1):
-        current_name = joint.split("|")[-1]
-
-        if i == 1:
-            segment = "upperLeg"
-        elif i == 2:
-            segment = "middleLeg"
-        else:
-            segment = "endLeg"
-
-        new_name = f"{segment}_{base_name}_{suffix}_{version}"
-        try:
-            renamed_joint = cmds.rename(joint, new_name)
-        except Exception as e:
-            cmds.warning(f"⚠️ Error renombrando {joint} → {new_name}: {e}")
-            renamed_joint = joint  # fallback
-        renamed.append(renamed_joint)
-        print(f"  {current_name} → {renamed_joint}")
-
-    return renamed
-
-
-def open_rename_parameters():
+def open_rename_parameters(rebuild=False):
     """
     INTERFAZ GRÁFICA PARA AUTO CHAIN IK/FK:
     Abre una ventana de Maya con controles para el proceso de renombrado.
@@ -308,11 +345,16 @@ def open_rename_parameters():
         - Chain Type: Tipo de cadena
         - Increment: Opción para incrementar versión
         - Botones para ejecutar los pasos del proceso
+
+    Args:
+        rebuild (bool): Fuerza la reconstrucción de la ventana cacheada
     """
-    if cmds.window("renameWin", exists=True):
-        cmds.deleteUI("renameWin")
+    if show_cached_window("renameWin", rebuild=rebuild, owner=__name__):
+        return
 
-    win = cmds.window("renameWin", title="Rename Chain Tool", widthHeight=(350, 250))
+    win = cmds.window(
+        "renameWin", title="Rename Chain Tool", widthHeight=(350, 250), retain=True
+    )
     cmds.columnLayout(adjustableColumn=True, rowSpacing=10)
 
     base_name_field = cmds.textFieldGrp(label="Base Name:", text="Leg_practice_L")
@@ -333,8 +375,7 @@ def open_rename_parameters():
 
     def create_ik_main(*args):
         base_name = cmds.textFieldGrp(base_name_field, q=True, text=True)
-        chain_type = cmds.textFieldGrp(chain_type_field, q=True, text=True)
-        create_ik_main_chains(base_name, chain_type)
+        create_ik_main_chains(base_name)
 
     cmds.button(label="Rename Selection", bgc=(0.3, 0.6, 0.3), command=apply_rename)
     cmds.separator()
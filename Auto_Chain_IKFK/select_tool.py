@@ -1,5 +1,6 @@
 import maya.cmds as cmds
 from Auto_Chain_IKFK import (
+    batch_builder,
     rename_chain,
     create_fk_groups,
     ik_system,
@@ -7,15 +8,21 @@ from Auto_Chain_IKFK import (
     orient_constrain,
     create_fkik_atr,
     conect_fkik_nodes,
+    matrix_blend,
+    mirror_rig,
 )
+from Tools.deferred_job import run_job
+from Tools.tool_registry import show_cached_window
 
 
-def open_ui():
-    # Crear Ventana
-    if cmds.window("simpleToolsWin", exists=True):
-        cmds.deleteUI("simpleToolsWin")
+def open_ui(rebuild=False):
+    # Reutilizar la ventana si ya existe
+    if show_cached_window("simpleToolsWin", rebuild=rebuild, owner=__name__):
+        return
 
-    win = cmds.window("simpleToolsWin", title="Rig Tools", widthHeight=(200, 120))
+    win = cmds.window(
+        "simpleToolsWin", title="Rig Tools", widthHeight=(200, 120), retain=True
+    )
     cmds.columnLayout(adjustableColumn=True, rowSpacing=10)
 
     # Menú para elegir herramienta
@@ -27,24 +34,32 @@ def open_ui():
     cmds.menuItem(label="Asignar curvas de control")
     cmds.menuItem(label="Crear atributo FKIK")
     cmds.menuItem(label="Conectar nodos FKIK")
+    cmds.menuItem(label="Blend FKIK por matrices (alternativa)")
+    cmds.menuItem(label="Reflejar lado (L → R)")
+    cmds.menuItem(label="Construir cadenas seleccionadas (lote)")
+
+    # Pasos de construcción (se ejecutan como trabajo diferido)
+    builders = {
+        "Crear grupos 'Root' y 'Auto'": create_fk_groups.create_fk_groups,
+        "Crear sistema IK": ik_system.create_ik_system,
+        "Crear orient constrain": orient_constrain.iter_leg_orient_constraints,
+        "Asignar curvas de control": combine_curves.auto_assign_curve_shapes,
+        "Crear atributo FKIK": create_fkik_atr.create_fkik_attribute,
+        "Conectar nodos FKIK": conect_fkik_nodes.connect_fkik_nodes,
+        "Blend FKIK por matrices (alternativa)": matrix_blend.create_matrix_blend,
+        "Reflejar lado (L → R)": mirror_rig.mirror_ikfk_limb,
+        "Construir cadenas seleccionadas (lote)": (
+            batch_builder.iter_build_selected_limbs
+        ),
+    }
 
     # Botón ejecutar
     def run_tool(*args):
         choice = cmds.optionMenu(tool_menu, q=True, value=True)
         if choice == "Renombrar cadena":
             rename_chain.open_rename_parameters()
-        elif choice == "Crear grupos 'Root' y 'Auto'":
-            create_fk_groups.create_fk_groups()
-        elif choice == "Crear sistema IK":
-            ik_system.create_ik_system()
-        elif choice == "Crear orient constrain":
-            orient_constrain.create_leg_orient_constraints()
-        elif choice == "Asignar curvas de control":
-            combine_curves.auto_assign_curve_shapes()
-        elif choice == "Crear atributo FKIK":
-            create_fkik_atr.create_fkik_attribute()
-        elif choice == "Conectar nodos FKIK":
-            conect_fkik_nodes.connect_fkik_nodes()
+        elif choice in builders:
+            run_job("IK/FK Rig", [(choice, builders[choice])])
 
     cmds.button(label="▶ Ejecutar", height=40, bgc=(0.3, 0.6, 0.3), command=run_tool)
     cmds.showWindow(win)
@@ -0,0 +1,286 @@
+"""
+Auto Chain IK/FK System - Space Switch
+=====================================
+
+Cambio de espacio para controles (IK handle, pole vector o cualquier
+transform) sin parent constraints de varios targets.
+
+El offset de cada espacio se calcula una sola vez al construir y queda guardado
+en un multMatrix; un único nodo choice elige el espacio activo con un atributo
+enum del control y su salida mueve el offsetParentMatrix del control.
+
+Node Network (por control):
+    offset_espacio ─┐
+    espacio.worldMatrix ─┼─> multMatrix (uno por espacio) ──> choice.input[i]
+    control.parentInverseMatrix ─┘
+    control.space (enum) ──> choice.selector
+    choice.output ──> control.offsetParentMatrix
+
+Solo se evalúa el multMatrix del espacio activo: el coste por frame no crece
+con el número de espacios.
+
+Convención de Nombres:
+    {control}_{espacio}Space_{version}   multMatrix de cada espacio
+    {control}_spaceChoice_{version}      choice
+    Ejemplo:
+        - middleLeg_Leg_practice_L_IKpoleVector_hipSpace_001
+        - middleLeg_Leg_practice_L_IKpoleVector_spaceChoice_001
+
+Requisitos:
+    - Maya 2020+ (offsetParentMatrix)
+
+Uso:
+    >>> from Auto_Chain_IKFK import space_switch
+    >>> space_switch.create_ik_space_switch(
+    ...     "Leg_practice_L", "001", {"world": None, "hip": "hip_ctrl"}
+    ... )
+    >>> space_switch.switch_space("middleLeg_Leg_practice_L_IKhandle_001", "hip")
+"""
+
+import re
+
+import maya.cmds as cmds
+import numpy as np
+
+from Auto_Chain_IKFK.rename_chain import DEFAULT_SEGMENTS
+from Tools import rig_math, scene_io
+
+
+SPACE_ATTRIBUTE = "space"
+
+
+def get_space_node_names(control, spaces):
+    """
+    Nombres de los nodos del cambio de espacio de un control.
+
+    Args:
+        control (str): Control ("..._###")
+        spaces (list[str]): Nombres de los espacios
+
+    Returns:
+        tuple: (choice, [multMatrix por espacio])
+    """
+    short = control.split("|")[-1]
+    match = re.search(r"_(\d{3})$", short)
+    base, version = (
+        (short[: match.start()], match.group(1)) if match else (short, "001")
+    )
+    return (
+        f"{base}_spaceChoice_{version}",
+        [f"{base}_{space}Space_{version}" for space in spaces],
+    )
+
+
+def _read_offsets(switches):
+    """
+    Offset de cada espacio de cada control, con una lectura para todos.
+
+    offset = (offsetParentMatrix actual @ padre) @ inv(espacio): con él el
+    control queda exactamente donde estaba al activar cualquier espacio.
+    """
+    controls = [s["control"] for s in switches]
+    space_nodes = list(
+        dict.fromkeys(n for s in switches for n in s["spaces"].values() if n)
+    )
+    rest = scene_io.sample_matrices(
+        controls, cmds.currentTime(query=True), "offsetParentMatrix"
+    )[0] @ scene_io.get_parent_matrices(controls)
+    space_world = dict(zip(space_nodes, scene_io.get_world_matrices(space_nodes)))
+
+    return [
+        [
+            rest[i] @ np.linalg.inv(space_world[node]) if node else rest[i]
+            for node in switch["spaces"].values()
+        ]
+        for i, switch in enumerate(switches)
+    ]
+
+
+def _switch_lines(switch, offsets, attribute):
+    """Líneas MEL de la red de un control."""
+    q = scene_io.mel_string
+    control = switch["control"]
+    names = list(switch["spaces"])
+    choice, mult_nodes = get_space_node_names(control, names)
+    default = names.index(switch.get("default", names[0]))
+
+    lines = [
+        f"addAttr -ln {q(attribute)} -at enum -en {q(':'.join(names))} -k 1 {q(control)};",
+        f"createNode choice -n {q(choice)};",
+        f"connectAttr -f {q(f'{control}.{attribute}')} {q(choice + '.selector')};",
+    ]
+    for i, (node, mult, offset) in enumerate(
+        zip(switch["spaces"].values(), mult_nodes, offsets)
+    ):
+        lines += [
+            f"createNode multMatrix -n {q(mult)};",
+            scene_io.mel_set_matrix(f"{mult}.matrixIn[0]", offset),
+        ]
+        if node:  # world: matrixIn[1] se queda en identidad
+            lines.append(
+                f"connectAttr -f {q(node + '.worldMatrix[0]')} "
+                f"{q(mult + '.matrixIn[1]')};"
+            )
+        lines += [
+            f"connectAttr -f {q(control + '.parentInverseMatrix[0]')} "
+            f"{q(mult + '.matrixIn[2]')};",
+            f"connectAttr -f {q(mult + '.matrixSum')} {q(f'{choice}.input[{i}]')};",
+        ]
+    lines += [
+        f"connectAttr -f {q(choice + '.output')} {q(control + '.offsetParentMatrix')};",
+        f"setAttr {q(f'{control}.{attribute}')} {default};",
+    ]
+    return lines
+
+
+def build_space_switches(switches, attribute=SPACE_ATTRIBUTE):
+    """
+    Crea el cambio de espacio de muchos controles en un solo lote.
+
+    Args:
+        switches (list[dict]): Un dict por control
+            {
+                "control": "middleLeg_Leg_L_IKhandle_001",
+                "spaces": {"world": None, "hip": "hip_ctrl"},  # None = world
+                "default": "world",                            # opcional
+            }
+        attribute (str): Nombre del atributo enum (default: "space")
+
+    Returns:
+        list[str]: Nodos choice creados
+
+    Ejemplo:
+        >>> build_space_switches([
+        ...     {"control": "ctrl_IKhandle_001", "spaces": {"world": None, "hip": "hip"}},
+        ... ])
+        🌐 Cambio de espacio creado: 1 controles, 2 espacios
+    """
+    if cmds.about(apiVersion=True) < 20200000:
+        cmds.warning("⚠️ El cambio de espacio necesita Maya 2020 o superior.")
+        return []
+
+    valid = []
+    for switch in switches:
+        control, spaces = switch["control"], switch["spaces"]
+        missing = [
+            n for n in [control, *spaces.values()] if n and not cmds.objExists(n)
+        ]
+        if missing:
+            cmds.warning(f"⚠️ No existen: {missing}")
+            continue
+        if cmds.attributeQuery(attribute, node=control, exists=True):
+            cmds.warning(f"⚠️ {control} ya tiene el atributo {attribute}")
+            continue
+        if cmds.listConnections(
+            f"{control}.offsetParentMatrix", source=True, destination=False
+        ):
+            cmds.warning(f"⚠️ {control}.offsetParentMatrix ya está conectado")
+            continue
+        if switch.get("default", next(iter(spaces))) not in spaces:
+            cmds.warning(f"⚠️ Espacio por defecto desconocido en {control}")
+            continue
+        valid.append(switch)
+    if not valid:
+        return []
+
+    offsets = _read_offsets(valid)
+    lines = []
+    for switch, switch_offsets in zip(valid, offsets):
+        lines += _switch_lines(switch, switch_offsets, attribute)
+    scene_io.run_mel_batch(lines)
+
+    choices = [get_space_node_names(s["control"], s["spaces"])[0] for s in valid]
+    space_count = sum(len(s["spaces"]) for s in valid)
+    print(
+        f"🌐 Cambio de espacio creado: {len(valid)} controles, {space_count} espacios"
+    )
+    return choices
+
+
+def create_ik_space_switch(base_name, version, spaces, segments=None, default=None):
+    """
+    Añade el cambio de espacio al IK handle y al pole vector de un limb.
+
+    Args:
+        base_name (str): Nombre base de la cadena
+        version (str): Versión del sistema
+        spaces (dict): {"nombre": nodo o None (world)}
+        segments (list[str]): Segmentos de la cadena (default: upperLeg/middleLeg/endLeg)
+        default (str): Espacio activo al crear (default: el primero)
+
+    Returns:
+        list[str]: Nodos choice creados
+    """
+    segments = list(segments or DEFAULT_SEGMENTS)
+    middle = segments[len(segments) // 2]
+    controls = [
+        f"{middle}_{base_name}_IKhandle_{version}",
+        f"{middle}_{base_name}_IKpoleVector_{version}",
+    ]
+    return build_space_switches(
+        [
+            {"control": c, "spaces": spaces, "default": default or next(iter(spaces))}
+            for c in controls
+        ]
+    )
+
+
+def switch_space(control, space, frames=None, attribute=SPACE_ATTRIBUTE):
+    """
+    Cambia de espacio sin saltos: recalcula translate/rotate del control para
+    que conserve su posición world en cada frame y pone claves del enum.
+
+    Args:
+        control (str): Control con cambio de espacio
+        space (str): Nombre del espacio destino
+        frames: None (frame actual), tupla (inicio, fin) o lista de frames
+        attribute (str): Atributo enum (default: "space")
+
+    Returns:
+        np.ndarray: Frames escritos, o None
+    """
+    names = cmds.attributeQuery(attribute, node=control, listEnum=True)
+    names = names[0].split(":") if names else []
+    if space not in names:
+        cmds.warning(f"⚠️ {control} no tiene el espacio {space}")
+        return None
+    index = names.index(space)
+    mult = get_space_node_names(control, names)[1][index]
+
+    frames = scene_io.get_frame_range(frames)
+    offset = np.reshape(cmds.getAttr(f"{mult}.matrixIn[0]"), (4, 4))
+    space_node = cmds.listConnections(
+        f"{mult}.matrixIn[1]", source=True, destination=False
+    )
+
+    # Frame de los canales en el espacio nuevo: offset @ espacio (world)
+    world = scene_io.sample_matrices([control], frames)[:, 0]
+    space_world = (
+        scene_io.sample_matrices(space_node[:1], frames)[:, 0]
+        if space_node
+        else np.broadcast_to(np.eye(4), world.shape)
+    )
+    local = world @ np.linalg.inv(offset @ space_world)
+    translate, rotation, _ = rig_math.decompose_matrices(local)
+    angles = rig_math.unwrap_degrees(rig_math.euler_xyz_from_matrices(rotation))
+
+    channels = {f"{control}.{attribute}": np.full(len(frames), float(index))}
+    for axis, name in enumerate("XYZ"):
+        channels[f"{control}.translate{name}"] = translate[:, axis]
+        channels[f"{control}.rotate{name}"] = angles[:, axis]
+
+    # Claves y tangentes del enum en un solo undo; las claves fuera de los
+    # frames cambiados conservan sus tangentes
+    cmds.undoInfo(openChunk=True, chunkName="Switch space")
+    try:
+        if not scene_io.bake_channels(channels, frames):
+            return None
+        cmds.keyTangent(
+            f"{control}.{attribute}",
+            time=[(t, t) for t in frames],
+            outTangentType="step",
+        )
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    print(f"🌐 {control} → espacio {space} ({len(frames)} frames)")
+    return frames
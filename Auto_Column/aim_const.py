@@ -1,11 +1,22 @@
 import maya.cmds as cmds
 
+from Tools.deferred_job import CHUNK_SIZE, run_to_end
+
 
 def create_spine_target_aims(base_name="spineTarget_ctrl", num_targets=None):
+    return run_to_end(iter_spine_target_aims(base_name, num_targets))
+
+
+def iter_spine_target_aims(
+    base_name="spineTarget_ctrl", num_targets=None, chunk_size=CHUNK_SIZE
+):
+    """Aim constraints de los targets, con un yield cada chunk_size constraints."""
     targets = cmds.ls(f"{base_name}_*", type="transform")
     num_targets = num_targets or len(targets)
 
     for i in range(1, num_targets):
+        if i > 1 and (i - 1) % chunk_size == 0:
+            yield (i - 1) / max(num_targets - 1, 1)
         target = f"{base_name}_{i:03d}"
         source = f"{base_name}_{i + 1:03d}"
         if not cmds.objExists(source) or not cmds.objExists(target):
@@ -8,14 +8,18 @@ from Auto_Column import (
     aim_const,
     parent_const,
 )
+from Tools.deferred_job import job_command
+from Tools.tool_registry import show_cached_window
 
 
-def open_spine_rig_ui():
+def open_spine_rig_ui(rebuild=False):
     """Interfaz para crear y controlar el Spine Rig paso a paso."""
-    if cmds.window("spineRigWin", exists=True):
-        cmds.deleteUI("spineRigWin")
+    if show_cached_window("spineRigWin", rebuild=rebuild, owner=__name__):
+        return
 
-    win = cmds.window("spineRigWin", title="Spine Rig Tool", widthHeight=(400, 650))
+    win = cmds.window(
+        "spineRigWin", title="Spine Rig Tool", widthHeight=(400, 650), retain=True
+    )
     cmds.columnLayout(adjustableColumn=True, rowSpacing=10)
 
     # --- Parámetros principales ---
@@ -30,54 +34,68 @@ def open_spine_rig_ui():
     # --- Botones para cada paso ---
     cmds.text(label="▶ Ejecutar Pasos", align="center")
 
-    cmds.button(
-        label="Paso 1 - Crear Joints + Curva",
-        bgc=(0.3, 0.6, 0.3),
-        command=lambda *args: joint_slpine.create_spine_chain_s_shape(
-            num_joints=cmds.intFieldGrp(num_joints_field, q=True, value1=True),
-            base_name=cmds.textFieldGrp(base_name_field, q=True, text=True),
-            curve_name=cmds.textFieldGrp(curve_name_field, q=True, text=True),
-        ),
-    )
+    def num_joints():
+        return cmds.intFieldGrp(num_joints_field, q=True, value1=True)
 
-    cmds.button(
-        label="Paso 2 - Crear Locators",
-        command=lambda *args: locators2curve.create_spine_locators(
-            curve_name=cmds.textFieldGrp(curve_name_field, q=True, text=True),
-            num_locs=cmds.intFieldGrp(num_joints_field, q=True, value1=True),
-        ),
-    )
+    def base_name():
+        return cmds.textFieldGrp(base_name_field, q=True, text=True)
 
-    cmds.button(
-        label="Paso 3 - Conexión Decompose",
-        command=lambda *args: doble_parent.connect_locators_to_curve(
-            curve_name=cmds.textFieldGrp(curve_name_field, q=True, text=True),
-            num_locs=cmds.intFieldGrp(num_joints_field, q=True, value1=True),
-        ),
-    )
+    def curve_name():
+        return cmds.textFieldGrp(curve_name_field, q=True, text=True)
 
-    cmds.button(
-        label="Paso 4 - Crear Controles",
-        command=lambda *args: create_controls.create_spine_controls(
-            radius=cmds.floatFieldGrp(radius_field, q=True, value1=True)
-        ),
-    )
+    def radius():
+        return cmds.floatFieldGrp(radius_field, q=True, value1=True)
 
-    cmds.button(
-        label="Paso 5 - Crear Targets",
-        command=lambda *args: tarjet_curve.create_spine_targets(
-            curve_name=cmds.textFieldGrp(curve_name_field, q=True, text=True)
+    # Cada paso se lee en el momento de ejecutarse para respetar los campos;
+    # los iter_* avanzan por bloques de joints para no congelar Maya
+    steps = [
+        (
+            "Paso 1 - Crear Joints + Curva",
+            lambda: joint_slpine.iter_spine_chain_s_shape(
+                num_joints=num_joints(), base_name=base_name(), curve_name=curve_name()
+            ),
         ),
-    )
+        (
+            "Paso 2 - Crear Locators",
+            lambda: locators2curve.iter_spine_locators(
+                curve_name=curve_name(), num_locs=num_joints()
+            ),
+        ),
+        (
+            "Paso 3 - Conexión Decompose",
+            lambda: doble_parent.iter_connect_locators_to_curve(
+                curve_name=curve_name(), num_locs=num_joints()
+            ),
+        ),
+        (
+            "Paso 4 - Crear Controles",
+            lambda: create_controls.create_spine_controls(radius=radius()),
+        ),
+        (
+            "Paso 5 - Crear Targets",
+            lambda: tarjet_curve.iter_spine_targets(curve_name=curve_name()),
+        ),
+        ("Paso 6 - Aim Constraints", aim_const.iter_spine_target_aims),
+        (
+            "Paso 7 - Parent Constraints Joints",
+            parent_const.iter_constrain_joints_to_targets,
+        ),
+    ]
 
-    cmds.button(
-        label="Paso 6 - Aim Constraints",
-        command=lambda *args: aim_const.create_spine_target_aims(),
-    )
+    for i, (label, func) in enumerate(steps):
+        extra = {"bgc": (0.3, 0.6, 0.3)} if i == 0 else {}
+        cmds.button(
+            label=label,
+            command=job_command("Spine Rig", lambda step=(label, func): [step]),
+            **extra,
+        )
 
+    cmds.separator(h=15, style="in")
     cmds.button(
-        label="Paso 7 - Parent Constraints Joints",
-        command=lambda *args: parent_const.constrain_joints_to_targets(),
+        label="▶▶ Ejecutar todos los pasos",
+        bgc=(0.3, 0.5, 0.8),
+        height=35,
+        command=job_command("Spine Rig", lambda: list(steps)),
     )
 
     cmds.showWindow(win)
@@ -1,26 +1,35 @@
 import maya.cmds as cmds
 
+from Tools import control_shapes
 
-def create_spine_controls(base_name="spineLoc_ctrl", num_ctrls=None, radius=2.0):
+
+def create_spine_controls(
+    base_name="spineLoc_ctrl", num_ctrls=None, radius=2.0, instance=False
+):
     """
     Crea NURBS circles y los combina como shapes en los locators existentes.
+
+    Con instance=True todos los locators comparten una única shape.
     """
     # Detectar cuántos locators existen
     locators = cmds.ls(f"{base_name}_*", type="transform")
     num_ctrls = num_ctrls or len(locators)
 
-    for i in range(num_ctrls):
-        loc = f"{base_name}_{i + 1:03d}"
-        if not cmds.objExists(loc):
-            continue
-
-        circle = cmds.circle(name=f"{loc}_circle", normal=(0, 1, 0), radius=radius)[0]
-        pos = cmds.xform(loc, q=True, ws=True, t=True)
-        cmds.xform(circle, ws=True, t=pos)
-        shapes = cmds.listRelatives(circle, shapes=True, fullPath=True) or []
-        for shape in shapes:
-            cmds.parent(shape, loc, add=True, shape=True)
-        cmds.delete(circle)
+    targets = [
+        f"{base_name}_{i + 1:03d}"
+        for i in range(num_ctrls)
+        if cmds.objExists(f"{base_name}_{i + 1:03d}")
+    ]
+
+    # Una sola evaluación para todas las shapes (círculo en el origen del locator)
+    control_shapes.create_control_shapes(
+        targets,
+        "circle",
+        radius=radius,
+        names=[f"{loc}_circleShape" for loc in targets],
+        instance=instance,
+    )
+    for loc in targets:
         print(f"✅ Control agregado a {loc}")
 
 
@@ -1,5 +1,7 @@
 import maya.cmds as cmds
 
+from Tools.deferred_job import CHUNK_SIZE, run_to_end
+
 
 def connect_locators_to_curve(
     curve_name="splineCurve_001", base_name="spineLoc_ctrl", num_locs=None
@@ -11,6 +13,16 @@ def connect_locators_to_curve(
      - no fuerza conexiones si ya hay otras diferentes (avisa y omite)
      - filtra y parenta solo los locators válidos (evita errores de "parent" y ciclos)
     """
+    return run_to_end(iter_connect_locators_to_curve(curve_name, base_name, num_locs))
+
+
+def iter_connect_locators_to_curve(
+    curve_name="splineCurve_001",
+    base_name="spineLoc_ctrl",
+    num_locs=None,
+    chunk_size=CHUNK_SIZE,
+):
+    """Conexión locator → CV, con un yield cada chunk_size locators."""
     # Validar existencia curva (transform)
     if not cmds.objExists(curve_name):
         cmds.warning(f"⚠️ La curva {curve_name} no existe.")
@@ -50,6 +62,8 @@ def connect_locators_to_curve(
 
     processed = []
     for i in range(num_locs):
+        if i and i % chunk_size == 0:
+            yield 0.9 * i / num_locs
         loc_short = f"{base_name}_{i + 1:03d}"
         # resolver fullPath del locator específico
         loc_full = cmds.ls(loc_short, long=True) or []
@@ -1,5 +1,7 @@
 import maya.cmds as cmds
 
+from Tools.deferred_job import CHUNK_SIZE, run_to_end
+
 
 def create_spine_chain_s_shape(
     num_joints=5, base_name="joint", curve_name="splineCurve_001"
@@ -8,6 +10,13 @@ def create_spine_chain_s_shape(
     Crea una cadena de joints en forma de S y una curva spline perfectamente alineada.
     Cada joint corresponde a un CV de la curva.
     """
+    return run_to_end(iter_spine_chain_s_shape(num_joints, base_name, curve_name))
+
+
+def iter_spine_chain_s_shape(
+    num_joints=5, base_name="joint", curve_name="splineCurve_001", chunk_size=CHUNK_SIZE
+):
+    """Joints de la columna en S, con un yield cada chunk_size joints."""
     if num_joints < 2:
         cmds.warning("⚠️ Se necesitan al menos 2 joints para formar una columna.")
         return
@@ -25,8 +34,13 @@ def create_spine_chain_s_shape(
     # Crear joints
     joints = []
     for i, pos in enumerate(positions, 1):
+        if joints and (i - 1) % chunk_size == 0:
+            # Bloque nuevo: la selección pudo cambiar entre bloques
+            cmds.select(joints[-1], replace=True)
         jnt = cmds.joint(name=f"{base_name}_{i:03d}", position=pos)
         joints.append(jnt)
+        if i % chunk_size == 0:
+            yield 0.9 * i / num_joints
 
     cmds.select(clear=True)
 
@@ -1,5 +1,7 @@
 import maya.cmds as cmds
 
+from Tools.deferred_job import CHUNK_SIZE, run_to_end
+
 
 def create_spine_locators(
     curve_name="splineCurve_001", num_locs=None, base_name="spineLoc_ctrl"
@@ -8,6 +10,16 @@ def create_spine_locators(
     Paso 2: Crea y alinea locators en cada CV de la curva spline.
     No realiza ninguna conexión nodal (eso lo hace el paso 3).
     """
+    return run_to_end(iter_spine_locators(curve_name, num_locs, base_name))
+
+
+def iter_spine_locators(
+    curve_name="splineCurve_001",
+    num_locs=None,
+    base_name="spineLoc_ctrl",
+    chunk_size=CHUNK_SIZE,
+):
+    """Locators sobre la curva, con un yield cada chunk_size locators."""
     if not cmds.objExists(curve_name):
         cmds.warning(f"⚠️ La curva {curve_name} no existe.")
         return []
@@ -41,6 +53,8 @@ def create_spine_locators(
 
         locators.append(loc)
         print(f"✅ {loc} posicionado sobre {curve_name}.cv[{i}]")
+        if (i + 1) % chunk_size == 0:
+            yield 0.9 * (i + 1) / num_locs
 
     # Agrupar los locators bajo la curva (solo si aún no están)
     safe_to_parent = []
@@ -1,14 +1,30 @@
 import maya.cmds as cmds
 
+from Tools.deferred_job import CHUNK_SIZE, run_to_end
+
 
 def constrain_joints_to_targets(
     joint_base="joint", target_base="spineTarget_ctrl", num_pairs=None
 ):
+    return run_to_end(
+        iter_constrain_joints_to_targets(joint_base, target_base, num_pairs)
+    )
+
+
+def iter_constrain_joints_to_targets(
+    joint_base="joint",
+    target_base="spineTarget_ctrl",
+    num_pairs=None,
+    chunk_size=CHUNK_SIZE,
+):
+    """Parent constraints joint ← target, con un yield cada chunk_size pares."""
     joints = cmds.ls(f"{joint_base}_*", type="joint")
     targets = cmds.ls(f"{target_base}_*", type="transform")
     num_pairs = num_pairs or min(len(joints), len(targets))
 
     for i in range(num_pairs):
+        if i and i % chunk_size == 0:
+            yield i / num_pairs
         jnt = f"{joint_base}_{i + 1:03d}"
         tgt = f"{target_base}_{i + 1:03d}"
         if not cmds.objExists(jnt) or not cmds.objExists(tgt):
@@ -1,3 +1,5 @@
+import inspect
+
 import maya.cmds as cmds
 from Auto_Column import (
     locators2curve,
@@ -8,6 +10,8 @@ from Auto_Column import (
     parent_const,
     all_tools,
 )
+from Tools.deferred_job import run_job, run_to_end
+from Tools.tool_registry import show_cached_window
 
 
 def get_joint_chain_from_selection():
@@ -55,43 +59,99 @@ def rename_joint_chain_if_needed(chain):
     return renamed_chain
 
 
-def build_spine_from_existing_chain():
-    """Crea la estructura del rig a partir de una cadena existente."""
-    chain = get_joint_chain_from_selection()
-    if not chain:
-        return
+def get_spine_build_steps(chain):
+    """
+    Devuelve los pasos del rig de columna para una cadena ya renombrada.
 
-    # 🔁 Renombrar si es necesario
-    chain = rename_joint_chain_if_needed(chain)
+    Args:
+        chain (list[str]): Joints de la cadena (root→end)
 
+    Returns:
+        list[tuple]: Pasos [(label, callable), ...] listos para ejecutar; los
+            pasos largos devuelven generadores que avanzan por bloques de joints
+    """
     num_joints = len(chain)
     base_name = chain[0].split("_")[0]  # inferencia del prefijo
     curve_name = f"{base_name}_curve"
 
-    # Obtener posiciones
-    positions = [cmds.xform(j, q=True, ws=True, t=True) for j in chain]
+    def create_curve():
+        # Obtener posiciones y crear curva usando esas posiciones
+        positions = [cmds.xform(j, q=True, ws=True, t=True) for j in chain]
+        return cmds.curve(name=curve_name, degree=1, ep=positions)
+
+    return [
+        ("Crear curva", create_curve),
+        (
+            "Crear locators",
+            lambda: locators2curve.iter_spine_locators(
+                curve_name=curve_name, num_locs=num_joints
+            ),
+        ),
+        (
+            "Conexión decompose",
+            lambda: doble_parent.iter_connect_locators_to_curve(
+                curve_name=curve_name, num_locs=num_joints
+            ),
+        ),
+        (
+            "Crear controles",
+            lambda: create_controls.create_spine_controls(num_ctrls=num_joints),
+        ),
+        (
+            "Crear targets",
+            lambda: tarjet_curve.iter_spine_targets(
+                curve_name=curve_name, num_targets=num_joints
+            ),
+        ),
+        (
+            "Aim constraints",
+            lambda: aim_const.iter_spine_target_aims(num_targets=num_joints),
+        ),
+        (
+            "Parent constraints",
+            lambda: parent_const.iter_constrain_joints_to_targets(num_pairs=num_joints),
+        ),
+    ]
+
+
+def build_spine_from_existing_chain(deferred=False):
+    """
+    Crea la estructura del rig a partir de una cadena existente.
 
-    # Crear curva usando esas posiciones
-    curve = cmds.curve(name=curve_name, degree=1, ep=positions)
+    Args:
+        deferred (bool): Si es True, ejecuta los pasos como trabajo diferido
+            con barra de progreso y cancelación (default: False)
+    """
+    chain = get_joint_chain_from_selection()
+    if not chain:
+        return
 
-    # Crear el resto del pipeline
-    locators2curve.create_spine_locators(curve_name=curve_name, num_locs=num_joints)
-    doble_parent.connect_locators_to_curve(curve_name=curve_name, num_locs=num_joints)
-    create_controls.create_spine_controls(num_ctrls=num_joints)
-    tarjet_curve.create_spine_targets(curve_name=curve_name, num_targets=num_joints)
-    aim_const.create_spine_target_aims(num_targets=num_joints)
-    parent_const.constrain_joints_to_targets(num_pairs=num_joints)
+    # 🔁 Renombrar si es necesario
+    chain = rename_joint_chain_if_needed(chain)
+    steps = get_spine_build_steps(chain)
 
-    print(f"✅ Rig de columna generado a partir de {num_joints} joints existentes.")
+    if deferred:
+        run_job(f"Spine Rig ({len(chain)} joints)", steps)
+        return
+
+    for _, func in steps:
+        result = func()
+        if inspect.isgenerator(result):
+            run_to_end(result)
 
+    print(f"✅ Rig de columna generado a partir de {len(chain)} joints existentes.")
 
-def open_spine_auto_rig_ui():
+
+def open_spine_auto_rig_ui(rebuild=False):
     """Interfaz con opción de crear o usar joints existentes."""
-    if cmds.window("spineAutoRigWin", exists=True):
-        cmds.deleteUI("spineAutoRigWin")
+    if show_cached_window("spineAutoRigWin", rebuild=rebuild, owner=__name__):
+        return
 
     win = cmds.window(
-        "spineAutoRigWin", title="Spine Auto Rig Tool", widthHeight=(300, 200)
+        "spineAutoRigWin",
+        title="Spine Auto Rig Tool",
+        widthHeight=(300, 200),
+        retain=True,
     )
     cmds.columnLayout(adjustableColumn=True, rowSpacing=10)
 
@@ -104,7 +164,7 @@ def open_spine_auto_rig_ui():
     cmds.button(
         label="Usar joints seleccionados",
         bgc=(0.3, 0.5, 0.8),
-        command=lambda *args: build_spine_from_existing_chain(),
+        command=lambda *args: build_spine_from_existing_chain(deferred=True),
     )
 
     cmds.showWindow(win)
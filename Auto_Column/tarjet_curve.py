@@ -1,5 +1,7 @@
 import maya.cmds as cmds
 
+from Tools.deferred_job import CHUNK_SIZE, run_to_end
+
 
 def create_spine_targets(
     curve_name="splineCurve_001", num_targets=None, base_name="spineTarget_ctrl"
@@ -8,6 +10,16 @@ def create_spine_targets(
     Crea locators 'spineTarget_ctrl_###' distribuidos uniformemente sobre una curva.
     Usa arcLengthDimension para parametrizar de 0 a 1 independientemente de la longitud real.
     """
+    return run_to_end(iter_spine_targets(curve_name, num_targets, base_name))
+
+
+def iter_spine_targets(
+    curve_name="splineCurve_001",
+    num_targets=None,
+    base_name="spineTarget_ctrl",
+    chunk_size=CHUNK_SIZE,
+):
+    """Targets sobre la curva, con un yield cada chunk_size targets."""
     if not cmds.objExists(curve_name):
         cmds.warning(f"⚠️ La curva {curve_name} no existe.")
         return []
@@ -41,6 +53,8 @@ def create_spine_targets(
         cmds.setAttr(f"{poc}.parameter", i * step)
         targets.append(loc)
         print(f"✅ {loc} colocado a lo largo de la curva (param={i * step:.2f})")
+        if (i + 1) % chunk_size == 0:
+            yield (i + 1) / num_targets
 
     print(f"📍 {len(targets)} targets creados sobre {curve_name}")
     return targets
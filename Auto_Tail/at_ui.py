@@ -7,18 +7,28 @@ from Auto_Tail import (
     skinning_contrain,
     dyna_torus,
 )
+from Tools.deferred_job import job_command
+from Tools.tool_registry import show_cached_window, hide_window
 
 
-def auto_tail_ui():
+def auto_tail_ui(rebuild=False):
     """
     Interfaz para ejecutar paso a paso el rig dinámico de cola.
+
+    Args:
+        rebuild (bool): Fuerza la reconstrucción de la ventana cacheada
     """
     window_name = "autoTailWindow"
 
-    if cmds.window(window_name, exists=True):
-        cmds.deleteUI(window_name)
+    if show_cached_window(window_name, rebuild=rebuild, owner=__name__):
+        return
 
-    cmds.window(window_name, title="🐍 Auto Tail Rig Tool", widthHeight=(340, 420))
+    cmds.window(
+        window_name,
+        title="🐍 Auto Tail Rig Tool",
+        widthHeight=(340, 420),
+        retain=True,
+    )
     cmds.columnLayout(adjustableColumn=True, rowSpacing=10, columnAlign="center")
 
     cmds.text(label="Herramienta de Cola Dinámica", height=30, align="center")
@@ -28,35 +38,47 @@ def auto_tail_ui():
     cmds.button(
         label="1️⃣ Crear Curva desde Joints",
         bgc=(0.3, 0.5, 0.8),
-        command=lambda *_: curve_from_joint.create_dynamic_curve_from_joint(),
+        command=job_command(
+            "Auto Tail",
+            lambda: [("Crear curva", curve_from_joint.iter_dynamic_curve_from_joint)],
+        ),
     )
 
     # === PASO 2 ===
     cmds.button(
         label="2️⃣ Hacer Curva Dinámica",
         bgc=(0.4, 0.6, 0.8),
-        command=lambda *_: create_dynamics.make_hair_dynamic(),
+        command=job_command(
+            "Auto Tail", lambda: [("Curva dinámica", create_dynamics.make_hair_dynamic)]
+        ),
     )
 
     # === PASO 3 ===
     cmds.button(
         label="3️⃣ Crear Rig Dinámico",
         bgc=(0.4, 0.7, 0.6),
-        command=lambda *_: rig_setup.hair_rigging_setup(),
+        command=job_command(
+            "Auto Tail", lambda: [("Rig dinámico", rig_setup.iter_hair_rigging_setup)]
+        ),
     )
 
     # === PASO 4 ===
     cmds.button(
         label="4️⃣ Configurar Mesh",
         bgc=(0.6, 0.7, 0.4),
-        command=lambda *_: mesh_setup.tail_mesh_setup(),
+        command=job_command(
+            "Auto Tail", lambda: [("Configurar mesh", mesh_setup.iter_tail_mesh_setup)]
+        ),
     )
 
     # === PASO 5 ===
     cmds.button(
         label="5️⃣ Bind Skin + Constraints",
         bgc=(0.7, 0.6, 0.4),
-        command=lambda *_: skinning_contrain.skin_and_constraint_setup(),
+        command=job_command(
+            "Auto Tail",
+            lambda: [("Bind skin", skinning_contrain.iter_skin_and_constraint_setup)],
+        ),
     )
 
     # === PASO 6 ===
@@ -74,14 +96,16 @@ def auto_tail_ui():
     cmds.button(
         label="6️⃣ Crear Dyna Torus (Requiere selección del toroide)",
         bgc=(0.85, 0.55, 0.35),
-        command=lambda *_: dyna_torus.create_dynamic_object(),
+        command=job_command(
+            "Auto Tail", lambda: [("Dyna torus", dyna_torus.iter_create_dynamic_object)]
+        ),
     )
 
     cmds.separator(height=15, style="in")
     cmds.button(
         label="❌ Cerrar",
         bgc=(0.5, 0.2, 0.2),
-        command=lambda *_: cmds.deleteUI(window_name),
+        command=lambda *_: hide_window(window_name),
     )
 
     cmds.showWindow(window_name)
@@ -1,7 +1,15 @@
 import maya.cmds as cmds
 
+from Tools.deferred_job import run_to_end
+
 
 def create_dynamic_curve_from_joint(base_name="dynamic_cv_001", num_spans=8):
+    """Renombra la cadena seleccionada y crea la curva que pasa por sus joints."""
+    return run_to_end(iter_dynamic_curve_from_joint(base_name, num_spans))
+
+
+def iter_dynamic_curve_from_joint(base_name="dynamic_cv_001", num_spans=8):
+    """Curva dinámica del joint, con un yield entre el renombrado y la curva."""
     sel = cmds.ls(selection=True, type="joint")
     if not sel:
         cmds.warning("Por favor selecciona el PRIMER joint de la cadena.")
@@ -37,6 +45,7 @@ def create_dynamic_curve_from_joint(base_name="dynamic_cv_001", num_spans=8):
 
     joint_chain = renamed_chain
     print(f"Cadena de joints renombrada: {joint_chain}\n")
+    yield 0.5
 
     # Obtener posiciones en world space
     positions = [cmds.xform(j, q=True, ws=True, t=True) for j in joint_chain]
@@ -1,11 +1,19 @@
 import maya.cmds as cmds
 
+from Tools import control_shapes
+from Tools.deferred_job import run_to_end
+
 
 def create_dynamic_object():
     """
     Script de rigging dinámico para Maya.
     Crea un sistema completo de control dinámico para un objeto seleccionado.
     """
+    return run_to_end(iter_create_dynamic_object())
+
+
+def iter_create_dynamic_object():
+    """Toroide dinámico, con un yield entre plano, skin, locator y control."""
 
     # Obtener la selección actual
     selection = cmds.ls(selection=True)
@@ -35,6 +43,8 @@ def create_dynamic_object():
     # Deseleccionar
     cmds.select(clear=True)
 
+    yield 0.10
+
     # ===== PARTE 2: BIND SKIN =====
     print("\n--- Iniciando Bind Skin ---")
 
@@ -52,6 +62,8 @@ def create_dynamic_object():
     cmds.skinCluster(joint, plane_name_full, toSelectedBones=True)
     print("✓ Bind Skin aplicado")
 
+    yield 0.20
+
     # ===== PARTE 3: COPY SKIN WEIGHTS =====
     print("\n--- Copiando Skin Weights ---")
 
@@ -72,6 +84,8 @@ def create_dynamic_object():
     )
     print("✓ Skin Weights copiados")
 
+    yield 0.30
+
     # ===== PARTE 4: CREATE LOCATOR =====
     print("\n--- Creando Locator ---")
 
@@ -84,6 +98,8 @@ def create_dynamic_object():
     locator_name = locator[0]
     print(f"✓ Locator creado: {locator_name}")
 
+    yield 0.40
+
     # ===== PARTE 5: POINT ON POLY CONSTRAINT =====
     print("\n--- Aplicando Point On Poly Constraint ---")
 
@@ -98,6 +114,8 @@ def create_dynamic_object():
     constraint_name = constraint[0]
     print(f"✓ Point On Poly Constraint aplicado: {constraint_name}")
 
+    yield 0.50
+
     # ===== PARTE 6: CONFIGURAR DRIVER PLANE TARGET =====
     print("\n--- Configurando Driver Plane Target ---")
 
@@ -121,6 +139,8 @@ def create_dynamic_object():
         print(f"⚠ Error al configurar atributos: {e}")
         print("Verifica que los nombres de los atributos sean correctos")
 
+    yield 0.60
+
     # ===== PARTE 7: CREAR CURVA CONTROL =====
     print("\n--- Creando Curva Control ---")
 
@@ -130,8 +150,8 @@ def create_dynamic_object():
     )
 
     # Crear una curva control simple (círculo)
-    curve = cmds.circle(name="dynamic_ctrl_002", normal=(0, 1, 0), radius=1.0)
-    curve_name = curve[0]
+    curve_name = cmds.createNode("transform", name="dynamic_ctrl_002")
+    control_shapes.create_control_shape(curve_name, "circle", radius=1.0)
 
     # Posicionar la curva en el pivote del toroide + 1.5 unidades arriba en Y
     cmds.xform(
@@ -143,6 +163,8 @@ def create_dynamic_object():
     print(f"✓ Curva control creada: {curve_name}")
     print(f"  Posición: ({torus_pivot[0]}, {torus_pivot[1] + 1.5}, {torus_pivot[2]})")
 
+    yield 0.70
+
     # ===== PARTE 8: CREAR ROOT DE LA CURVA =====
     print("\n--- Creando Root de la Curva ---")
 
@@ -177,6 +199,8 @@ def create_dynamic_object():
     root_name = create_root(curve_name)
     print(f"✓ Root creado: {root_name}")
 
+    yield 0.80
+
     # ===== PARTE 9: EMPARENTAR ROOT AL LOCATOR =====
     print("\n--- Emparentando Root al Locator ---")
 
@@ -187,6 +211,8 @@ def create_dynamic_object():
     cmds.parent(root_name, locator_name)
     print(f"✓ {root_name} emparentado a {locator_name}")
 
+    yield 0.90
+
     # ===== PARTE 10: PARENT CONSTRAIN Y SCALE CONSTRAIN =====
     print("\n--- Aplicando Constraints ---")
 
@@ -1,12 +1,19 @@
 import maya.cmds as cmds
 import math
 
+from Tools.deferred_job import run_to_end
+
 
 def tail_mesh_setup():
     """
     Script para configurar el mesh de la cola dinámico.
     Realiza hasta el posicionamiento del cilindro.
     """
+    return run_to_end(iter_tail_mesh_setup())
+
+
+def iter_tail_mesh_setup():
+    """Malla PolyTail, con un yield tras cada PASO (cilindro, pivote, extrusión)."""
 
     all_joints = cmds.ls(type="joint")
     original_joints = [j for j in all_joints if "_IK_" not in j]
@@ -28,6 +35,8 @@ def tail_mesh_setup():
     cmds.parent(follicles_group, ctrl_curve)
     print(f"'{follicles_group}' emparentado a '{ctrl_curve}'")
 
+    yield 0.11
+
     # PASO 2: Crear cilindro
     print("\n=== PASO 2: Creando cilindro ===")
 
@@ -44,6 +53,8 @@ def tail_mesh_setup():
     )[0]
     print(f"Cilindro creado: {cylinder}")
 
+    yield 0.22
+
     # PASO 3: Mover pivote al vértice inferior del cilindro
     print("\n=== PASO 3: Ajustando pivote del cilindro ===")
 
@@ -57,6 +68,8 @@ def tail_mesh_setup():
     cmds.xform(cylinder, pivots=vertex_pos, worldSpace=True)
     print("Pivote movido al vértice 16 del cilindro")
 
+    yield 0.33
+
     # PASO 4: Mover cilindro al inicio de la curva (primer joint)
     print("\n=== PASO 4: Posicionando cilindro en el primer joint ===")
 
@@ -66,6 +79,8 @@ def tail_mesh_setup():
     cmds.xform(cylinder, worldSpace=True, translation=first_joint_pos)
     print("Cilindro movido a la posición del primer joint")
 
+    yield 0.44
+
     # PASO 5: Rotar ligeramente el cilindro para que coincida con la curva
     print("\n=== PASO 5: Rotando cilindro para coincidir con la curva ===")
 
@@ -84,6 +99,8 @@ def tail_mesh_setup():
     cmds.xform(cylinder, rotation=(0, angle_y, 0), worldSpace=True)
     print(f"Cilindro rotado {angle_y} grados")
 
+    yield 0.56
+
     # PASO 6: Seleccionar caras inferiores del cilindro
     print("\n=== PASO 6: Seleccionando caras inferiores ===")
 
@@ -133,6 +150,8 @@ def tail_mesh_setup():
     cmds.delete(cylinder, constructionHistory=True)
     print("Historial borrado")
 
+    yield 0.89
+
     # PASO 9: Renombrar cilindro como PolyTail
     print("\n=== PASO 9: Renombrando cilindro ===")
 
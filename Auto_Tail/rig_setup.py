@@ -1,5 +1,7 @@
 import maya.cmds as cmds
 
+from Tools.deferred_job import run_to_end
+
 
 def create_root_for_curve(curve_name):
     """
@@ -80,6 +82,11 @@ def hair_rigging_setup():
     Script para configurar el rigging de cabello dinámico.
     Realiza: renombrado de curva, IK Spline, gravedad, Point Lock, control curve y snap.
     """
+    return run_to_end(iter_hair_rigging_setup())
+
+
+def iter_hair_rigging_setup():
+    """Rig de pelo, con un yield tras cada PASO desde la cadena IK."""
 
     # PASO 1: Obtener y preparar joints
     print("=== PASO 1: Obteniendo cadena de joints ===")
@@ -127,6 +134,8 @@ def hair_rigging_setup():
         cmds.warning("No se encontró 'curve1' en el grupo de salida.")
         return False
 
+    yield 0.33
+
     # PASO 4: Crear IK Spline Handle sin auto create curve
     print("\n=== PASO 4: Creando IK Spline Handle ===")
 
@@ -140,6 +149,8 @@ def hair_rigging_setup():
 
     print(f"IK Spline Handle creado: {ik_handle}")
 
+    yield 0.44
+
     # PASO 5: Setear gravedad a 98 en nucleus
     print("\n=== PASO 5: Configurando Nucleus ===")
 
@@ -157,6 +168,8 @@ def hair_rigging_setup():
     except Exception as e:
         cmds.warning(f"Error al setear gravedad: {str(e)}")
 
+    yield 0.56
+
     # PASO 6: Cambiar Point Lock a "base" en follicleShape1
     print("\n=== PASO 6: Configurando Follicle Point Lock ===")
 
@@ -171,6 +184,8 @@ def hair_rigging_setup():
     except Exception as e:
         cmds.warning(f"Error al setear Point Lock: {str(e)}")
 
+    yield 0.67
+
     # PASO 7: Crear curva de control 'dynamic_ctrl_001'
     print("\n=== PASO 7: Creando curva de control ===")
 
@@ -182,6 +197,8 @@ def hair_rigging_setup():
     )
     print(f"Curva de control creada: {ctrl_curve}")
 
+    yield 0.78
+
     # PASO 8: Llevar la curva al primer joint usando snap (v)
     print("\n=== PASO 8: Snapping control curve al primer joint ===")
 
@@ -198,6 +215,8 @@ def hair_rigging_setup():
     except Exception as e:
         cmds.warning(f"Error al hacer snap: {str(e)}")
 
+    yield 0.89
+
     # PASO 9: Crear root para la curva de control
     print("\n=== PASO 9: Creando root para la curva de control ===")
 
@@ -1,10 +1,17 @@
 import maya.cmds as cmds
 
+from Tools.deferred_job import CHUNK_SIZE, run_to_end
+
 
 def skin_and_constraint_setup():
     """
     Script para hacer bind skin y crear parent constraints entre joints.
     """
+    return run_to_end(iter_skin_and_constraint_setup())
+
+
+def iter_skin_and_constraint_setup(chunk_size=CHUNK_SIZE):
+    """Bind y constraints, con un yield tras el bind y cada chunk_size joints."""
 
     poly_tail = "PolyTail"
 
@@ -36,6 +43,8 @@ def skin_and_constraint_setup():
         cmds.warning(f"Error en bind skin: {str(e)}")
         return False
 
+    yield 0.5
+
     # PASO 2: Crear parent constraints entre joints
     print("\n=== PASO 2: Creando Parent Constraints ===")
 
@@ -51,7 +60,9 @@ def skin_and_constraint_setup():
     # joint_001 -> joint_IK_001, joint_002 -> joint_IK_002, etc.
     constraint_count = 0
 
-    for normal_joint in normal_joints:
+    for index, normal_joint in enumerate(normal_joints):
+        if index and index % chunk_size == 0:
+            yield 0.5 + 0.5 * index / len(normal_joints)
         # Encontrar el joint IK correspondiente
         # Asumir que los nombres siguen un patrón similar
         ik_joint = None
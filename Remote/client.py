@@ -0,0 +1,582 @@
+"""
+Remote - Cliente del commandPort de Maya
+=======================================
+
+Cliente con conexiones persistentes a uno o varios commandPort de Maya. Cada
+petición viaja enmarcada (ver Remote.protocol) y devuelve el resultado, la salida
+impresa y, si falla, el error con su traceback remoto.
+
+Características:
+    - Pool de conexiones por endpoint (host, puerto), reutilizadas entre llamadas
+    - Timeouts de conexión y de respuesta
+    - Reconexión automática cuando una conexión del pool se ha caído
+    - Reintentos solo si la petición no llegó a enviarse (o si se marca como
+      idempotente): una petición enviada pudo ejecutarse en Maya
+    - Pipeline: varias peticiones por la misma conexión con una sola escritura
+
+Transportes:
+    - "commandPort" (default): commandPort de Maya, una línea MEL por petición
+    - "server": Remote.server arrancado en Maya; frames nativos, cola con
+      prioridades y logs en vivo (on_log)
+
+Requisitos en Maya:
+    - commandPort abierto con un bufferSize grande:
+      Remote.port_handler.open_command_port(4434), o
+      cmds.commandPort(name=":4434", sourceType="mel", bufferSize=4194304)
+      (el bufferSize por defecto, 4096, no deja pasar peticiones largas)
+    - Remote.port_handler importable en Maya; si no lo es, el cliente envía su
+      código con Remote.protocol.bootstrap_command la primera vez
+    - o servidor arrancado: Remote.server.start_server()
+
+Uso:
+    >>> from Remote import client
+    >>> maya = client.get_client("127.0.0.1", 4434)
+    >>> maya.eval_expr("1 + 1")
+    2
+    >>> maya.exec_file("C:/dev/Tecnical-Art-Scripts-/main.py")
+"""
+
+import itertools
+import queue
+import socket
+import threading
+from contextlib import contextmanager
+
+from Remote import protocol
+
+
+HOST = "127.0.0.1"
+PORT = 4434
+TRANSPORTS = ("commandPort", "server")
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+class RequestLostError(ConnectionError):
+    """La conexión se cayó después de enviar la petición: Maya pudo ejecutarla."""
+
+
+class MayaConnection:
+    """
+    Conexión TCP persistente a un commandPort.
+
+    Args:
+        host (str): Host del commandPort
+        port (int): Puerto del commandPort
+        timeout (float): Segundos máximos de espera por respuesta
+        connect_timeout (float): Segundos máximos para conectar
+        transport (str): "commandPort" o "server"
+        on_log (callable): Recibe (id, texto) de los logs en vivo ("server")
+        buffer_size (int): bufferSize del commandPort de Maya
+        bootstrap (bool): Enviar el código del handler si Maya no lo tiene
+    """
+
+    def __init__(
+        self,
+        host=HOST,
+        port=PORT,
+        timeout=30.0,
+        connect_timeout=3.0,
+        transport="commandPort",
+        on_log=None,
+        buffer_size=protocol.COMMAND_PORT_BUFFER_SIZE,
+        bootstrap=True,
+    ):
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Transporte desconocido '{transport}': {TRANSPORTS}")
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.transport = transport
+        self.on_log = on_log
+        self.buffer_size = buffer_size
+        self.bootstrap = bootstrap
+        self._sock = None
+        self._buffer = b""
+
+    @property
+    def connected(self):
+        return self._sock is not None
+
+    def connect(self):
+        """Abre la conexión si no está abierta."""
+        if self._sock is None:
+            sock = socket.create_connection(
+                (self.host, self.port), timeout=self.connect_timeout
+            )
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.settimeout(self.timeout)
+            self._sock = sock
+            self._buffer = b""
+        return self
+
+    def is_alive(self):
+        """Comprueba sin bloquear si el otro extremo no ha cerrado la conexión."""
+        if self._sock is None:
+            return False
+        try:
+            self._sock.setblocking(False)
+            try:
+                data = self._sock.recv(1, socket.MSG_PEEK)
+            finally:
+                self._sock.settimeout(self.timeout)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        return bool(data)
+
+    def close(self):
+        """Cierra la conexión (se puede volver a abrir con connect)."""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+                self._buffer = b""
+
+    def pipeline(self, messages):
+        """
+        Envía varias peticiones con una sola escritura y lee sus respuestas en orden.
+
+        Args:
+            messages (list[dict]): Peticiones con "id" y "op"
+
+        Returns:
+            list[dict]: Respuestas en el mismo orden
+
+        Raises:
+            RequestLostError: La conexión se cayó después de enviar las peticiones
+        """
+        # Se codifica antes de conectar: una petición demasiado grande no sale
+        data = self._encode(messages)
+        self.connect()
+        try:
+            self._sock.sendall(data)
+        except BaseException:
+            self.close()
+            raise
+
+        try:
+            if self.transport == "server":
+                replies = self._read_server_replies(messages)
+            else:
+                replies = self._read_command_port_replies(messages)
+        except TimeoutError:
+            self.close()
+            raise
+        except (ConnectionError, OSError) as e:
+            self.close()
+            raise RequestLostError(
+                f"Se perdió la conexión con Maya ({self.host}:{self.port}) después "
+                f"de enviar la petición; puede que se haya ejecutado: {e}"
+            ) from e
+        except BaseException:
+            # La conexión queda desincronizada: no se puede reutilizar
+            self.close()
+            raise
+
+        for message, reply in zip(messages, replies):
+            if reply.get("id") != message.get("id"):
+                self.close()
+                raise protocol.ProtocolError(
+                    f"Respuesta fuera de orden: id {reply.get('id')} "
+                    f"(se esperaba {message.get('id')})."
+                )
+        return replies
+
+    def request(self, message):
+        """Envía una petición y devuelve su respuesta."""
+        return self.pipeline([message])[0]
+
+    def send_raw(self, line):
+        """
+        Envía una línea MEL propia y devuelve la respuesta sin decodificar.
+
+        Solo para el transporte "commandPort" (bootstrap, arranque del servidor).
+        """
+        self.connect()
+        try:
+            self._sock.sendall(line)
+            return self._read_raw_reply()
+        except BaseException:
+            self.close()
+            raise
+
+    def _encode(self, messages):
+        if self.transport == "server":
+            return b"".join(protocol.encode_frame(m) for m in messages)
+        return b"".join(protocol.to_command_port(m, self.buffer_size) for m in messages)
+
+    def _read_command_port_replies(self, messages):
+        """
+        Lee una respuesta por línea enviada.
+
+        Si ninguna se puede decodificar y Maya no tiene Remote.port_handler, el
+        handler no llegó a ejecutarse: se envía su código (bootstrap) y se
+        repiten las peticiones.
+        """
+        raw = [self._read_raw_reply() for _ in messages]
+        try:
+            return [self._decode_reply(r) for r in raw]
+        except protocol.ProtocolError:
+            if not self.bootstrap or self._has_handler():
+                raise
+        print(f"📦 Enviando el handler de Remote a Maya ({self.host}:{self.port})")
+        self._sock.sendall(protocol.bootstrap_command(buffer_size=self.buffer_size))
+        self._read_raw_reply()
+        self._sock.sendall(self._encode(messages))
+        return [self._decode_reply(self._read_raw_reply()) for _ in messages]
+
+    def _has_handler(self):
+        """Pregunta a Maya si puede importar Remote.port_handler."""
+        self._sock.sendall(
+            b"python(\"__import__('importlib.util').util.find_spec("
+            b"'Remote.port_handler') is not None\");\n"
+        )
+        return self._read_raw_reply().strip() in (b"1", b"True")
+
+    def _read_server_replies(self, messages):
+        """Lee frames del servidor hasta tener todos los resultados (en cualquier orden)."""
+        pending = {m.get("id") for m in messages}
+        results = {}
+        while pending:
+            try:
+                frame = protocol.read_frame(self._sock)
+            except socket.timeout as e:
+                raise TimeoutError(
+                    f"Maya no respondió en {self.timeout}s ({self.host}:{self.port})."
+                ) from e
+            if frame.get("type") == "log":
+                if self.on_log is not None:
+                    self.on_log(frame.get("id"), frame.get("text", ""))
+                continue
+            if frame.get("id") not in pending:
+                raise protocol.ProtocolError(f"Respuesta inesperada: {frame}")
+            pending.discard(frame["id"])
+            results[frame["id"]] = frame
+        return [results[m.get("id")] for m in messages]
+
+    def _read_raw_reply(self):
+        terminator = protocol.COMMAND_PORT_TERMINATOR
+        while terminator not in self._buffer:
+            try:
+                chunk = self._sock.recv(65536)
+            except socket.timeout as e:
+                raise TimeoutError(
+                    f"Maya no respondió en {self.timeout}s ({self.host}:{self.port})."
+                ) from e
+            if not chunk:
+                raise ConnectionError(
+                    f"Conexión cerrada por Maya ({self.host}:{self.port})."
+                )
+            self._buffer += chunk
+
+        raw, self._buffer = self._buffer.split(terminator, 1)
+        return raw
+
+    def _decode_reply(self, raw):
+        try:
+            return protocol.decode_b64_frame(raw.decode("ascii", errors="replace"))
+        except protocol.ProtocolError as e:
+            raise protocol.ProtocolError(
+                f"Respuesta no válida del commandPort ({e}). "
+                "¿Está abierto con un bufferSize suficiente "
+                "(Remote.port_handler.open_command_port)? "
+                f"Respuesta: {raw[:200]!r}"
+            ) from e
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones persistentes a un único endpoint.
+
+    Args:
+        host (str): Host del commandPort
+        port (int): Puerto del commandPort
+        size (int): Número máximo de conexiones simultáneas
+        timeout (float): Timeout de respuesta de cada conexión
+        **options: Opciones de MayaConnection (transport, on_log, buffer_size...)
+    """
+
+    def __init__(self, host=HOST, port=PORT, size=4, timeout=30.0, **options):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.options = options
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def connection(self):
+        """Presta una conexión abierta del pool (o crea una nueva)."""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+                if not conn.is_alive():
+                    # Maya reiniciado o commandPort reabierto: conexión nueva
+                    conn.close()
+            except queue.Empty:
+                conn = MayaConnection(
+                    self.host, self.port, timeout=self.timeout, **self.options
+                )
+            try:
+                yield conn.connect()
+            finally:
+                if conn.connected:
+                    self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Cierra todas las conexiones inactivas del pool."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class MayaClient:
+    """
+    Cliente de alto nivel sobre un pool de conexiones.
+
+    Args:
+        host (str): Host del commandPort (default: 127.0.0.1)
+        port (int): Puerto del commandPort (default: 4434)
+        pool_size (int): Conexiones simultáneas máximas (default: 4)
+        timeout (float): Segundos máximos de espera por respuesta
+        retries (int): Reintentos si la conexión falla antes de enviar la
+            petición (default: 1)
+        transport (str): "commandPort" (default) o "server" (Remote.server)
+        on_log (callable): Recibe (id, texto) de los logs en vivo ("server")
+        buffer_size (int): bufferSize del commandPort de Maya
+            (default: protocol.COMMAND_PORT_BUFFER_SIZE)
+    """
+
+    def __init__(
+        self,
+        host=HOST,
+        port=PORT,
+        pool_size=4,
+        timeout=30.0,
+        retries=1,
+        transport="commandPort",
+        on_log=None,
+        buffer_size=protocol.COMMAND_PORT_BUFFER_SIZE,
+    ):
+        self.host = host
+        self.port = port
+        self.retries = retries
+        self.transport = transport
+        self.pool = ConnectionPool(
+            host,
+            port,
+            size=pool_size,
+            timeout=timeout,
+            transport=transport,
+            on_log=on_log,
+            buffer_size=buffer_size,
+        )
+        self._ids = itertools.count(1)
+
+    def __repr__(self):
+        return f"MayaClient({self.host!r}, {self.port})"
+
+    def message(self, op, priority=0, **fields):
+        """
+        Construye una petición con id único.
+
+        priority solo se usa con el transporte "server" (mayor = antes).
+        """
+        message = {"id": next(self._ids), "op": op, **fields}
+        if priority:
+            message["priority"] = priority
+        return message
+
+    def pipeline(self, messages, raise_errors=True, idempotent=False):
+        """
+        Envía varias peticiones por una misma conexión.
+
+        Solo se reintenta si la conexión falla antes de terminar de enviar: una
+        petición enviada pudo ejecutarse en Maya y repetirla duplicaría su efecto.
+
+        Args:
+            messages (list[dict]): Peticiones creadas con message()
+            raise_errors (bool): Lanzar RemoteError con la primera respuesta fallida
+            idempotent (bool): Las peticiones se pueden repetir sin efectos;
+                también se reintentan si la conexión cae tras enviarlas
+
+        Returns:
+            list[dict]: Respuestas completas
+        """
+        attempt = 0
+        while True:
+            try:
+                with self.pool.connection() as conn:
+                    replies = conn.pipeline(messages)
+                break
+            except TimeoutError:
+                raise
+            except RequestLostError:
+                attempt += 1
+                if not idempotent or attempt > self.retries:
+                    raise
+            except (ConnectionError, OSError):
+                # Sin conectar o envío incompleto: Maya no recibió la petición
+                attempt += 1
+                if attempt > self.retries:
+                    raise
+
+        if raise_errors:
+            for reply in replies:
+                if not reply.get("ok"):
+                    raise protocol.RemoteError(
+                        reply.get("error", "Error desconocido"),
+                        reply.get("traceback", ""),
+                        reply,
+                    )
+        return replies
+
+    def call(self, op, raise_errors=True, idempotent=False, **fields):
+        """
+        Ejecuta una operación remota y devuelve su resultado.
+
+        Args:
+            op (str): Operación registrada en Remote.port_handler
+            raise_errors (bool): Lanzar RemoteError si la operación falla
+            idempotent (bool): Reintentar aunque la conexión caiga tras enviarla
+            **fields: Argumentos de la petición
+
+        Returns:
+            Resultado de la operación (o la respuesta completa si raise_errors=False)
+        """
+        reply = self.pipeline([self.message(op, **fields)], raise_errors, idempotent)[0]
+        return reply.get("result") if raise_errors else reply
+
+    def ping(self):
+        return self.call("ping", idempotent=True)
+
+    def exec_code(self, code):
+        """Ejecuta código Python en el namespace persistente de la sesión."""
+        return self.call("exec", code=code)
+
+    def eval_expr(self, expression):
+        """Evalúa una expresión Python en Maya y devuelve su valor."""
+        return self.call("eval", code=expression)
+
+    def exec_file(self, path, raise_errors=True):
+        """Ejecuta un archivo en Maya como __main__."""
+        return self.call("exec_file", raise_errors, path=str(path).replace("\\", "/"))
+
+    def reload(self, modules=None, dry_run=False):
+        """
+        Recarga en Maya los módulos cambiados y sus dependientes.
+
+        Args:
+            modules (list[str]): Módulos o rutas a forzar (además de los cambiados)
+            dry_run (bool): Solo devolver qué se recargaría
+
+        Returns:
+            dict: {"changed", "reloaded", "skipped", "errors", "windows"}
+        """
+        modules = [str(m).replace("\\", "/") for m in modules or ()]
+        return self.call("reload", modules=modules, dry_run=dry_run)
+
+    def rpc(self, name, *args, **kwargs):
+        """
+        Llama a una función registrada en Remote.rpc con argumentos JSON.
+
+        Ejemplo:
+            >>> maya.rpc("create_spine_targets", "splineCurve_001", num_targets=5)
+        """
+        return self.call("rpc", name=name, args=list(args), kwargs=kwargs)
+
+    def start_server(self, port=None):
+        """
+        Arranca Remote.server en Maya a través del commandPort.
+
+        La primera línea es autocontenida (protocol.bootstrap_command): instala
+        en memoria el handler, Remote.rpc y Remote.server si Maya no puede
+        importarlos. Si el commandPort no es local, el servidor escucha en
+        todas las interfaces.
+
+        Args:
+            port (int): Puerto del servidor (default: Remote.server.SERVER_PORT)
+
+        Returns:
+            MayaClient: Cliente compartido con transporte "server"
+        """
+        from Remote import server
+
+        port = port or server.SERVER_PORT
+        if self.transport == "server":
+            raise ValueError("El cliente ya usa el transporte 'server'.")
+        host = "127.0.0.1" if self.host in ("127.0.0.1", "localhost") else "0.0.0.0"
+        start = (
+            "__import__('Remote.server', fromlist=['start_server'])"
+            f".start_server(host='{host}', port={int(port)})"
+        )
+        buffer_size = self.pool.options.get("buffer_size")
+        with self.pool.connection() as conn:
+            conn.send_raw(
+                protocol.bootstrap_command(protocol.BUNDLE_MODULES, buffer_size)
+            )
+            conn.send_raw(f'python("{start}");\n'.encode("ascii"))
+        return get_client(self.host, port, transport="server")
+
+    def push_bundle(self, root=None, packages=None, server_port=None):
+        """
+        Envía los paquetes del repositorio comprimidos para importarlos en memoria.
+
+        El bundle no cabe en el bufferSize del commandPort: siempre viaja por el
+        transporte "server". Desde un cliente "commandPort" se arranca antes el
+        servidor en Maya con start_server, así que Remote no tiene que estar
+        instalado allí.
+
+        Args:
+            root (str | Path): Raíz del repositorio
+            packages (list[str]): Paquetes a incluir (default: todos menos Remote)
+            server_port (int): Puerto de Remote.server (default: 4450)
+
+        Returns:
+            list[str]: Módulos disponibles en Maya desde el bundle
+        """
+        from Remote import rpc
+
+        target = self if self.transport == "server" else self.start_server(server_port)
+        data = rpc.encode_bundle(rpc.build_bundle(root, packages))
+        return target.call("load_bundle", data=data)
+
+    def close(self):
+        self.pool.close()
+
+
+def get_client(host=HOST, port=PORT, **kwargs):
+    """
+    Devuelve el cliente compartido de un endpoint (lo crea la primera vez).
+
+    Args:
+        host (str): Host del commandPort
+        port (int): Puerto del commandPort
+        **kwargs: Opciones de MayaClient para la primera creación
+
+    Returns:
+        MayaClient: Cliente con pool persistente
+    """
+    key = (host, int(port), kwargs.get("transport", "commandPort"))
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = MayaClient(host, int(port), **kwargs)
+        return _clients[key]
+
+
+def close_all():
+    """Cierra las conexiones de todos los clientes compartidos."""
+    with _clients_lock:
+        for maya in _clients.values():
+            maya.close()
+        _clients.clear()
@@ -0,0 +1,287 @@
+"""
+Remote - Reparto de trabajos entre varias sesiones de Maya
+=========================================================
+
+Dispatcher asyncio que mantiene una conexión por instancia de Maya o mayapy
+(distintos puertos o hosts) y reparte entre ellas una lista de trabajos: builds
+de rigs, ejecución de scripts o cualquier operación de Remote.port_handler.
+
+Funcionamiento:
+    1. Los trabajos entran en una cola común
+    2. Cada instancia tiene max_in_flight workers: nunca hay más peticiones
+       pendientes que ese número en su conexión (las peticiones van en pipeline)
+    3. Si una conexión se cae, los trabajos pendientes vuelven a la cola
+       (hasta 'retries' veces) y la instancia reconecta con espera incremental
+    4. Los errores de Maya no se reintentan: se devuelven como fallos
+
+Uso:
+    >>> from Remote import dispatcher
+    >>> jobs = [{"op": "exec_file", "path": p} for p in build_scripts]
+    >>> results = dispatcher.dispatch(jobs, [("127.0.0.1", 4434), ("127.0.0.1", 4435)])
+    >>> [r.ok for r in results]
+"""
+
+import asyncio
+import collections
+import itertools
+from dataclasses import dataclass
+
+from Remote import protocol
+
+
+@dataclass
+class JobResult:
+    """Resultado de un trabajo repartido."""
+
+    index: int
+    job: dict
+    ok: bool = False
+    result: object = None
+    output: str = ""
+    error: str = ""
+    traceback: str = ""
+    endpoint: tuple = None
+    attempts: int = 0
+
+
+class MayaInstance:
+    """
+    Conexión asyncio a una instancia de Maya con peticiones en pipeline.
+
+    Args:
+        host (str): Host del commandPort
+        port (int): Puerto del commandPort
+        max_in_flight (int): Peticiones pendientes máximas en la conexión
+        timeout (float): Segundos máximos por respuesta
+    """
+
+    def __init__(self, host, port, max_in_flight=2, timeout=120.0):
+        self.host = host
+        self.port = port
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.down = False
+        self._reader = None
+        self._writer = None
+        self._pending = collections.deque()
+        self._read_task = None
+        self._connect_lock = asyncio.Lock()
+
+    @property
+    def endpoint(self):
+        return (self.host, self.port)
+
+    def __repr__(self):
+        return f"MayaInstance({self.host!r}, {self.port})"
+
+    async def connect(self):
+        async with self._connect_lock:
+            if self._writer is not None:
+                return
+            # base64 ocupa 4/3 del frame: el límite del reader debe cubrirlo
+            self._reader, self._writer = await asyncio.open_connection(
+                self.host, self.port, limit=2 * protocol.MAX_FRAME_SIZE
+            )
+            self._read_task = asyncio.ensure_future(self._read_replies())
+
+    async def _read_replies(self):
+        terminator = protocol.COMMAND_PORT_TERMINATOR
+        try:
+            while True:
+                raw = await self._reader.readuntil(terminator)
+                reply = protocol.decode_b64_frame(raw[:-1].decode("ascii", "replace"))
+                future = self._pending.popleft()
+                if not future.done():
+                    future.set_result(reply)
+        except (asyncio.IncompleteReadError, OSError, IndexError) as e:
+            self._fail_pending(ConnectionError(f"Conexión perdida con {self}: {e}"))
+        except protocol.ProtocolError as e:
+            self._fail_pending(e)
+        finally:
+            self._close_transport()
+
+    def _fail_pending(self, error):
+        while self._pending:
+            future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(error)
+
+    def _close_transport(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def request(self, message):
+        """Envía una petición y espera su respuesta."""
+        line = protocol.to_command_port(message, protocol.COMMAND_PORT_BUFFER_SIZE)
+        await self.connect()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(future)
+        self._writer.write(line)
+        await self._writer.drain()
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            # La conexión queda desincronizada: se cierra y se reabre después
+            await self.close()
+            raise
+
+    async def close(self):
+        if self._read_task is not None:
+            self._read_task.cancel()
+            try:
+                await self._read_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._read_task = None
+        self._fail_pending(ConnectionError(f"Conexión cerrada con {self}."))
+        self._close_transport()
+
+
+class Dispatcher:
+    """
+    Reparte trabajos entre varias instancias de Maya.
+
+    Args:
+        endpoints (list[tuple]): [(host, puerto), ...]
+        max_in_flight (int): Peticiones pendientes máximas por instancia
+        retries (int): Reintentos de un trabajo si se cae la conexión
+        timeout (float): Segundos máximos por trabajo
+        max_connect_failures (int): Fallos de conexión seguidos antes de
+            descartar una instancia
+    """
+
+    def __init__(
+        self,
+        endpoints,
+        max_in_flight=2,
+        retries=2,
+        timeout=120.0,
+        max_connect_failures=3,
+    ):
+        self.instances = [
+            MayaInstance(host, port, max_in_flight, timeout) for host, port in endpoints
+        ]
+        self.retries = retries
+        self.max_connect_failures = max_connect_failures
+        self._ids = itertools.count(1)
+
+    async def run(self, jobs, on_result=None):
+        """
+        Ejecuta todos los trabajos y devuelve sus resultados en el orden original.
+
+        Args:
+            jobs (list[dict]): Peticiones {"op": ..., ...argumentos}
+            on_result (callable): Callback opcional por cada JobResult terminado
+
+        Returns:
+            list[JobResult]: Resultados (mismo orden que jobs)
+        """
+        results = [JobResult(i, dict(job)) for i, job in enumerate(jobs)]
+        queue = asyncio.Queue()
+        for result in results:
+            queue.put_nowait(result)
+        if not self.instances:
+            for result in results:
+                result.error = "Ninguna instancia de Maya configurada."
+            return results
+
+        remaining = {"count": len(results)}
+        finished = asyncio.Event()
+        if not results:
+            finished.set()
+
+        def complete(result):
+            remaining["count"] -= 1
+            if on_result is not None:
+                on_result(result)
+            if remaining["count"] == 0:
+                finished.set()
+
+        workers = [
+            asyncio.ensure_future(self._worker(instance, queue, complete))
+            for instance in self.instances
+            for _ in range(instance.max_in_flight)
+        ]
+
+        try:
+            await finished.wait()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for instance in self.instances:
+                await instance.close()
+        return results
+
+    async def _worker(self, instance, queue, complete):
+        failures = 0
+        while not instance.down:
+            result = await queue.get()
+            try:
+                await instance.connect()
+            except OSError as e:
+                # Instancia inaccesible: el trabajo vuelve a la cola sin gastar intento
+                failures += 1
+                result.error = f"{type(e).__name__}: {e}"
+                queue.put_nowait(result)
+                if failures >= self.max_connect_failures:
+                    self._mark_down(instance, queue, complete)
+                else:
+                    await asyncio.sleep(min(0.1 * 2**failures, 2.0))
+                continue
+
+            failures = 0
+            result.attempts += 1
+            result.endpoint = instance.endpoint
+            message = {"id": next(self._ids), **result.job}
+            try:
+                reply = await instance.request(message)
+            except asyncio.TimeoutError:
+                result.error = f"TimeoutError: sin respuesta de {instance}"
+                complete(result)
+                continue
+            except protocol.ProtocolError as e:
+                # Petición que no cabe en el commandPort: no se envió
+                result.error = f"ProtocolError: {e}"
+                complete(result)
+                continue
+            except (ConnectionError, OSError) as e:
+                result.error = f"{type(e).__name__}: {e}"
+                if result.attempts > self.retries:
+                    complete(result)
+                else:
+                    queue.put_nowait(result)
+                continue
+
+            result.ok = bool(reply.get("ok"))
+            result.result = reply.get("result")
+            result.output = reply.get("output", "")
+            result.error = reply.get("error", "")
+            result.traceback = reply.get("traceback", "")
+            complete(result)
+
+    def _mark_down(self, instance, queue, complete):
+        """Descarta una instancia; si no queda ninguna, los trabajos restantes fallan."""
+        instance.down = True
+        print(f"⚠️ {instance} no responde; se descarta del reparto.")
+        if all(i.down for i in self.instances):
+            while not queue.empty():
+                result = queue.get_nowait()
+                result.error = result.error or "Ninguna instancia de Maya disponible."
+                complete(result)
+
+
+def dispatch(jobs, endpoints, **kwargs):
+    """
+    Versión síncrona de Dispatcher.run.
+
+    Args:
+        jobs (list[dict]): Peticiones {"op": ..., ...argumentos}
+        endpoints (list[tuple]): [(host, puerto), ...]
+        **kwargs: Opciones de Dispatcher
+
+    Returns:
+        list[JobResult]: Resultados en el orden de jobs
+    """
+    return asyncio.run(Dispatcher(endpoints, **kwargs).run(jobs))
@@ -0,0 +1,228 @@
+"""
+Remote - Servidor local de pruebas
+=================================
+
+Servidor TCP que imita el commandPort de Maya para probar el cliente sin abrir
+Maya: lee líneas MEL generadas por Remote.protocol, ejecuta la petición con
+Remote.port_handler (o con un handler propio) y responde con el frame en base64
+terminado en el byte nulo, igual que Maya.
+
+Aplica el mismo límite que el bufferSize del commandPort: las líneas más largas
+no se ejecutan (Maya las cortaría) y las respuestas que no caben se sustituyen
+por un error, como hace Remote.port_handler.handle.
+
+AsyncLoopbackCommandPort es la versión asyncio, para probar Remote.dispatcher
+con varias "instancias" en el mismo proceso.
+
+Uso:
+    >>> from Remote import client, loopback
+    >>> with loopback.LoopbackCommandPort() as server:
+    ...     maya = client.MayaClient(*server.address)
+    ...     maya.eval_expr("2 * 21")
+    42
+"""
+
+import asyncio
+import socketserver
+import threading
+
+from Remote import port_handler, protocol
+
+
+def _parse_line(line, buffer_size):
+    """Petición de una línea, o None si Maya no la ejecutaría."""
+    if len(line.rstrip(b"\r\n")) > buffer_size:
+        return None
+    try:
+        return protocol.from_command_port_line(line)
+    except protocol.ProtocolError:
+        return None
+
+
+class _CommandPortHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.active.add(self.connection)
+        try:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                request = _parse_line(line, server.buffer_size)
+                if request is None:
+                    # Maya devuelve una respuesta vacía para MEL que no reconoce
+                    self.wfile.write(protocol.COMMAND_PORT_TERMINATOR)
+                    continue
+                server.requests.append(request)
+                reply = port_handler.encode_reply(
+                    server.message_handler(request), server.buffer_size
+                )
+                self.wfile.write(
+                    reply.encode("ascii") + b"\n" + protocol.COMMAND_PORT_TERMINATOR
+                )
+        except OSError:
+            pass
+        finally:
+            with server.lock:
+                server.active.discard(self.connection)
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class LoopbackCommandPort:
+    """
+    Sustituto local del commandPort de Maya.
+
+    Args:
+        host (str): Host de escucha (default: 127.0.0.1)
+        port (int): Puerto de escucha (default: 0 = libre)
+        handler (callable): Función petición -> respuesta
+            (default: port_handler.handle_message)
+        buffer_size (int): bufferSize simulado del commandPort
+            (default: protocol.COMMAND_PORT_BUFFER_SIZE)
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        handler=None,
+        buffer_size=protocol.COMMAND_PORT_BUFFER_SIZE,
+    ):
+        self._server = _ThreadingServer((host, port), _CommandPortHandler)
+        self._server.message_handler = handler or port_handler.handle_message
+        self._server.buffer_size = buffer_size
+        self._server.requests = []
+        self._server.active = set()
+        self._server.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def address(self):
+        """(host, puerto) en el que escucha el servidor."""
+        return self._server.server_address[:2]
+
+    @property
+    def requests(self):
+        """Peticiones recibidas, en orden de llegada."""
+        return self._server.requests
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def drop_connections(self):
+        """Cierra las conexiones abiertas (simula un reinicio de Maya)."""
+        with self._server.lock:
+            for conn in list(self._server.active):
+                try:
+                    conn.shutdown(2)
+                    conn.close()
+                except OSError:
+                    pass
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self.drop_connections()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class AsyncLoopbackCommandPort:
+    """
+    Sustituto asyncio del commandPort de Maya.
+
+    Args:
+        host (str): Host de escucha (default: 127.0.0.1)
+        port (int): Puerto de escucha (default: 0 = libre)
+        handler (callable): Función petición -> respuesta
+            (default: port_handler.handle_message)
+        delay (float): Segundos de espera simulada por petición
+        buffer_size (int): bufferSize simulado del commandPort
+            (default: protocol.COMMAND_PORT_BUFFER_SIZE)
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        handler=None,
+        delay=0.0,
+        buffer_size=protocol.COMMAND_PORT_BUFFER_SIZE,
+    ):
+        self.host = host
+        self.port = port
+        self.handler = handler or port_handler.handle_message
+        self.delay = delay
+        self.buffer_size = buffer_size
+        self.requests = []
+        self._server = None
+        self._writers = set()
+        self._tasks = set()
+
+    @property
+    def address(self):
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self._serve, self.host, self.port, limit=2 * protocol.MAX_FRAME_SIZE
+        )
+        return self
+
+    async def _serve(self, reader, writer):
+        self._writers.add(writer)
+        self._tasks.add(asyncio.current_task())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                request = _parse_line(line, self.buffer_size)
+                if request is None:
+                    writer.write(protocol.COMMAND_PORT_TERMINATOR)
+                    continue
+                self.requests.append(request)
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                reply = port_handler.encode_reply(
+                    self.handler(request), self.buffer_size
+                )
+                writer.write(
+                    reply.encode("ascii") + b"\n" + protocol.COMMAND_PORT_TERMINATOR
+                )
+                await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            self._tasks.discard(asyncio.current_task())
+            writer.close()
+
+    def drop_connections(self):
+        """Cierra las conexiones abiertas (simula una caída de Maya)."""
+        for writer in list(self._writers):
+            writer.close()
+
+    async def stop(self):
+        self._server.close()
+        self.drop_connections()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
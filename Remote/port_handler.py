@@ -0,0 +1,256 @@
+"""
+Remote - Handler del commandPort (lado Maya)
+===========================================
+
+Recibe las peticiones enmarcadas que envía Remote.client a través del commandPort
+de Maya, las ejecuta y devuelve la respuesta (resultado, salida impresa y error
+con traceback) como frame en base64.
+
+Activación en Maya (una sola vez por sesión, por ejemplo en userSetup.py):
+    >>> from Remote import port_handler
+    >>> port_handler.open_command_port(4434)
+
+    o, sin el paquete Remote en el sys.path de Maya:
+    >>> import maya.cmds as cmds
+    >>> cmds.commandPort(name=":4434", sourceType="mel", bufferSize=4194304)
+
+    El bufferSize por defecto de Maya (4096 bytes) corta las peticiones y
+    respuestas largas. Si Maya no puede importar Remote.port_handler, el
+    cliente envía su código en una línea autocontenida
+    (Remote.protocol.bootstrap_command) y repite la petición.
+
+Operaciones incluidas:
+    - ping: comprobación de conexión
+    - exec: ejecuta código Python en un namespace persistente
+    - eval: evalúa una expresión y devuelve su valor
+    - exec_file: ejecuta un archivo en el namespace __main__ de Maya
+      (comportamiento clásico de send2maya)
+    - reload: recarga los módulos cambiados y sus dependientes (Remote.reloader)
+    - rpc / list_rpc: llama a funciones registradas en Remote.rpc
+    - load_bundle: importa desde memoria un bundle de código (Remote.rpc)
+
+Se pueden añadir operaciones nuevas con @register_operation("nombre").
+"""
+
+import io
+import sys
+import threading
+import time
+import traceback
+
+from Remote import protocol
+
+
+OPERATIONS = {}
+
+# Namespace compartido por las peticiones "exec"/"eval" de la sesión
+_namespace = {"__name__": "__remote__"}
+
+
+def register_operation(name):
+    """
+    Decorador que registra una operación remota.
+
+    La función recibe el diccionario de la petición y devuelve el resultado
+    (serializable a JSON).
+
+    Ejemplo:
+        >>> @register_operation("scene_name")
+        ... def _scene_name(request):
+        ...     return cmds.file(q=True, sceneName=True)
+    """
+
+    def decorator(func):
+        OPERATIONS[name] = func
+        return func
+
+    return decorator
+
+
+class _Tee(io.TextIOBase):
+    """Copia lo impreso a la respuesta sin ocultarlo del Script Editor."""
+
+    def __init__(self, stream, on_write=None):
+        self.stream = stream
+        self.on_write = on_write
+        self.buffer_text = io.StringIO()
+        # Solo se captura lo que imprime el hilo que ejecuta la petición
+        self.thread_id = threading.get_ident()
+
+    def write(self, text):
+        if self.stream is not None:
+            self.stream.write(text)
+        if threading.get_ident() != self.thread_id:
+            return len(text)
+        self.buffer_text.write(text)
+        if self.on_write is not None and text:
+            self.on_write(text)
+        return len(text)
+
+    def flush(self):
+        if self.stream is not None:
+            self.stream.flush()
+
+
+@register_operation("ping")
+def _ping(request):
+    return {"pong": True, "time": time.time()}
+
+
+@register_operation("exec")
+def _exec(request):
+    exec(
+        compile(request["code"], request.get("filename", "<remote>"), "exec"),
+        _namespace,
+    )
+    return None
+
+
+@register_operation("eval")
+def _eval(request):
+    return eval(request["code"], _namespace)
+
+
+@register_operation("exec_file")
+def _exec_file(request):
+    path = request["path"]
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    # Igual que python("exec(open(...).read())"): lo definido queda en __main__
+    exec(compile(source, path, "exec"), sys.modules["__main__"].__dict__)
+    return path
+
+
+@register_operation("reload")
+def _reload(request):
+    from Remote import reloader
+
+    return reloader.reload_changed(
+        modules=request.get("modules"), dry_run=request.get("dry_run", False)
+    )
+
+
+@register_operation("rpc")
+def _rpc(request):
+    from Remote import rpc
+
+    return rpc.call(request["name"], request.get("args"), request.get("kwargs"))
+
+
+@register_operation("list_rpc")
+def _list_rpc(request):
+    from Remote import rpc
+
+    return rpc.get_entry_points()
+
+
+@register_operation("load_bundle")
+def _load_bundle(request):
+    from Remote import rpc
+
+    return rpc.install_bundle(rpc.decode_bundle(request["data"]))
+
+
+def handle_message(request, on_output=None):
+    """
+    Ejecuta una petición ya decodificada.
+
+    Args:
+        request (dict): Petición {"id", "op", ...}
+        on_output (callable): Recibe cada texto impreso mientras se ejecuta
+            (para retransmitir logs en vivo)
+
+    Returns:
+        dict: Respuesta {"id", "ok", "result", "output", "error", "traceback"}
+    """
+    reply = {"id": request.get("id"), "ok": True, "result": None, "output": ""}
+    operation = OPERATIONS.get(request.get("op"))
+    if operation is None:
+        reply.update(ok=False, error=f"Operación desconocida: {request.get('op')}")
+        return reply
+
+    tee = _Tee(sys.stdout, on_output)
+    previous = sys.stdout
+    sys.stdout = tee
+    try:
+        reply["result"] = operation(request)
+    except Exception as e:
+        reply.update(
+            ok=False,
+            error=f"{type(e).__name__}: {e}",
+            traceback=traceback.format_exc(),
+        )
+    finally:
+        sys.stdout = previous
+        reply["output"] = tee.buffer_text.getvalue()
+    return reply
+
+
+def encode_reply(reply, max_size=0):
+    """
+    Frame en base64 de una respuesta que cabe en el bufferSize del commandPort.
+
+    Si no cabe, devuelve en su lugar un error con el mismo id (Maya cortaría la
+    respuesta y el cliente no podría leerla).
+
+    Args:
+        reply (dict): Respuesta de handle_message
+        max_size (int): bufferSize del commandPort (0 = sin límite)
+
+    Returns:
+        str: Frame de la respuesta en base64
+    """
+    text = protocol.encode_b64_frame(reply)
+    if max_size and len(text) >= max_size:
+        text = protocol.encode_b64_frame(
+            {
+                "id": reply.get("id"),
+                "ok": False,
+                "result": None,
+                "output": "",
+                "error": f"La respuesta ocupa {len(text)} bytes y el commandPort "
+                f"acepta {max_size}; ábrelo con un bufferSize mayor "
+                "(open_command_port) o usa el transporte 'server'.",
+            }
+        )
+    return text
+
+
+def handle(payload, max_size=0):
+    """
+    Punto de entrada llamado desde la línea MEL del commandPort.
+
+    Args:
+        payload (str): Frame de la petición en base64
+        max_size (int): bufferSize del commandPort indicado por el cliente
+
+    Returns:
+        str: Frame de la respuesta en base64
+    """
+    try:
+        request = protocol.decode_b64_frame(payload)
+    except protocol.ProtocolError as e:
+        return protocol.encode_b64_frame({"id": None, "ok": False, "error": str(e)})
+    return encode_reply(handle_message(request), max_size)
+
+
+def open_command_port(port=4434, buffer_size=protocol.COMMAND_PORT_BUFFER_SIZE):
+    """
+    Abre en Maya el commandPort que usa Remote.client.
+
+    Args:
+        port (int): Puerto (default: 4434)
+        buffer_size (int): bufferSize del puerto (default:
+            protocol.COMMAND_PORT_BUFFER_SIZE, el que supone el cliente)
+
+    Returns:
+        str: Nombre del puerto (":4434")
+    """
+    import maya.cmds as cmds
+
+    name = f":{port}"
+    if cmds.commandPort(name, query=True):
+        cmds.commandPort(name=name, close=True)
+    cmds.commandPort(name=name, sourceType="mel", bufferSize=buffer_size)
+    print(f"🔌 commandPort {name} abierto (bufferSize {buffer_size})")
+    return name
@@ -0,0 +1,270 @@
+"""
+Remote - Protocolo de mensajes
+=============================
+
+Formato común de los mensajes entre la máquina de desarrollo y Maya.
+
+Cada mensaje es un diccionario JSON enmarcado con un prefijo de longitud:
+
+    [4 bytes big-endian: longitud][N bytes: JSON UTF-8]
+
+Sobre el commandPort de Maya (que solo acepta líneas MEL) el frame viaja
+codificado en base64 dentro de una única línea:
+
+    python("__import__('Remote.port_handler', fromlist=['handle']).handle('<b64>', <límite>)");
+
+y la respuesta es otro frame en base64 terminado en el byte nulo que añade Maya.
+
+Tamaño del commandPort:
+    Maya corta los comandos y los resultados que superan el bufferSize del
+    puerto (4096 bytes por defecto). Abre el puerto con COMMAND_PORT_BUFFER_SIZE
+    (Remote.port_handler.open_command_port); las peticiones que no caben se
+    rechazan antes de enviarlas y el handler sustituye las respuestas que no
+    caben por un error.
+
+Arranque sin el paquete Remote en Maya:
+    Si Maya no puede importar Remote.port_handler, bootstrap_command genera una
+    línea python("exec(...)") autocontenida que instala en memoria los módulos
+    del handler; el cliente la envía la primera vez que lo necesita.
+
+Petición:
+    {"id": int, "op": "exec" | "eval" | "exec_file" | ..., ...argumentos}
+
+Respuesta:
+    {"id": int, "ok": bool, "result": ..., "output": str,
+     "error": str, "traceback": str}
+"""
+
+import base64
+import json
+import struct
+import zlib
+from pathlib import Path
+
+
+HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 256 * 1024 * 1024
+COMMAND_PORT_TERMINATOR = b"\x00"
+# bufferSize con el que abrir el commandPort (el de Maya por defecto es 4096)
+COMMAND_PORT_BUFFER_SIZE = 4 * 1024 * 1024
+
+_HANDLER_CALL = (
+    "__import__('Remote.port_handler', fromlist=['handle'])"
+    ".handle('{payload}', {max_size})"
+)
+
+# Módulos que necesita el handler del commandPort (en orden de importación)
+HANDLER_MODULES = ("Remote", "Remote.protocol", "Remote.port_handler")
+# Handler, importador en memoria (Remote.rpc) y servidor: lo necesario para
+# recibir un bundle en una sesión sin el paquete Remote
+BUNDLE_MODULES = HANDLER_MODULES + ("Remote.rpc", "Remote.server")
+
+# Se ejecuta en Maya: instala los módulos solo si no se pueden importar
+_BOOTSTRAP = """
+import importlib.util, json, sys, types, zlib, base64
+
+def _install(sources):
+    for name, source in sources:
+        if name in sys.modules:
+            continue
+        module = types.ModuleType(name)
+        module.__file__ = "<bootstrap>/" + name.replace(".", "/") + ".py"
+        if "." not in name:
+            module.__path__ = []
+        sys.modules[name] = module
+        try:
+            exec(compile(source, module.__file__, "exec"), module.__dict__)
+        except BaseException:
+            del sys.modules[name]
+            raise
+        parent, _, child = name.rpartition(".")
+        if parent:
+            setattr(sys.modules[parent], child, module)
+
+try:
+    _missing = importlib.util.find_spec({last!r}) is None
+except ImportError:
+    _missing = True
+if _missing:
+    _install(json.loads(zlib.decompress(base64.b64decode({sources!r}))))
+"""
+
+
+class ProtocolError(Exception):
+    """Frame incompleto, corrupto o demasiado grande."""
+
+
+class RemoteError(Exception):
+    """Error producido en Maya al ejecutar una petición."""
+
+    def __init__(self, message, remote_traceback="", reply=None):
+        super().__init__(message)
+        self.remote_traceback = remote_traceback
+        self.reply = reply or {}
+
+    def __str__(self):
+        text = super().__str__()
+        if self.remote_traceback:
+            text += "\n--- Traceback remoto ---\n" + self.remote_traceback
+        return text
+
+
+def encode_frame(message):
+    """
+    Serializa un mensaje como frame con prefijo de longitud.
+
+    Args:
+        message (dict): Mensaje serializable a JSON
+
+    Returns:
+        bytes: Frame completo
+    """
+    body = json.dumps(message, default=repr, separators=(",", ":")).encode("utf-8")
+    if len(body) > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Mensaje demasiado grande ({len(body)} bytes).")
+    return HEADER.pack(len(body)) + body
+
+
+def decode_frame(frame):
+    """
+    Lee un frame completo y devuelve el mensaje.
+
+    Args:
+        frame (bytes): Frame con prefijo de longitud
+
+    Returns:
+        dict: Mensaje decodificado
+    """
+    if len(frame) < HEADER.size:
+        raise ProtocolError("Frame sin cabecera.")
+    (size,) = HEADER.unpack_from(frame)
+    body = frame[HEADER.size :]
+    if len(body) != size:
+        raise ProtocolError(
+            f"Frame truncado: se esperaban {size} bytes y llegaron {len(body)}."
+        )
+    try:
+        return json.loads(body.decode("utf-8"))
+    except ValueError as e:
+        raise ProtocolError(f"JSON inválido en el frame: {e}") from e
+
+
+def read_frame(sock):
+    """
+    Lee un frame de un socket bloqueante.
+
+    Args:
+        sock (socket.socket): Socket conectado
+
+    Returns:
+        dict: Mensaje decodificado
+    """
+    header = _recv_exact(sock, HEADER.size)
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Frame demasiado grande ({size} bytes).")
+    return decode_frame(header + _recv_exact(sock, size))
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            raise ConnectionError("Conexión cerrada por el servidor.")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def to_command_port(message, buffer_size=None):
+    """
+    Convierte un mensaje en la línea MEL que se envía al commandPort.
+
+    Args:
+        message (dict): Petición
+        buffer_size (int): bufferSize del commandPort; la línea debe caber y
+            el handler no devolverá respuestas más largas (default: sin límite)
+
+    Returns:
+        bytes: Línea MEL terminada en salto de línea
+    """
+    payload = encode_b64_frame(message)
+    call = _HANDLER_CALL.format(payload=payload, max_size=buffer_size or 0)
+    return _check_line(f'python("{call}");\n'.encode("ascii"), buffer_size)
+
+
+def bootstrap_command(modules=HANDLER_MODULES, buffer_size=None):
+    """
+    Línea MEL autocontenida que instala en Maya los módulos indicados.
+
+    Lee el código fuente de cada módulo en esta máquina y lo envía comprimido.
+    En Maya solo se instala si el último módulo no se puede importar.
+
+    Args:
+        modules (list[str]): Módulos en orden de importación (paquetes primero)
+        buffer_size (int): bufferSize del commandPort (default: sin límite)
+
+    Returns:
+        bytes: Línea MEL terminada en salto de línea
+    """
+    root = Path(__file__).resolve().parents[1]
+    sources = []
+    for name in modules:
+        path = root.joinpath(*name.split("."))
+        path = path / "__init__.py" if path.is_dir() else path.with_suffix(".py")
+        sources.append((name, path.read_text(encoding="utf-8")))
+    packed = base64.b64encode(
+        zlib.compress(json.dumps(sources).encode("utf-8"), 9)
+    ).decode("ascii")
+    code = _BOOTSTRAP.format(last=modules[-1], sources=packed)
+    encoded = base64.b64encode(code.encode("utf-8")).decode("ascii")
+    line = (
+        "python(\"exec(__import__('base64').b64decode('"
+        + encoded
+        + "').decode('utf-8'), {'__name__': '__remote_bootstrap__'})\");\n"
+    )
+    return _check_line(line.encode("ascii"), buffer_size)
+
+
+def _check_line(line, buffer_size):
+    if buffer_size and len(line) > buffer_size:
+        raise ProtocolError(
+            f"La petición ocupa {len(line)} bytes y el commandPort acepta "
+            f"{buffer_size}. Abre el puerto con un bufferSize mayor "
+            "(Remote.port_handler.open_command_port) o usa el transporte 'server'."
+        )
+    return line
+
+
+def from_command_port_line(line):
+    """
+    Extrae el frame de una línea MEL generada por to_command_port.
+
+    Args:
+        line (bytes | str): Línea recibida por el commandPort
+
+    Returns:
+        dict: Petición decodificada
+    """
+    if isinstance(line, bytes):
+        line = line.decode("ascii", errors="replace")
+    start = line.find(".handle('")
+    end = line.find("'", start + len(".handle('"))
+    if start < 0 or end < 0:
+        raise ProtocolError(f"Línea de commandPort no reconocida: {line[:80]!r}")
+    return decode_b64_frame(line[start + len(".handle('") : end])
+
+
+def encode_b64_frame(message):
+    """Frame en base64 (texto ASCII), tal como lo devuelve el handler de Maya."""
+    return base64.b64encode(encode_frame(message)).decode("ascii")
+
+
+def decode_b64_frame(text):
+    """Decodifica un frame en base64 (str o bytes) a mensaje."""
+    try:
+        frame = base64.b64decode(text.strip(), validate=True)
+    except (ValueError, TypeError) as e:
+        raise ProtocolError(f"Respuesta base64 inválida: {e}") from e
+    return decode_frame(frame)
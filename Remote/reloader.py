@@ -0,0 +1,290 @@
+"""
+Remote - Recarga en caliente por dependencias
+============================================
+
+Recarga dentro de Maya solo los módulos de las herramientas que han cambiado y
+los módulos que dependen de ellos, en orden topológico (primero las
+dependencias), en lugar de reejecutar archivos completos con exec().
+
+Proceso:
+    1. Localiza los módulos de los paquetes del repositorio
+    2. Calcula el hash del código fuente de cada uno y lo compara con el anterior
+    3. Construye el grafo de imports con ast (sin importar nada)
+    4. Añade los módulos que importan, directa o indirectamente, a los cambiados
+    5. Recarga con importlib.reload los que ya estaban importados, en orden
+    6. Descarta las ventanas cacheadas de los módulos recargados
+       (Tools.tool_registry.discard_windows); se reconstruyen al reabrirlas
+
+Los hashes de referencia se toman en la primera recarga; los módulos que ya
+estaban importados y cuyo .py cambió desde entonces se detectan con la cabecera
+de su .pyc. Cualquier módulo se puede forzar pasándolo explícitamente.
+
+Uso (desde la máquina de desarrollo):
+    >>> from Remote import client
+    >>> client.get_client().reload()
+    {'reloaded': ['Auto_Column.create_controls', 'Auto_Column.all_tools'], ...}
+"""
+
+import ast
+import hashlib
+import importlib
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+EXCLUDED_PACKAGES = ("Remote",)
+
+_hashes = {}
+
+
+def find_packages(root=ROOT):
+    """Paquetes del repositorio (carpetas con __init__.py), sin Remote."""
+    root = Path(root)
+    return sorted(
+        p.name
+        for p in root.iterdir()
+        if (p / "__init__.py").is_file() and p.name not in EXCLUDED_PACKAGES
+    )
+
+
+def module_name_from_path(path, root=ROOT):
+    """
+    Convierte la ruta de un archivo .py en su nombre de módulo.
+
+    Args:
+        path (str | Path): Archivo dentro del repositorio
+        root (str | Path): Raíz del repositorio
+
+    Returns:
+        str | None: Nombre del módulo ("Auto_Column.all_tools") o None si está fuera
+    """
+    try:
+        relative = Path(path).resolve().relative_to(Path(root).resolve())
+    except ValueError:
+        return None
+    if relative.suffix != ".py":
+        return None
+    parts = list(relative.with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts) or None
+
+
+def find_modules(root=ROOT, packages=None):
+    """
+    Localiza los módulos de los paquetes indicados.
+
+    Returns:
+        dict: {nombre_modulo: Path}
+    """
+    root = Path(root)
+    modules = {}
+    for package in packages or find_packages(root):
+        for path in sorted((root / package).rglob("*.py")):
+            name = module_name_from_path(path, root)
+            if name:
+                modules[name] = path
+    return modules
+
+
+def _source_hash(path):
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+
+
+def _imports_of(name, path, known):
+    """Módulos conocidos importados por un archivo (sin ejecutarlo)."""
+    try:
+        tree = ast.parse(Path(path).read_bytes(), filename=str(path))
+    except SyntaxError:
+        return set()
+
+    is_package = Path(path).name == "__init__.py"
+    package = name if is_package else name.rpartition(".")[0]
+
+    found = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            candidates = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parts = package.split(".") if package else []
+                parts = parts[: len(parts) - (node.level - 1)]
+                base = ".".join(parts + ([base] if base else []))
+            # "from paquete import modulo" importa también el submódulo
+            candidates = [base] + [f"{base}.{alias.name}" for alias in node.names]
+        else:
+            continue
+
+        for candidate in candidates:
+            # "import a.b.c" depende de a.b.c (y de sus paquetes padre)
+            while candidate:
+                if candidate in known and candidate != name:
+                    found.add(candidate)
+                    break
+                candidate = candidate.rpartition(".")[0]
+    return found
+
+
+def build_import_graph(modules):
+    """
+    Construye el grafo de imports entre los módulos conocidos.
+
+    Args:
+        modules (dict): {nombre_modulo: Path}
+
+    Returns:
+        dict: {modulo: set(modulos que importa)}
+    """
+    known = set(modules)
+    return {name: _imports_of(name, path, known) for name, path in modules.items()}
+
+
+def dependents_of(changed, graph):
+    """Módulos cambiados más todos los que los importan directa o indirectamente."""
+    reverse = {name: set() for name in graph}
+    for name, deps in graph.items():
+        for dep in deps:
+            reverse.setdefault(dep, set()).add(name)
+
+    affected = set()
+    pending = list(changed)
+    while pending:
+        name = pending.pop()
+        if name in affected:
+            continue
+        affected.add(name)
+        pending.extend(reverse.get(name, ()))
+    return affected
+
+
+def topological_order(names, graph):
+    """
+    Ordena módulos con sus dependencias primero (Kahn).
+
+    Los ciclos de imports se resuelven por orden alfabético.
+    """
+    names = set(names)
+    remaining = {n: set(graph.get(n, ())) & names for n in names}
+    order = []
+    while remaining:
+        ready = sorted(n for n, deps in remaining.items() if not deps)
+        if not ready:
+            ready = [min(remaining)]
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return order
+
+
+def _stale_since_import(name, path):
+    """
+    Indica si un módulo importado tiene el .py modificado desde su importación.
+
+    Compara la fecha y el tamaño guardados en la cabecera del .pyc con los del
+    archivo fuente actual (solo si el .pyc existe y está validado por fecha).
+    """
+    cached = getattr(sys.modules.get(name), "__cached__", None)
+    if not cached or not Path(cached).is_file():
+        return False
+    header = Path(cached).read_bytes()[:16]
+    if len(header) < 16 or int.from_bytes(header[4:8], "little") != 0:
+        return False
+    stat = Path(path).stat()
+    mtime = int.from_bytes(header[8:12], "little")
+    size = int.from_bytes(header[12:16], "little")
+    return (mtime, size) != (int(stat.st_mtime) & 0xFFFFFFFF, stat.st_size & 0xFFFFFFFF)
+
+
+def snapshot(root=ROOT, packages=None):
+    """
+    Guarda los hashes actuales como referencia (sin recargar nada).
+
+    Los módulos ya importados cuyo .py cambió desde la importación quedan
+    marcados como cambiados para la siguiente recarga.
+    """
+    for name, path in find_modules(root, packages).items():
+        stale = name in sys.modules and _stale_since_import(name, path)
+        _hashes[name] = None if stale else _source_hash(path)
+
+
+def reload_changed(modules=None, root=ROOT, packages=None, dry_run=False):
+    """
+    Recarga los módulos cambiados y sus dependientes en orden topológico.
+
+    Args:
+        modules (list[str]): Módulos o rutas a recargar aunque su hash no cambie
+        root (str | Path): Raíz del repositorio
+        packages (list[str]): Paquetes a vigilar (default: todos menos Remote)
+        dry_run (bool): Solo calcular qué se recargaría
+
+    Returns:
+        dict: {"changed", "reloaded", "skipped", "errors", "windows"}; windows
+            son las ventanas cacheadas descartadas por pertenecer a un módulo
+            recargado
+    """
+    if not _hashes:
+        snapshot(root, packages)
+
+    found = find_modules(root, packages)
+    current = {name: _source_hash(path) for name, path in found.items()}
+
+    changed = {
+        name
+        for name, digest in current.items()
+        if name in _hashes and _hashes[name] != digest
+    }
+    for item in modules or ():
+        name = item if item in found else module_name_from_path(item, root)
+        if name in found:
+            changed.add(name)
+
+    graph = build_import_graph(found)
+    order = topological_order(dependents_of(changed, graph), graph)
+
+    result = {
+        "changed": sorted(changed),
+        "reloaded": [],
+        "skipped": [],
+        "errors": {},
+        "windows": [],
+    }
+    if dry_run:
+        result["reloaded"] = [n for n in order if n in sys.modules]
+        return result
+
+    for name in order:
+        module = sys.modules.get(name)
+        if module is None:
+            # Aún no importado: la próxima importación ya leerá el código nuevo
+            result["skipped"].append(name)
+            _hashes[name] = current[name]
+            continue
+        try:
+            importlib.reload(module)
+        except Exception as e:
+            result["errors"][name] = f"{type(e).__name__}: {e}"
+            continue
+        result["reloaded"].append(name)
+        _hashes[name] = current[name]
+
+    # Referencia para los módulos vistos por primera vez
+    for name, digest in current.items():
+        _hashes.setdefault(name, digest)
+
+    registry = sys.modules.get("Tools.tool_registry")
+    if registry is not None and result["reloaded"]:
+        registry.clear_resolved()
+        # Las ventanas cacheadas de los módulos recargados llaman al código viejo
+        result["windows"] = registry.discard_windows(result["reloaded"])
+
+    for name in result["reloaded"]:
+        print(f"🔄 Recargado: {name}")
+    for name in result["windows"]:
+        print(f"🗑️ Ventana descartada: {name}")
+    for name, error in result["errors"].items():
+        print(f"❌ Error recargando {name}: {error}")
+    return result
@@ -0,0 +1,197 @@
+"""
+Remote - Llamadas RPC y paquetes de código en memoria
+====================================================
+
+Permite llamar desde fuera de Maya a funciones registradas de las herramientas
+con argumentos JSON, en lugar de enviar la ruta de un archivo para que Maya lo
+ejecute con exec().
+
+Puntos de entrada:
+    Igual que Tools.tool_registry, cada función se registra como texto
+    ("paquete.modulo:funcion") y el módulo solo se importa en la primera llamada.
+
+Paquetes de código (bundles):
+    Si la sesión de Maya no tiene acceso al checkout (otra máquina, granja...),
+    el cliente empaqueta los paquetes del repositorio en un zip comprimido con
+    zlib y lo envía en un solo mensaje. Maya lo importa desde memoria, sin
+    escribir nada en disco.
+
+    El bundle viaja siempre por Remote.server (no cabe en el commandPort).
+    Desde un cliente de commandPort, MayaClient.push_bundle envía primero una
+    línea autocontenida con este módulo, el handler y el servidor
+    (protocol.BUNDLE_MODULES), arranca el servidor y manda el bundle por él.
+
+Uso (desde la máquina de desarrollo):
+    >>> from Remote import client
+    >>> maya = client.get_client()
+    >>> maya.push_bundle()  # solo si Maya no ve el repositorio
+    >>> maya.rpc("create_ik_system", "Leg_practice_L", "001")
+"""
+
+import base64
+import importlib
+import importlib.abc
+import importlib.util
+import io
+import sys
+import zipfile
+import zlib
+from pathlib import Path
+
+
+_entry_points = {}
+_resolved = {}
+_bundle_finder = None
+
+
+def register_entry_point(name, entry_point):
+    """
+    Registra una función invocable por RPC.
+
+    Args:
+        name (str): Nombre público de la llamada
+        entry_point (str): "paquete.modulo:funcion"
+    """
+    if ":" not in entry_point:
+        raise ValueError(
+            f"Punto de entrada inválido '{entry_point}' (se espera 'modulo:funcion')."
+        )
+    _entry_points[name] = entry_point
+    _resolved.pop(name, None)
+
+
+def get_entry_points():
+    """Devuelve {nombre: "paquete.modulo:funcion"} de las llamadas registradas."""
+    return dict(_entry_points)
+
+
+def resolve(name):
+    """Importa (solo la primera vez) y devuelve la función de una llamada."""
+    if name not in _resolved:
+        if name not in _entry_points:
+            raise KeyError(f"Llamada RPC no registrada: {name}")
+        module_name, func_name = _entry_points[name].split(":", 1)
+        module = importlib.import_module(module_name)
+        _resolved[name] = getattr(module, func_name)
+    return _resolved[name]
+
+
+def call(name, args=(), kwargs=None):
+    """Ejecuta una llamada registrada con argumentos posicionales y por nombre."""
+    return resolve(name)(*(args or ()), **(kwargs or {}))
+
+
+# ---------------------------------------------------------------------------
+# Bundles de código
+# ---------------------------------------------------------------------------
+
+
+def build_bundle(root=None, packages=None):
+    """
+    Empaqueta los .py de los paquetes en un zip comprimido con zlib.
+
+    Args:
+        root (str | Path): Raíz del repositorio (default: la de Remote.reloader)
+        packages (list[str]): Paquetes a incluir (default: todos menos Remote)
+
+    Returns:
+        bytes: Bundle comprimido
+    """
+    from Remote import reloader
+
+    root = Path(root or reloader.ROOT)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for path in reloader.find_modules(root, packages).values():
+            archive.write(path, path.relative_to(root).as_posix())
+    # El zip va sin comprimir y se comprime entero: mejor ratio entre archivos
+    return zlib.compress(buffer.getvalue(), 9)
+
+
+class _BundleFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """Importa módulos desde el contenido de un bundle en memoria."""
+
+    def __init__(self, sources):
+        # {"Paquete.modulo": (codigo, es_paquete, ruta_virtual)}
+        self.sources = sources
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname not in self.sources:
+            return None
+        is_package = self.sources[fullname][1]
+        return importlib.util.spec_from_loader(fullname, self, is_package=is_package)
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        source, is_package, virtual_path = self.sources[module.__name__]
+        module.__file__ = virtual_path
+        if is_package:
+            module.__path__ = []
+        exec(compile(source, virtual_path, "exec"), module.__dict__)
+
+
+def install_bundle(data):
+    """
+    Instala un bundle para que sus módulos se importen desde memoria.
+
+    Los módulos del bundle ya importados se descartan de sys.modules para que la
+    siguiente importación use el código nuevo.
+
+    Args:
+        data (bytes): Bundle generado por build_bundle
+
+    Returns:
+        list[str]: Módulos disponibles en el bundle
+    """
+    global _bundle_finder
+
+    sources = {}
+    with zipfile.ZipFile(io.BytesIO(zlib.decompress(data))) as archive:
+        for info in archive.infolist():
+            parts = info.filename[: -len(".py")].split("/")
+            is_package = parts[-1] == "__init__"
+            if is_package:
+                parts.pop()
+            virtual_path = f"<bundle>/{info.filename}"
+            sources[".".join(parts)] = (archive.read(info), is_package, virtual_path)
+
+    if _bundle_finder in sys.meta_path:
+        sys.meta_path.remove(_bundle_finder)
+    _bundle_finder = _BundleFinder(sources)
+    sys.meta_path.insert(0, _bundle_finder)
+
+    for name in sources:
+        sys.modules.pop(name, None)
+    _resolved.clear()
+    registry = sys.modules.get("Tools.tool_registry")
+    if registry is not None:
+        registry.clear_resolved()
+    return sorted(sources)
+
+
+def encode_bundle(data):
+    """Bundle como texto para el mensaje JSON."""
+    return base64.b64encode(data).decode("ascii")
+
+
+def decode_bundle(text):
+    """Inverso de encode_bundle."""
+    return base64.b64decode(text)
+
+
+# Llamadas incluidas en el repositorio
+register_entry_point("bake_main_chains", "Auto_Chain_IKFK.main_bake:bake_main_chains")
+register_entry_point("build_limbs", "Auto_Chain_IKFK.batch_builder:build_limbs")
+register_entry_point(
+    "create_ik_space_switch", "Auto_Chain_IKFK.space_switch:create_ik_space_switch"
+)
+register_entry_point("create_ik_system", "Auto_Chain_IKFK.ik_system:create_ik_system")
+register_entry_point(
+    "create_spine_targets", "Auto_Column.tarjet_curve:create_spine_targets"
+)
+register_entry_point("hair_rigging_setup", "Auto_Tail.rig_setup:hair_rigging_setup")
+register_entry_point("match_fk_to_ik", "Auto_Chain_IKFK.fkik_match:match_fk_to_ik")
+register_entry_point("match_ik_to_fk", "Auto_Chain_IKFK.fkik_match:match_ik_to_fk")
+register_entry_point("mirror_ikfk_limb", "Auto_Chain_IKFK.mirror_rig:mirror_ikfk_limb")
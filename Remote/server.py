@@ -0,0 +1,210 @@
+"""
+Remote - Servidor de comandos multi-cliente (lado Maya)
+======================================================
+
+Servidor Python que se arranca dentro de Maya y sustituye al commandPort cuando
+varias herramientas o desarrolladores comparten la misma sesión.
+
+Funcionamiento:
+    1. Un hilo en segundo plano acepta conexiones; cada cliente tiene su hilo
+       de lectura y su hilo de escritura
+    2. Las peticiones (frames de Remote.protocol) entran en una cola con
+       prioridad: mayor "priority" primero, y en orden de llegada a igual prioridad
+    3. La cola se vacía en el hilo principal de Maya por lotes con
+       maya.utils.executeDeferred: hasta batch_size trabajos o batch_time
+       segundos por lote, para no congelar la interfaz
+    4. Lo que imprime cada trabajo se retransmite en vivo como frames "log" y al
+       terminar se envía el frame "result"
+
+Frames de respuesta:
+    {"type": "log", "id": int, "text": str}
+    {"type": "result", "id": int, "ok": bool, "result": ..., ...}
+
+Uso en Maya:
+    >>> from Remote import server
+    >>> server.start_server(port=4450)
+
+Uso desde fuera:
+    >>> from Remote import client
+    >>> maya = client.get_client(port=4450, transport="server")
+    >>> maya.rpc("create_ik_system", "Leg_practice_L", "001")
+"""
+
+import itertools
+import queue
+import socketserver
+import threading
+import time
+
+from Remote import port_handler, protocol
+
+
+SERVER_PORT = 4450
+
+_server = None
+
+
+class _ClientHandler(socketserver.BaseRequestHandler):
+    """Conexión de un cliente: lee peticiones y envía respuestas desde su cola."""
+
+    def setup(self):
+        self.closed = False
+        self.outbox = queue.Queue()
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    def _write_loop(self):
+        while True:
+            frame = self.outbox.get()
+            if frame is None:
+                return
+            try:
+                self.request.sendall(frame)
+            except OSError:
+                self.closed = True
+                return
+
+    def send(self, message):
+        if not self.closed:
+            self.outbox.put(protocol.encode_frame(message))
+
+    def handle(self):
+        owner = self.server.owner
+        while True:
+            try:
+                request = protocol.read_frame(self.request)
+            except (ConnectionError, OSError):
+                break
+            except protocol.ProtocolError as e:
+                self.send({"type": "result", "id": None, "ok": False, "error": str(e)})
+                break
+            owner.submit(self, request)
+
+    def finish(self):
+        self.closed = True
+        self.outbox.put(None)
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class CommandServer:
+    """
+    Servidor de comandos con cola de trabajos en el hilo principal.
+
+    Args:
+        host (str): Interfaz de escucha (default: 127.0.0.1)
+        port (int): Puerto (default: 4450)
+        batch_size (int): Trabajos máximos por lote en el hilo principal
+        batch_time (float): Segundos máximos por lote
+        schedule (callable): Función que ejecuta un callable en el hilo
+            principal (default: maya.utils.executeDeferred)
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=SERVER_PORT,
+        batch_size=16,
+        batch_time=0.05,
+        schedule=None,
+    ):
+        if schedule is None:
+            import maya.utils
+
+            schedule = maya.utils.executeDeferred
+
+        self.batch_size = batch_size
+        self.batch_time = batch_time
+        self._schedule = schedule
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._drain_scheduled = False
+        self._thread = None
+
+        self._tcp = _ThreadingServer((host, port), _ClientHandler)
+        self._tcp.owner = self
+
+    @property
+    def address(self):
+        return self._tcp.server_address[:2]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._tcp.serve_forever, daemon=True)
+        self._thread.start()
+        print(
+            f"🛰️ Servidor de comandos escuchando en {self.address[0]}:{self.address[1]}"
+        )
+        return self
+
+    def stop(self):
+        self._tcp.shutdown()
+        self._tcp.server_close()
+        print("🛑 Servidor de comandos detenido.")
+
+    def submit(self, client, request):
+        """Encola una petición (llamado desde el hilo del cliente)."""
+        priority = int(request.get("priority", 0))
+        self._queue.put((-priority, next(self._sequence), client, request))
+        self._schedule_drain()
+
+    def _schedule_drain(self):
+        with self._lock:
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        self._schedule(self._drain)
+
+    def _drain(self):
+        """Ejecuta un lote de trabajos (hilo principal de Maya)."""
+        with self._lock:
+            self._drain_scheduled = False
+
+        start = time.perf_counter()
+        for _ in range(self.batch_size):
+            try:
+                _, _, client, request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if client.closed:
+                continue
+
+            request_id = request.get("id")
+            reply = port_handler.handle_message(
+                request,
+                on_output=lambda text: client.send(
+                    {"type": "log", "id": request_id, "text": text}
+                ),
+            )
+            reply["type"] = "result"
+            client.send(reply)
+            if time.perf_counter() - start > self.batch_time:
+                break
+
+        # Quedan trabajos: siguiente lote en otro ciclo de eventos de Maya
+        if not self._queue.empty():
+            self._schedule_drain()
+
+
+def start_server(host="127.0.0.1", port=SERVER_PORT, **kwargs):
+    """
+    Arranca (una sola vez por sesión) el servidor de comandos.
+
+    Returns:
+        CommandServer: Servidor activo
+    """
+    global _server
+    if _server is None:
+        _server = CommandServer(host, port, **kwargs).start()
+    return _server
+
+
+def stop_server():
+    """Detiene el servidor de comandos si está activo."""
+    global _server
+    if _server is not None:
+        _server.stop()
+        _server = None
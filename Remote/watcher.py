@@ -0,0 +1,137 @@
+"""
+Remote - Vigilancia de cambios con debounce
+==========================================
+
+Vigila los archivos .py de los paquetes del repositorio y agrupa las ráfagas de
+cambios (format-on-save del editor, git checkout, búsqueda y reemplazo...) en un
+único lote, que se entrega cuando pasa un tiempo sin cambios nuevos.
+
+Se basa en sondear fecha y tamaño de los archivos, sin dependencias externas.
+
+Uso:
+    >>> from Remote import watcher
+    >>> for batch in watcher.PackageWatcher().batches():
+    ...     print(batch)
+    ['.../Auto_Column/all_tools.py', '.../Auto_Column/create_controls.py']
+"""
+
+import os
+import time
+from pathlib import Path
+
+from Remote import reloader
+
+
+IGNORED_DIRS = {"__pycache__", ".git", ".venv", "venv", "node_modules"}
+
+
+class PackageWatcher:
+    """
+    Vigila cambios en los paquetes y los entrega en lotes con debounce.
+
+    Args:
+        root (str | Path): Raíz del repositorio
+        packages (list[str]): Paquetes a vigilar (default: los de reloader)
+        interval (float): Segundos entre sondeos (default: 0.25)
+        debounce (float): Segundos sin cambios antes de entregar el lote
+            (default: 0.5)
+    """
+
+    def __init__(self, root=reloader.ROOT, packages=None, interval=0.25, debounce=0.5):
+        self.root = Path(root)
+        self.packages = packages or reloader.find_packages(self.root)
+        self.interval = interval
+        self.debounce = debounce
+        self._state = self.scan()
+
+    def scan(self):
+        """Devuelve {ruta: (mtime_ns, tamaño)} de los .py vigilados."""
+        state = {}
+        pending = [self.root / p for p in self.packages]
+        while pending:
+            try:
+                entries = list(os.scandir(pending.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                hidden = entry.name.startswith(".") or entry.name in IGNORED_DIRS
+                if entry.is_dir(follow_symlinks=False):
+                    if not hidden:
+                        pending.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    state[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def poll(self):
+        """
+        Compara con el último sondeo.
+
+        Returns:
+            set[str]: Rutas creadas, modificadas o eliminadas
+        """
+        current = self.scan()
+        previous, self._state = self._state, current
+        return {
+            path
+            for path in current.keys() | previous.keys()
+            if current.get(path) != previous.get(path)
+        }
+
+    def next_batch(self, stop=None):
+        """
+        Espera a la siguiente ráfaga de cambios y la devuelve completa.
+
+        Args:
+            stop (callable): Función sin argumentos; si devuelve True se deja de esperar
+
+        Returns:
+            list[str]: Rutas cambiadas (ordenadas), vacía si se detuvo
+        """
+        batch = set()
+        last_change = None
+        while not (stop and stop()):
+            changed = self.poll()
+            now = time.monotonic()
+            if changed:
+                batch |= changed
+                last_change = now
+            elif batch and now - last_change >= self.debounce:
+                return sorted(batch)
+            time.sleep(self.interval)
+        return sorted(batch)
+
+    def batches(self, stop=None):
+        """Generador de lotes de cambios hasta que stop() devuelva True."""
+        while not (stop and stop()):
+            batch = self.next_batch(stop)
+            if batch:
+                yield batch
+
+
+def watch_and_reload(maya_client, root=reloader.ROOT, stop=None, **kwargs):
+    """
+    Recarga en Maya los módulos afectados por cada lote de cambios.
+
+    Todos los lotes usan la misma conexión del cliente.
+
+    Args:
+        maya_client (Remote.client.MayaClient): Cliente conectado a Maya
+        root (str | Path): Raíz del repositorio local
+        stop (callable): Condición de parada (default: nunca, Ctrl+C)
+        **kwargs: Opciones de PackageWatcher
+
+    Yields:
+        tuple: (lote de rutas, resultado de la recarga o excepción)
+    """
+    watcher = PackageWatcher(root, **kwargs)
+    for batch in watcher.batches(stop):
+        modules = [reloader.module_name_from_path(path, root) for path in batch]
+        modules = [m for m in modules if m]
+        try:
+            yield batch, maya_client.reload(modules)
+        except Exception as e:
+            yield batch, e
@@ -0,0 +1,324 @@
+"""
+Tools - Caché de animación de esqueletos en memoria mapeada
+==========================================================
+
+Guarda la animación evaluada de un esqueleto (las cadenas MAIN o cualquier
+grupo de joints) en un archivo binario y la reproduce sin evaluar el rig:
+IK handles, orient constraints, reverse y blendMatrix dejan de calcularse
+mientras la caché está activa.
+
+Formato:
+    {ruta}.npy   Array float32 (frames, joints, 10) en memoria mapeada:
+                 translate (3), rotate como cuaternión x y z w (4), scale (3),
+                 en espacio local (rotate sin jointOrient, como los canales)
+    {ruta}.json  Joints, frames y layout
+
+Reproducción:
+    Un callback de cambio de tiempo toma la fila del frame (slice sin copia del
+    archivo mapeado) y la escribe en los joints con la API. Al activarla se
+    desconectan los drivers de translate/rotate/scale/offsetParentMatrix de esos
+    joints; al desactivarla se reconectan. Desconectar y reconectar no pasa por
+    la cola de undo: un Ctrl+Z no puede devolver los drivers mientras el
+    callback sigue escribiendo en los joints.
+
+    Antes de crear o abrir otra escena la caché se desactiva sola (callbacks
+    kBeforeNew/kBeforeOpen), para no dejar el callback de tiempo apuntando a
+    joints que ya no existen. Al guardar, los drivers se reconectan antes
+    (kBeforeSave) y se vuelven a desconectar después (kAfterSave), para que el
+    archivo guarde el rig completo.
+
+Uso:
+    >>> from Tools import anim_cache
+    >>> anim_cache.write_cache("C:/cache/shot010", joints, frames=(1, 500))
+    >>> anim_cache.attach_cache("C:/cache/shot010")
+    >>> anim_cache.detach_cache()
+"""
+
+import json
+from pathlib import Path
+
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import numpy as np
+
+from Tools import rig_math, scene_io
+
+
+LAYOUT = ("tx", "ty", "tz", "qx", "qy", "qz", "qw", "sx", "sy", "sz")
+
+# Atributos de los joints que la caché sustituye mientras está activa
+DRIVEN_ATTRIBUTES = {
+    f"{attr}{axis}"
+    for attr in ("translate", "rotate", "scale")
+    for axis in ("", "X", "Y", "Z")
+} | {"offsetParentMatrix"}
+
+_player = None
+
+
+def _paths(path):
+    path = Path(path)
+    base = path.with_suffix("") if path.suffix in (".npy", ".json") else path
+    return base.with_suffix(".npy"), base.with_suffix(".json")
+
+
+def write_cache(path, joints, frames=None, chunk_size=256):
+    """
+    Evalúa un esqueleto en un rango de frames y lo guarda en la caché.
+
+    El muestreo se hace por bloques de frames (scene_io.sample_matrices) que se
+    escriben directamente en el archivo mapeado, sin mover el tiempo.
+
+    Args:
+        path (str): Ruta base de la caché (se crean .npy y .json)
+        joints (list[str]): Joints o transforms a guardar
+        frames: None (rango de reproducción), tupla (inicio, fin) o lista de frames
+        chunk_size (int): Frames muestreados por bloque
+
+    Returns:
+        str: Ruta del archivo .npy o None
+
+    Ejemplo:
+        >>> write_cache("C:/cache/shot010", main_bake.list_main_joints(), (1, 500))
+        💾 Caché escrita: 500 frames x 42 joints → C:/cache/shot010.npy
+    """
+    joints = cmds.ls(joints, long=True) or []
+    if not joints:
+        cmds.warning("⚠️ No hay joints para la caché.")
+        return None
+    if frames is None:
+        frames = (
+            cmds.playbackOptions(query=True, minTime=True),
+            cmds.playbackOptions(query=True, maxTime=True),
+        )
+    frames = scene_io.get_frame_range(frames)
+    data_path, meta_path = _paths(path)
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # rotate = local @ inv(jointOrient); los transforms no tienen jointOrient
+    orient = np.array(
+        [
+            cmds.getAttr(f"{j}.jointOrient")[0]
+            if cmds.objectType(j) == "joint"
+            else (0.0, 0.0, 0.0)
+            for j in joints
+        ]
+    )
+    orient_inverse = np.swapaxes(rig_math.rotations_from_euler_xyz(orient), -1, -2)
+
+    data = np.lib.format.open_memmap(
+        data_path, mode="w+", dtype=np.float32, shape=(len(frames), len(joints), 10)
+    )
+    for start in range(0, len(frames), chunk_size):
+        block = frames[start : start + chunk_size]
+        world = scene_io.sample_matrices(joints, block)
+        parent = scene_io.sample_matrices(joints, block, "parentMatrix")
+        local = (world @ np.linalg.inv(parent)).reshape(-1, 4, 4)
+
+        translate, rotation, scale = rig_math.decompose_matrices(local)
+        rotation = rotation.reshape(len(block), len(joints), 3, 3) @ orient_inverse
+        quaternion = rig_math.quaternions_from_matrices(rotation.reshape(-1, 3, 3))
+        data[start : start + len(block)] = np.concatenate(
+            [translate, quaternion, scale], axis=1
+        ).reshape(len(block), len(joints), 10)
+    data.flush()
+    del data
+
+    meta = {
+        "joints": joints,
+        "frames": frames.tolist(),
+        "layout": list(LAYOUT),
+        "dtype": "float32",
+    }
+    meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    print(
+        f"💾 Caché escrita: {len(frames)} frames x {len(joints)} joints → {data_path}"
+    )
+    return str(data_path)
+
+
+def read_cache(path):
+    """
+    Abre una caché en modo solo lectura, sin cargarla en memoria.
+
+    Args:
+        path (str): Ruta base de la caché (o su .npy / .json)
+
+    Returns:
+        tuple: (data np.memmap (F, J, 10), meta dict)
+    """
+    data_path, meta_path = _paths(path)
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    return np.load(data_path, mmap_mode="r"), meta
+
+
+class CachePlayer:
+    """
+    Mueve un esqueleto desde una caché en cada cambio de tiempo.
+
+    Args:
+        path (str): Ruta base de la caché
+        joints (list[str]): Subconjunto de joints a mover (default: todos los
+            de la caché que existan en la escena)
+    """
+
+    def __init__(self, path, joints=None):
+        self.data, self.meta = read_cache(path)
+        self.frames = np.asarray(self.meta["frames"], dtype=float)
+
+        names = self.meta["joints"] if joints is None else cmds.ls(joints, long=True)
+        index = {name: i for i, name in enumerate(self.meta["joints"])}
+        self.joints = [n for n in names if n in index and cmds.objExists(n)]
+        self.columns = np.array([index[n] for n in self.joints], dtype=int)
+
+        sel = om.MSelectionList()
+        for joint in self.joints:
+            sel.add(joint)
+        self._transforms = [
+            om.MFnTransform(sel.getDagPath(i)) for i in range(len(self.joints))
+        ]
+        self._connections = []
+        self._inherits = {}
+        self._callback = None
+        self._scene_callbacks = []
+
+    def frame_index(self, frame):
+        """Índice de la muestra más cercana a un frame (limitado al rango)."""
+        i = int(np.searchsorted(self.frames, frame))
+        if i >= len(self.frames):
+            return len(self.frames) - 1
+        if i and frame - self.frames[i - 1] < self.frames[i] - frame:
+            return i - 1
+        return i
+
+    def apply(self, frame):
+        """Escribe en los joints los valores de la caché en un frame."""
+        values = self.data[self.frame_index(frame)]  # vista, sin copia
+        for fn, column in zip(self._transforms, self.columns):
+            tx, ty, tz, qx, qy, qz, qw, sx, sy, sz = values[column].tolist()
+            fn.setTranslation(om.MVector(tx, ty, tz), om.MSpace.kTransform)
+            fn.setRotation(om.MQuaternion(qx, qy, qz, qw), om.MSpace.kTransform)
+            fn.setScale((sx, sy, sz))
+
+    def _on_time_changed(self, time, *args):
+        self.apply(time.asUnits(om.MTime.uiUnit()))
+
+    def attach(self):
+        """Desconecta los drivers de los joints y activa los callbacks."""
+        self._disconnect()
+        self._callback = om.MDGMessage.addTimeChangeCallback(self._on_time_changed)
+        self._scene_callbacks = [
+            om.MSceneMessage.addCallback(message, _on_scene_change)
+            for message in (om.MSceneMessage.kBeforeNew, om.MSceneMessage.kBeforeOpen)
+        ] + [
+            om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeSave, self._on_save),
+            om.MSceneMessage.addCallback(
+                om.MSceneMessage.kAfterSave, self._on_after_save
+            ),
+        ]
+        self.apply(cmds.currentTime(query=True))
+
+    def detach(self):
+        """Quita los callbacks y reconecta los drivers originales."""
+        if self._callback is not None:
+            om.MMessage.removeCallback(self._callback)
+            self._callback = None
+        for callback in self._scene_callbacks:
+            om.MMessage.removeCallback(callback)
+        self._scene_callbacks = []
+        self._reconnect()
+
+    def _on_save(self, *args):
+        """El archivo se guarda con los drivers del rig conectados."""
+        self._reconnect()
+
+    def _on_after_save(self, *args):
+        self._disconnect()
+        self.apply(cmds.currentTime(query=True))
+
+    def _disconnect(self):
+        q = scene_io.mel_string
+        pairs = (
+            cmds.listConnections(
+                self.joints,
+                source=True,
+                destination=False,
+                connections=True,
+                plugs=True,
+            )
+            or []
+        )
+        self._connections = [
+            (source, destination)
+            for destination, source in zip(pairs[::2], pairs[1::2])
+            if destination.rsplit(".", 1)[-1] in DRIVEN_ATTRIBUTES
+        ]
+        lines = [f"disconnectAttr {q(s)} {q(d)};" for s, d in self._connections]
+        for _, destination in self._connections:
+            if destination.endswith(".offsetParentMatrix"):
+                # Modo matriz: el joint vuelve a heredar de su padre
+                node = destination.rsplit(".", 1)[0]
+                self._inherits[node] = cmds.getAttr(f"{node}.inheritsTransform")
+                lines.append(scene_io.mel_set_matrix(destination, np.identity(4)))
+                lines.append(f"setAttr {q(node + '.inheritsTransform')} 1;")
+        _run_without_undo(lines)
+
+    def _reconnect(self):
+        q = scene_io.mel_string
+        lines = [
+            f"setAttr {q(node + '.inheritsTransform')} {int(value)};"
+            for node, value in self._inherits.items()
+        ]
+        lines += [f"connectAttr -f {q(s)} {q(d)};" for s, d in self._connections]
+        _run_without_undo(lines)
+        self._connections = []
+        self._inherits = {}
+
+
+def _run_without_undo(lines):
+    """Ejecuta líneas MEL fuera de la cola de undo, sin vaciarla."""
+    recording = cmds.undoInfo(query=True, state=True)
+    if recording:
+        cmds.undoInfo(stateWithoutFlush=False)
+    try:
+        scene_io.run_mel_batch(lines)
+    finally:
+        if recording:
+            cmds.undoInfo(stateWithoutFlush=True)
+
+
+def attach_cache(path, joints=None):
+    """
+    Activa (una sola a la vez) la reproducción de una caché.
+
+    Args:
+        path (str): Ruta base de la caché
+        joints (list[str]): Subconjunto de joints a mover (default: todos)
+
+    Returns:
+        CachePlayer: Reproductor activo
+
+    Ejemplo:
+        >>> attach_cache("C:/cache/shot010")
+        ▶️ Caché activa: 42 joints, 500 frames
+    """
+    global _player
+    detach_cache()
+    _player = CachePlayer(path, joints)
+    _player.attach()
+    print(f"▶️ Caché activa: {len(_player.joints)} joints, {len(_player.frames)} frames")
+    return _player
+
+
+def _on_scene_change(*args):
+    """Nueva escena o escena abierta: la caché activa deja de tener sentido."""
+    detach_cache()
+
+
+def detach_cache():
+    """Desactiva la caché activa y devuelve los joints al rig."""
+    global _player
+    if _player is not None:
+        _player.detach()
+        _player = None
+        print("⏹️ Caché desactivada: joints devueltos al rig.")
@@ -1,5 +1,7 @@
 import maya.cmds as cmds
 
+from Tools.joint_orient import orient_joint_chains
+
 
 def get_joint_chain_from_selection():
     """Devuelve la cadena completa de joints desde el primer seleccionado (root→end)."""
@@ -131,21 +133,8 @@ def create_clean_chain_from_selection():
             created_joints.append(j)
 
     try:
-        cmds.joint(
-            created_joints[0],
-            e=True,
-            orientJoint="xyz",
-            secondaryAxisOrient="zup",
-            children=True,
-            zeroScaleOrient=True,
-        )
-        last = created_joints[-1]
-        for axis in ["jointOrientX", "jointOrientY", "jointOrientZ"]:
-            if cmds.objExists(f"{last}.{axis}"):
-                try:
-                    cmds.setAttr(f"{last}.{axis}", 0)
-                except Exception:
-                    pass
+        # X primary, Y secondary, Z+ world; el último joint queda sin jointOrient
+        orient_joint_chains([created_joints[0]])
     except Exception as e:
         cmds.warning(f"⚠️ No se pudo orientar automáticamente la nueva cadena: {e}")
 
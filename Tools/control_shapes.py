@@ -0,0 +1,286 @@
+"""
+Tools - Librería de shapes de control
+====================================
+
+Librería de shapes de control definida con arrays de CVs precalculados. Las shapes
+se crean directamente bajo el transform destino, con la transformación ya aplicada
+a los CVs, en lugar de crear un círculo, moverlo, congelarlo, borrar historial,
+reparentar la shape y borrar el transform temporal.
+
+Shapes disponibles:
+    - circle: círculo cúbico periódico (mismos CVs que cmds.circle)
+    - square: cuadrado lineal cerrado
+    - sphere: tres círculos ortogonales
+    - arrow: flecha plana
+
+Todas las shapes están definidas con radio 1 y normal +Y.
+
+Modo instancia:
+    Con instance=True, todos los controles con la misma shape, radio y normal
+    comparten un único nodo nurbsCurve (instanciado bajo cada control), lo que
+    reduce el tiempo de construcción y la memoria de la escena.
+
+Uso:
+    >>> from Tools import control_shapes
+    >>> control_shapes.create_control_shape("upperLeg_root_001", "circle", radius=2)
+"""
+
+import maya.cmds as cmds
+import numpy as np
+
+from Tools import rig_math, scene_io
+
+
+INSTANCE_LIBRARY_GROUP = "controlShapes_instances_grp"
+
+_CIRCLE_A = 0.783611624891
+_CIRCLE_B = 1.10819418755
+_CIRCLE_CVS = np.array(
+    [
+        [_CIRCLE_A, 0.0, -_CIRCLE_A],
+        [0.0, 0.0, -_CIRCLE_B],
+        [-_CIRCLE_A, 0.0, -_CIRCLE_A],
+        [-_CIRCLE_B, 0.0, 0.0],
+        [-_CIRCLE_A, 0.0, _CIRCLE_A],
+        [0.0, 0.0, _CIRCLE_B],
+        [_CIRCLE_A, 0.0, _CIRCLE_A],
+        [_CIRCLE_B, 0.0, 0.0],
+    ]
+)
+
+
+def _periodic_curve(cvs, degree=3):
+    """Cierra una lista de CVs como curva periódica (repite los primeros 'degree')."""
+    points = np.vstack([cvs, cvs[:degree]])
+    knots = list(range(-degree + 1, len(points)))
+    return {"degree": degree, "form": 2, "knots": knots, "points": points}
+
+
+def _linear_curve(points, closed=False):
+    """Curva lineal; si es cerrada el último punto repite el primero."""
+    points = np.asarray(points, dtype=float)
+    if closed:
+        points = np.vstack([points, points[:1]])
+    return {
+        "degree": 1,
+        "form": 1 if closed else 0,
+        "knots": list(range(len(points))),
+        "points": points,
+    }
+
+
+SHAPES = {
+    "circle": [_periodic_curve(_CIRCLE_CVS)],
+    "square": [
+        _linear_curve(
+            [[1.0, 0.0, 1.0], [1.0, 0.0, -1.0], [-1.0, 0.0, -1.0], [-1.0, 0.0, 1.0]],
+            closed=True,
+        )
+    ],
+    "sphere": [
+        _periodic_curve(_CIRCLE_CVS),
+        _periodic_curve(_CIRCLE_CVS[:, [1, 0, 2]]),
+        _periodic_curve(_CIRCLE_CVS[:, [0, 2, 1]]),
+    ],
+    "arrow": [
+        _linear_curve(
+            [
+                [0.0, 0.0, -1.0],
+                [0.6, 0.0, -0.2],
+                [0.25, 0.0, -0.2],
+                [0.25, 0.0, 1.0],
+                [-0.25, 0.0, 1.0],
+                [-0.25, 0.0, -0.2],
+                [-0.6, 0.0, -0.2],
+            ],
+            closed=True,
+        )
+    ],
+}
+
+
+def _normal_rotation(normal):
+    """Rotación 3x3 que lleva el eje +Y de la librería a la normal pedida."""
+    y_axis = np.asarray(normal, dtype=float)
+    y_axis = y_axis / np.linalg.norm(y_axis)
+    reference = np.array([1.0, 0.0, 0.0])
+    if abs(np.dot(reference, y_axis)) > 0.99:
+        reference = np.array([0.0, 0.0, -1.0])
+    z_axis = np.cross(reference, y_axis)
+    z_axis /= np.linalg.norm(z_axis)
+    x_axis = np.cross(y_axis, z_axis)
+    return np.array([x_axis, y_axis, z_axis])
+
+
+def get_shape_curves(shape="circle", radius=1.0, normal=(0, 1, 0)):
+    """
+    Devuelve las curvas de una shape escaladas y orientadas.
+
+    Args:
+        shape (str): Nombre de la shape en SHAPES
+        radius (float): Radio / tamaño del control
+        normal (tuple): Normal de la shape (default: +Y)
+
+    Returns:
+        list[dict]: Curvas {"degree", "form", "knots", "points"}
+    """
+    if shape not in SHAPES:
+        raise KeyError(f"Shape desconocida '{shape}'. Disponibles: {sorted(SHAPES)}")
+
+    rotation = _normal_rotation(normal)
+    curves = []
+    for curve in SHAPES[shape]:
+        curve = dict(curve)
+        curve["points"] = (curve["points"] * radius) @ rotation
+        curves.append(curve)
+    return curves
+
+
+def _shape_names(base_name, count):
+    if count == 1:
+        return [base_name]
+    return [f"{base_name}{i + 1}" for i in range(count)]
+
+
+def create_control_shapes(
+    targets,
+    shape="circle",
+    radius=1.0,
+    normal=(0, 1, 0),
+    world_matrices=None,
+    names=None,
+    instance=False,
+):
+    """
+    Crea shapes de control bajo muchos transforms con una sola evaluación MEL.
+
+    Args:
+        targets (list[str]): Transforms que recibirán la shape
+        shape (str): Nombre de la shape en SHAPES (default: "circle")
+        radius (float): Radio / tamaño del control (default: 1.0)
+        normal (tuple): Normal de la shape (default: +Y)
+        world_matrices (np.ndarray): Matrices world (N, 4, 4) donde debe quedar
+            cada shape; los CVs se convierten al espacio local de su target.
+            None = la shape queda en el origen local del target.
+        names (list[str]): Nombres de las shapes (default: {target}Shape)
+        instance (bool): Compartir un único nodo de shape entre todos los
+            targets (no compatible con world_matrices)
+
+    Returns:
+        list[str]: Shapes creadas (o instanciadas)
+    """
+    if not targets:
+        return []
+
+    curves = get_shape_curves(shape, radius, normal)
+    names = names or [f"{t.split('|')[-1]}Shape" for t in targets]
+
+    if instance:
+        if world_matrices is not None:
+            cmds.warning("⚠️ El modo instancia ignora world_matrices.")
+        return _instance_control_shapes(targets, shape, radius, normal, curves)
+
+    inv_targets = None
+    if world_matrices is not None:
+        inv_targets = np.linalg.inv(scene_io.get_world_matrices(targets))
+
+    lines, created = [], []
+    for i, (target, name) in enumerate(zip(targets, names)):
+        for curve, shape_name in zip(curves, _shape_names(name, len(curves))):
+            points = curve["points"]
+            if world_matrices is not None:
+                points = rig_math.transform_points(
+                    rig_math.transform_points(points, world_matrices[i]),
+                    inv_targets[i],
+                )
+            lines += scene_io.mel_create_curve_shape(
+                target,
+                shape_name,
+                curve["degree"],
+                curve["form"],
+                curve["knots"],
+                points,
+            )
+            created.append(f"{target}|{shape_name}")
+
+    scene_io.run_mel_batch(lines)
+    return created
+
+
+def _instance_control_shapes(targets, shape, radius, normal, curves):
+    """Crea (o reutiliza) la shape maestra y la instancia bajo cada target."""
+    key = f"{shape}_{radius:g}_" + "_".join(f"{v:g}" for v in normal)
+    key = key.replace(".", "p").replace("-", "n")
+    master = f"{INSTANCE_LIBRARY_GROUP}|ctrlShape_{key}"
+
+    lines = []
+    if not cmds.objExists(INSTANCE_LIBRARY_GROUP):
+        lines += [
+            f"createNode transform -n {scene_io.mel_string(INSTANCE_LIBRARY_GROUP)};",
+            f"setAttr {scene_io.mel_string(INSTANCE_LIBRARY_GROUP + '.visibility')} 0;",
+        ]
+    master_shapes = [
+        f"{master}|{n}" for n in _shape_names(f"ctrlShape_{key}Shape", len(curves))
+    ]
+    if not cmds.objExists(master):
+        lines.append(
+            f"createNode transform -n {scene_io.mel_string(master.split('|')[-1])} "
+            f"-p {scene_io.mel_string(INSTANCE_LIBRARY_GROUP)};"
+        )
+        for curve, shape_path in zip(curves, master_shapes):
+            lines += scene_io.mel_create_curve_shape(
+                master,
+                shape_path.split("|")[-1],
+                curve["degree"],
+                curve["form"],
+                curve["knots"],
+                curve["points"],
+            )
+
+    for target in targets:
+        for shape_path in master_shapes:
+            lines.append(
+                f"parent -add -shape {scene_io.mel_string(shape_path)} "
+                f"{scene_io.mel_string(target)};"
+            )
+
+    scene_io.run_mel_batch(lines)
+    return master_shapes
+
+
+def create_control_shape(
+    target,
+    shape="circle",
+    radius=1.0,
+    normal=(0, 1, 0),
+    world_matrix=None,
+    name=None,
+    instance=False,
+):
+    """
+    Crea la shape de un único control directamente bajo su transform.
+
+    Args:
+        target (str): Transform que recibirá la shape
+        shape (str): Nombre de la shape en SHAPES (default: "circle")
+        radius (float): Radio / tamaño del control (default: 1.0)
+        normal (tuple): Normal de la shape (default: +Y)
+        world_matrix (np.ndarray): Matriz world (4, 4) donde debe quedar la shape
+        name (str): Nombre de la shape (default: {target}Shape)
+        instance (bool): Usar la shape compartida de la librería
+
+    Returns:
+        list[str]: Shapes creadas
+
+    Ejemplo:
+        >>> create_control_shape("middleLeg_IKpoleVector_001", normal=(1, 0, 0))
+    """
+    return create_control_shapes(
+        [target],
+        shape=shape,
+        radius=radius,
+        normal=normal,
+        world_matrices=None if world_matrix is None else np.asarray(world_matrix)[None],
+        names=[name] if name else None,
+        instance=instance,
+    )
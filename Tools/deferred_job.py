@@ -0,0 +1,298 @@
+"""
+Tools - Trabajos diferidos por bloques
+=====================================
+
+Este módulo ejecuta builders largos como trabajos por bloques a través de la cola
+de ejecución diferida de Maya, de forma que la interfaz sigue respondiendo mientras
+se construye el rig.
+
+Funcionamiento:
+    1. Cada trabajo recibe una lista de pasos (label, callable)
+    2. Cada paso se ejecuta en un evalDeferred de baja prioridad
+       - Si el callable es (o devuelve) un generador, cada yield es un bloque
+         independiente; si el yield devuelve un float (0-1) se usa como avance
+         dentro del paso para la barra y el tiempo restante
+    3. Cada bloque se envuelve en su propio undo chunk
+    4. Una ventana muestra el progreso, el tiempo restante y un botón Cancelar
+    5. Cancelar (o un error) deshace los bloques ejecutados en orden inverso
+
+Builders por bloques:
+    Los builders largos se escriben como generadores iter_* que hacen yield
+    cada CHUNK_SIZE elementos (o entre fases) con la fracción completada. La
+    función pública de siempre los ejecuta de una vez con run_to_end, así que
+    las llamadas directas (scripts, RPC) no cambian.
+
+Uso:
+    >>> from Tools import deferred_job
+    >>> deferred_job.run_job("Spine Rig", [("Controles", create_spine_controls)])
+"""
+
+import inspect
+import time
+import traceback
+
+import maya.cmds as cmds
+
+
+PROGRESS_WINDOW = "rigJobProgressWin"
+
+# Elementos (joints, locators, constraints...) por bloque en los builders iter_*
+CHUNK_SIZE = 20
+
+# Resolución de la barra de progreso por paso
+_STEP_TICKS = 100
+
+_active_job = None
+
+
+class RigJob:
+    """
+    Trabajo de construcción ejecutado por bloques en la cola diferida de Maya.
+
+    Args:
+        title (str): Título mostrado en la ventana de progreso
+        steps (list[tuple]): Pasos [(label, callable), ...]
+        on_finish (callable): Callback opcional con el estado final
+            ("done", "cancelled" o "failed")
+    """
+
+    def __init__(self, title, steps, on_finish=None):
+        self.title = title
+        self.steps = list(steps)
+        self.on_finish = on_finish
+        self.state = "pending"
+        self.results = []
+
+        self._index = 0
+        self._generator = None
+        self._step_fraction = 0.0
+        self._chunks_done = 0
+        self._undo_names = []
+        self._start_time = None
+        self._cancel_requested = False
+        self._progress_bar = None
+        self._status_text = None
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+    def start(self):
+        """Abre la ventana de progreso y encola el primer bloque."""
+        global _active_job
+        if _active_job is not None and _active_job.state == "running":
+            cmds.warning(f"⚠️ Ya hay un trabajo en curso: {_active_job.title}")
+            return None
+
+        if not self.steps:
+            cmds.warning(f"⚠️ El trabajo '{self.title}' no tiene pasos.")
+            return None
+
+        _active_job = self
+        self.state = "running"
+        self._start_time = time.perf_counter()
+        self._build_window()
+        print(f"\n⏳ Trabajo iniciado: {self.title} ({len(self.steps)} pasos)")
+        self._schedule()
+        return self
+
+    def cancel(self, *args):
+        """Marca el trabajo para cancelarse antes del siguiente bloque."""
+        if self.state == "running":
+            self._cancel_requested = True
+            self._update_window(label="Cancelando...")
+
+    def _schedule(self):
+        # lowestPriority deja pasar primero los eventos de la interfaz
+        cmds.evalDeferred(self._run_next_chunk, lowestPriority=True)
+
+    # ------------------------------------------------------------------
+    # Ejecución
+    # ------------------------------------------------------------------
+    def _run_next_chunk(self):
+        if self.state != "running":
+            return
+
+        if self._cancel_requested:
+            self._rollback()
+            self._finish("cancelled")
+            return
+
+        if self._index >= len(self.steps):
+            self._finish("done")
+            return
+
+        label, func = self.steps[self._index]
+        undo_name = f"{self.title}: {label} #{self._chunks_done + 1}"
+
+        cmds.undoInfo(openChunk=True, chunkName=undo_name)
+        try:
+            step_finished = self._execute(func)
+        except Exception:
+            cmds.undoInfo(closeChunk=True)
+            self._undo_names.append(undo_name)
+            cmds.warning(f"⚠️ Error en el paso '{label}':\n{traceback.format_exc()}")
+            self._rollback()
+            self._finish("failed")
+            return
+        cmds.undoInfo(closeChunk=True)
+        self._undo_names.append(undo_name)
+        self._chunks_done += 1
+
+        if step_finished:
+            self._index += 1
+            self._step_fraction = 0.0
+            print(f"✅ [{self._index}/{len(self.steps)}] {label}")
+
+        self._update_window(label=label)
+        self._schedule()
+
+    def _execute(self, func):
+        """
+        Ejecuta un bloque del paso actual.
+
+        Returns:
+            bool: True si el paso terminó, False si es un generador con bloques pendientes
+        """
+        if self._generator is None:
+            result = func()
+            if not inspect.isgenerator(result):
+                self.results.append(result)
+                return True
+            self._generator = result
+
+        try:
+            progress = next(self._generator)
+        except StopIteration as stop:
+            self.results.append(stop.value)
+            self._generator = None
+            return True
+        if isinstance(progress, (int, float)) and not isinstance(progress, bool):
+            self._step_fraction = min(max(float(progress), 0.0), 1.0)
+        return False
+
+    def _rollback(self):
+        """Deshace los bloques ejecutados, deteniéndose si el usuario hizo cambios propios."""
+        if self._generator is not None:
+            self._generator.close()
+            self._generator = None
+
+        if not cmds.undoInfo(query=True, state=True):
+            cmds.warning("⚠️ Undo desactivado: no se puede revertir el trabajo.")
+            return
+
+        reverted = 0
+        for undo_name in reversed(self._undo_names):
+            if cmds.undoInfo(query=True, undoName=True) != undo_name:
+                cmds.warning(
+                    f"⚠️ Rollback detenido en '{undo_name}': hay acciones del usuario encima."
+                )
+                break
+            cmds.undo()
+            reverted += 1
+        self._undo_names = self._undo_names[: len(self._undo_names) - reverted]
+        print(f"↩️ {reverted} bloques revertidos de '{self.title}'.")
+
+    def _finish(self, state):
+        global _active_job
+        self.state = state
+        elapsed = time.perf_counter() - self._start_time
+        if cmds.window(PROGRESS_WINDOW, exists=True):
+            cmds.deleteUI(PROGRESS_WINDOW)
+        if _active_job is self:
+            _active_job = None
+
+        icons = {"done": "🎉", "cancelled": "🛑", "failed": "❌"}
+        print(
+            f"{icons.get(state, '')} Trabajo '{self.title}' {state} en {elapsed:.2f}s"
+        )
+        if self.on_finish:
+            self.on_finish(state)
+
+    # ------------------------------------------------------------------
+    # Interfaz de progreso
+    # ------------------------------------------------------------------
+    def _build_window(self):
+        if cmds.window(PROGRESS_WINDOW, exists=True):
+            cmds.deleteUI(PROGRESS_WINDOW)
+
+        cmds.window(PROGRESS_WINDOW, title=f"⏳ {self.title}", widthHeight=(320, 120))
+        cmds.columnLayout(adjustableColumn=True, rowSpacing=8)
+        self._status_text = cmds.text(label="Iniciando...", align="left")
+        self._progress_bar = cmds.progressBar(
+            maxValue=len(self.steps) * _STEP_TICKS, height=20
+        )
+        cmds.button(label="🛑 Cancelar", bgc=(0.5, 0.2, 0.2), command=self.cancel)
+        cmds.showWindow(PROGRESS_WINDOW)
+
+    def _update_window(self, label=""):
+        if not cmds.window(PROGRESS_WINDOW, exists=True):
+            return
+
+        # Avance con la fracción del paso en curso (yield de los generadores)
+        done = min(self._index + self._step_fraction, len(self.steps))
+        total = len(self.steps)
+        elapsed = time.perf_counter() - self._start_time
+        remaining = elapsed / done * (total - done) if done else 0.0
+
+        cmds.progressBar(
+            self._progress_bar, edit=True, progress=int(done * _STEP_TICKS)
+        )
+        cmds.text(
+            self._status_text,
+            edit=True,
+            label=f"{label}  —  {self._index}/{total}  ·  restante ~{remaining:.1f}s",
+        )
+
+
+def run_job(title, steps, on_finish=None):
+    """
+    Lanza un trabajo diferido con ventana de progreso.
+
+    Args:
+        title (str): Título del trabajo
+        steps (list[tuple]): Pasos [(label, callable), ...]
+        on_finish (callable): Callback opcional con el estado final
+
+    Returns:
+        RigJob: Trabajo en ejecución, None si no se pudo iniciar
+    """
+    return RigJob(title, steps, on_finish=on_finish).start()
+
+
+def job_command(title, steps_factory):
+    """
+    Crea un callback de botón que construye los pasos al hacer click.
+
+    Los pasos se generan en el momento del click para leer los valores actuales
+    de los campos de la interfaz.
+
+    Args:
+        title (str): Título del trabajo
+        steps_factory (callable): Función sin argumentos que devuelve los pasos
+
+    Returns:
+        callable: Callback compatible con el flag command de los botones
+    """
+    return lambda *_: run_job(title, steps_factory())
+
+
+def run_to_end(generator):
+    """
+    Ejecuta de una vez todos los bloques de un builder iter_*.
+
+    Args:
+        generator: Generador devuelto por un builder iter_*
+
+    Returns:
+        El valor que devuelve el builder (return del generador)
+    """
+    while True:
+        try:
+            next(generator)
+        except StopIteration as stop:
+            return stop.value
+
+
+def get_active_job():
+    """Devuelve el trabajo en curso o None."""
+    return _active_job
@@ -0,0 +1,82 @@
+"""
+Tools - Orientación de joints vectorizada
+========================================
+
+Orienta cualquier número de cadenas de joints con una sola lectura y una sola
+escritura, reemplazando a `cmds.joint(e=True, orientJoint=...)` por cadena.
+
+Configuración equivalente:
+    - Primary Axis: X
+    - Secondary Axis: Y
+    - Secondary Axis World Orientation: Z+ (configurable)
+    - Último joint de cada cadena con jointOrient = 0
+
+Proceso:
+    1. Lectura única de todas las jerarquías y matrices world
+    2. Cálculo de orientaciones con NumPy (Tools.rig_math)
+    3. Escritura de translate/rotate/jointOrient en un solo lote MEL
+"""
+
+import maya.cmds as cmds
+import numpy as np
+
+from Tools import rig_math, scene_io
+
+
+def orient_joint_chains(roots, up=(0.0, 0.0, 1.0)):
+    """
+    Orienta todas las jerarquías de joints bajo los roots indicados.
+
+    Args:
+        roots (list[str]): Joints raíz de las cadenas a orientar
+        up (tuple): Eje world del eje secundario Y (default: +Z)
+
+    Returns:
+        list[str]: Joints orientados (fullPath), padres antes que hijos
+
+    Ejemplo:
+        >>> orient_joint_chains(["upperLeg_Leg_practice_L_IK_001",
+        ...                      "upperLeg_Leg_practice_L_MAIN_001"])
+    """
+    roots = cmds.ls(roots, type="joint", long=True) or []
+    if not roots:
+        cmds.warning("⚠️ No se recibieron joints raíz para orientar.")
+        return []
+
+    descendants = (
+        cmds.listRelatives(roots, allDescendents=True, type="joint", fullPath=True)
+        or []
+    )
+    # Padres antes que hijos; el orden estable conserva el primer hijo de cada joint
+    joints = list(dict.fromkeys(roots + descendants[::-1]))
+    joints.sort(key=lambda j: j.count("|"))
+
+    index = {j: i for i, j in enumerate(joints)}
+    parents = np.array([index.get(j.rsplit("|", 1)[0], -1) for j in joints])
+    aim_children = np.full(len(joints), -1)
+    for i, parent in enumerate(parents):
+        if parent >= 0 and aim_children[parent] < 0:
+            aim_children[parent] = i
+
+    world = scene_io.get_world_matrices(joints)
+    rotations = rig_math.solve_aim_orientations(
+        world[:, 3, :3], parents, aim_children, up=up
+    )
+
+    # Padres externos (no joints de la selección) leídos de escena
+    solved = rig_math.compose_matrices(world[:, 3, :3], rotations)
+    parent_world = np.empty_like(solved)
+    root_rows = np.flatnonzero(parents < 0)
+    parent_world[root_rows] = scene_io.get_parent_matrices(
+        [joints[i] for i in root_rows]
+    )
+    child_rows = np.flatnonzero(parents >= 0)
+    parent_world[child_rows] = solved[parents[child_rows]]
+
+    scene_io.set_local_transforms(
+        joints,
+        rig_math.local_matrices(solved, parent_world),
+        joints=joints,
+        write_scale=False,
+    )
+    return joints
@@ -0,0 +1,325 @@
+"""
+Tools - Evaluador NumPy de limbs FK/IK
+=====================================
+
+Reproduce con NumPy, sin evaluar el DG de Maya, la pose de un limb construido
+con Auto_Chain_IKFK, para miles de poses en una sola llamada vectorizada:
+
+    - FK: rotaciones de los controles (grupos ROOT/AUTO o joints FK en el
+      layout "matrix") sobre la pose de reposo
+    - IK: solver RP de dos huesos con pole vector (twist 0, sin stretch)
+    - MAIN: mezcla de orientaciones FK/IK con el peso FKIK como el
+      orientConstraint + reverse de conect_fkik_nodes (referencia), o con
+      slerp como el modo blendMatrix de matrix_blend
+
+Sirve para validar redes de nodos alternativas contra la referencia con
+constraints y para previsualizar poses fuera de Maya. El módulo no importa
+Maya; solo read_limb_rest lo necesita.
+
+Datos de reposo (dict):
+    local   Matrices locales de reposo de los 3 joints (3, 4, 4). Las cadenas
+            FK, IK y MAIN son clones y comparten las mismas
+    parent  Matriz world del padre de las cadenas (4, 4)
+
+Convención: la de rig_math (vector fila, world = local @ parent_world, grados
+con rotateOrder xyz).
+
+Uso:
+    >>> from Tools import limb_eval
+    >>> rest = limb_eval.read_limb_rest("Leg_practice_L", "001")  # en Maya
+    >>> pose = limb_eval.evaluate_limb(
+    ...     rest, fk_rotations=angles, handle=targets, pole=poles, fkik=weights
+    ... )
+    >>> pose["main"].shape
+    (5000, 3, 4, 4)
+"""
+
+import numpy as np
+
+from Tools import rig_math
+
+
+BLEND_MODES = ("constraint", "matrix")
+
+
+def read_limb_rest(base_name="Leg_practice_L", version="001", segments=None):
+    """
+    Lee en Maya los datos de reposo de un limb desde su cadena IK.
+
+    La cadena IK conserva translate y jointOrient de reposo (el solver solo
+    mueve rotate), así que la pose de reposo se puede leer con el rig animado.
+
+    Args:
+        base_name (str): Nombre base de la cadena (default: "Leg_practice_L")
+        version (str): Versión del sistema (default: "001")
+        segments (list[str]): Segmentos de la cadena (default: upperLeg/middleLeg/endLeg)
+
+    Returns:
+        dict: {"local": (3, 4, 4), "parent": (4, 4)}
+    """
+    import maya.cmds as cmds
+
+    from Auto_Chain_IKFK.rename_chain import DEFAULT_SEGMENTS
+    from Tools import scene_io
+
+    joints = [f"{seg}_{base_name}_IK_{version}" for seg in segments or DEFAULT_SEGMENTS]
+    translate = np.array([cmds.getAttr(f"{j}.translate")[0] for j in joints])
+    orient = np.array([cmds.getAttr(f"{j}.jointOrient")[0] for j in joints])
+    return {
+        "local": rig_math.compose_matrices(
+            translate, rig_math.rotations_from_euler_xyz(orient)
+        ),
+        "parent": scene_io.get_parent_matrices(joints[:1])[0],
+    }
+
+
+def _parents(rest, parent, poses):
+    """Padre world por pose (P, 4, 4)."""
+    parent = rest["parent"] if parent is None else parent
+    return np.broadcast_to(np.asarray(parent, dtype=float), (poses, 4, 4))
+
+
+def _world_chain(local, parent):
+    """Encadena matrices locales (P, N, 4, 4) bajo su padre (P, 4, 4)."""
+    world = np.empty(local.shape)
+    for i in range(local.shape[1]):
+        world[:, i] = parent = local[:, i] @ parent
+    return world
+
+
+def _bone_frames(direction, normal):
+    """Bases ortonormales (filas: hueso, normal del plano, tercer eje) (P, 3, 3)."""
+    x_axis = rig_math._normalize(direction)[0]
+    z_axis = rig_math._normalize(np.cross(x_axis, normal))[0]
+    return np.stack([x_axis, np.cross(z_axis, x_axis), z_axis], axis=1)
+
+
+def _nlerp(a, b, weights):
+    """Media normalizada de cuaterniones (P, 4) por el camino corto."""
+    b = np.where((np.sum(a * b, axis=1) < 0.0)[:, None], -b, b)
+    return rig_math._normalize(a + (b - a) * weights[:, None])[0]
+
+
+def _slerp(a, b, weights):
+    """Interpolación esférica de cuaterniones (P, 4) por el camino corto."""
+    dot = np.sum(a * b, axis=1)
+    b = np.where((dot < 0.0)[:, None], -b, b)
+    theta = np.arccos(np.clip(np.abs(dot), -1.0, 1.0))
+    sine = np.sin(theta)
+    close = sine < 1e-6
+    sine = np.where(close, 1.0, sine)
+    wa = np.where(close, 1.0 - weights, np.sin((1.0 - weights) * theta) / sine)
+    wb = np.where(close, weights, np.sin(weights * theta) / sine)
+    return rig_math._normalize(wa[:, None] * a + wb[:, None] * b)[0]
+
+
+def solve_fk(rest, rotations, auto_rotations=None, parent=None):
+    """
+    Matrices world de la cadena FK.
+
+    Las rotaciones son las de los controles respecto a su reposo: canales del
+    joint FK en el layout "matrix", del grupo ROOT con offsetParentMatrix, o
+    del grupo AUTO. local = R(auto) @ R(control) @ local de reposo.
+
+    Args:
+        rest (dict): Datos de reposo del limb
+        rotations (np.ndarray): Ángulos de los controles (P, N, 3) en grados
+        auto_rotations (np.ndarray): Ángulos de los grupos AUTO (P, N, 3)
+        parent (np.ndarray): Padre world por pose (P, 4, 4) (default: reposo)
+
+    Returns:
+        np.ndarray: Matrices world (P, N, 4, 4)
+    """
+    rotations = np.asarray(rotations, dtype=float)
+    poses, count = rotations.shape[:2]
+    delta = rig_math.rotations_from_euler_xyz(rotations.reshape(-1, 3))
+    if auto_rotations is not None:
+        auto = np.asarray(auto_rotations, dtype=float).reshape(-1, 3)
+        delta = rig_math.rotations_from_euler_xyz(auto) @ delta
+    local = rig_math.compose_matrices(rotation=delta).reshape(poses, count, 4, 4)
+    return _world_chain(
+        local @ np.asarray(rest["local"]), _parents(rest, parent, poses)
+    )
+
+
+def solve_ik(rest, handle, pole, parent=None):
+    """
+    Matrices world de la cadena IK con un solver RP de dos huesos.
+
+    La cadena queda en el plano (start, handle, pole) con el joint medio hacia
+    el pole; si el handle está fuera de alcance, la cadena se estira recta
+    hacia él. Cada hueso gira lo mínimo que lleva su dirección y la normal del
+    plano de reposo a las resueltas, y el último joint conserva su rotación
+    local (el handle no lo orienta), como el ikRPsolver con twist 0.
+
+    Args:
+        rest (dict): Datos de reposo del limb (3 joints)
+        handle (np.ndarray): Posiciones world del IK handle (P, 3)
+        pole (np.ndarray): Posiciones world del pole vector (P, 3)
+        parent (np.ndarray): Padre world por pose (P, 4, 4) (default: reposo)
+
+    Returns:
+        np.ndarray: Matrices world (P, 3, 4, 4)
+    """
+    local = np.asarray(rest["local"], dtype=float)
+    if len(local) != 3:
+        raise ValueError("solve_ik solo admite limbs de 3 joints (dos huesos)")
+    handle = np.atleast_2d(np.asarray(handle, dtype=float))
+    pole = np.atleast_2d(np.asarray(pole, dtype=float))
+    poses = max(len(handle), len(pole))
+    handle, pole = (np.broadcast_to(v, (poses, 3)) for v in (handle, pole))
+
+    rest_world = _world_chain(
+        np.broadcast_to(local, (poses, 3, 4, 4)), _parents(rest, parent, poses)
+    )
+    rest_points = rest_world[:, :, 3, :3]
+    rest_normal = np.cross(
+        rest_points[:, 2] - rest_points[:, 0], rest_points[:, 1] - rest_points[:, 0]
+    )
+    upper = np.linalg.norm(local[1, 3, :3])
+    lower = np.linalg.norm(local[2, 3, :3])
+
+    # Posiciones: ley del coseno en el plano del handle y el pole
+    start = rest_points[:, 0]
+    axis, distance = rig_math._normalize(handle - start)
+    distance = np.clip(distance, abs(upper - lower), upper + lower)
+    side = pole - start
+    side, side_length = rig_math._normalize(
+        side - np.sum(side * axis, axis=1)[:, None] * axis
+    )
+    # Pole sobre la línea del limb: se conserva el plano de reposo
+    fallback = rig_math._normalize(np.cross(rest_normal, axis))[0]
+    side = np.where((side_length < 1e-9)[:, None], fallback, side)
+
+    cosine = (upper**2 + distance**2 - lower**2) / np.maximum(
+        2.0 * upper * distance, 1e-12
+    )
+    angle = np.arccos(np.clip(cosine, -1.0, 1.0))
+    middle = start + upper * (
+        np.cos(angle)[:, None] * axis + np.sin(angle)[:, None] * side
+    )
+    end = start + distance[:, None] * axis
+    normal = np.cross(axis, side)
+
+    # Rotaciones: base (hueso, normal) de reposo → base resuelta
+    world = np.empty((poses, 3, 4, 4))
+    for i, (head, tail) in enumerate(((start, middle), (middle, end))):
+        rest_frame = _bone_frames(
+            rest_points[:, i + 1] - rest_points[:, i], rest_normal
+        )
+        delta = np.swapaxes(rest_frame, 1, 2) @ _bone_frames(tail - head, normal)
+        world[:, i] = rig_math.compose_matrices(head, rest_world[:, i, :3, :3] @ delta)
+    world[:, 2] = local[2] @ world[:, 1]
+    return world
+
+
+def blend_main(rest, fk_world, ik_world, fkik, mode="constraint", parent=None):
+    """
+    Matrices world de la cadena MAIN a partir de FK, IK y el peso FKIK.
+
+    Modos:
+        constraint  orientConstraint [FK, IK] sin offset con pesos 1 - FKIK
+                    (reverse) y FKIK: orientación world como media normalizada
+                    de cuaterniones
+        matrix      blendMatrix de matrix_blend: orientación world con slerp
+
+    En los dos modos la posición sale de la jerarquía MAIN.
+
+    Args:
+        rest (dict): Datos de reposo del limb
+        fk_world (np.ndarray): Matrices world FK (P, N, 4, 4)
+        ik_world (np.ndarray): Matrices world IK (P, N, 4, 4)
+        fkik (float | np.ndarray): Peso FKIK por pose (P,): 0 = FK, 1 = IK
+        mode (str): "constraint" o "matrix"
+        parent (np.ndarray): Padre world por pose (P, 4, 4) (default: reposo)
+
+    Returns:
+        np.ndarray: Matrices world (P, N, 4, 4)
+    """
+    if mode not in BLEND_MODES:
+        raise ValueError(f"Modo de blend desconocido: {mode} (usa {BLEND_MODES})")
+    poses, count = fk_world.shape[:2]
+    weights = np.repeat(np.broadcast_to(np.asarray(fkik, dtype=float), (poses,)), count)
+
+    _, fk_r, _ = rig_math.decompose_matrices(fk_world.reshape(-1, 4, 4))
+    _, ik_r, _ = rig_math.decompose_matrices(ik_world.reshape(-1, 4, 4))
+    fk_q = rig_math.quaternions_from_matrices(fk_r)
+    ik_q = rig_math.quaternions_from_matrices(ik_r)
+
+    blend = _slerp if mode == "matrix" else _nlerp
+    rotation = rig_math.matrices_from_quaternions(blend(fk_q, ik_q, weights))
+    rotation = rotation.reshape(poses, count, 3, 3)
+    local = np.asarray(rest["local"], dtype=float)
+    world = np.empty((poses, count, 4, 4))
+    parent = _parents(rest, parent, poses)
+    for i in range(count):
+        # Posición por la jerarquía MAIN, orientación world del blend
+        position = local[i, 3, :3] @ parent[:, :3, :3] + parent[:, 3, :3]
+        world[:, i] = parent = rig_math.compose_matrices(position, rotation[:, i])
+    return world
+
+
+def evaluate_limb(
+    rest,
+    fk_rotations=None,
+    handle=None,
+    pole=None,
+    fkik=0.0,
+    auto_rotations=None,
+    parent=None,
+    mode="constraint",
+):
+    """
+    Evalúa FK, IK y MAIN de un limb para muchas poses a la vez.
+
+    Args:
+        rest (dict): Datos de reposo del limb (read_limb_rest)
+        fk_rotations (np.ndarray): Ángulos de los controles FK (P, 3, 3)
+            (default: reposo)
+        handle (np.ndarray): Posiciones world del IK handle (P, 3)
+            (default: último joint en reposo)
+        pole (np.ndarray): Posiciones world del pole vector (P, 3)
+            (default: en el plano de reposo, rig_math.solve_pole_vectors)
+        fkik (float | np.ndarray): Peso FKIK por pose (P,)
+        auto_rotations (np.ndarray): Ángulos de los grupos AUTO (P, 3, 3)
+        parent (np.ndarray): Padre world por pose (P, 4, 4) (default: reposo)
+        mode (str): Blend MAIN, "constraint" (referencia) o "matrix"
+
+    Returns:
+        dict: {"fk", "ik", "main"} con matrices world (P, 3, 4, 4)
+
+    Ejemplo:
+        >>> angles = np.zeros((1000, 3, 3)); angles[:, 1, 2] = np.linspace(0, 90, 1000)
+        >>> pose = evaluate_limb(rest, fk_rotations=angles, fkik=0.0)
+        >>> pose["main"][-1, 2, 3, :3]  # tobillo con la rodilla a 90°
+    """
+    # Número de poses: el de la entrada más larga con eje de poses
+    fkik = np.atleast_1d(np.asarray(fkik, dtype=float))
+    inputs = (
+        (fk_rotations, 3),
+        (auto_rotations, 3),
+        (handle, 2),
+        (pole, 2),
+        (parent, 3),
+    )
+    poses = max([len(fkik)] + [len(v) for v, ndim in inputs if np.ndim(v) == ndim])
+
+    rest_world = _world_chain(
+        np.asarray(rest["local"], dtype=float)[None], _parents(rest, None, 1)
+    )[0]
+    if fk_rotations is None:
+        fk_rotations = np.zeros((poses, len(rest_world), 3))
+    if handle is None:
+        handle = rest_world[-1, 3, :3]
+    if pole is None:
+        points = rest_world[:, 3, :3]
+        pole = rig_math.solve_pole_vectors(points[0], points[1], points[2])
+    fk_rotations = np.broadcast_to(fk_rotations, (poses,) + np.shape(fk_rotations)[-2:])
+    if auto_rotations is not None:
+        auto_rotations = np.broadcast_to(auto_rotations, fk_rotations.shape)
+    parent = None if parent is None else _parents(rest, parent, poses)
+
+    fk = solve_fk(rest, fk_rotations, auto_rotations, parent)
+    ik = solve_ik(rest, np.broadcast_to(handle, (poses, 3)), pole, parent)
+    main = blend_main(rest, fk, ik, np.broadcast_to(fkik, (poses,)), mode, parent)
+    return {"fk": fk, "ik": ik, "main": main}
@@ -1,56 +1,47 @@
 import maya.cmds as cmds
-from Auto_Tail import at_ui
-from Auto_Column import spline_auto_rig
-from Auto_Chain_IKFK import select_tool
-from Tools import clear_chain
+from Tools import tool_registry
 
 
-def open_main_rig_launcher():
+def open_main_rig_launcher(rebuild=False):
     """
     Ventana central para acceder a todas las herramientas de rigging.
+
+    Los botones se generan desde Tools.tool_registry; cada herramienta se importa
+    solo al pulsar su botón por primera vez. Si el registro cambió desde que se
+    construyó la ventana, se reconstruye.
+
+    Args:
+        rebuild (bool): Fuerza la reconstrucción de la ventana (default: False)
     """
     window_name = "mainRigLauncher"
 
-    if cmds.window(window_name, exists=True):
-        cmds.deleteUI(window_name)
-
-    cmds.window(window_name, title="🎛️ Rigging Tools Launcher", widthHeight=(320, 330))
+    if tool_registry.show_cached_window(
+        window_name,
+        rebuild=rebuild,
+        version=tool_registry.get_version(),
+        owner=__name__,
+    ):
+        return
+
+    cmds.window(
+        window_name,
+        title="🎛️ Rigging Tools Launcher",
+        widthHeight=(320, 330),
+        retain=True,
+    )
     cmds.columnLayout(adjustableColumn=True, rowSpacing=12, columnAlign="center")
 
     cmds.text(label="🦾 Central de Herramientas de Rigging", height=30, align="center")
     cmds.separator(height=10, style="in")
 
-    # --- Auto Tail Rig ---
-    cmds.button(
-        label="🐍 Auto Tail Rig Tool",
-        bgc=(0.3, 0.5, 0.8),
-        height=40,
-        command=lambda *_: at_ui.auto_tail_ui(),
-    )
-
-    # --- Spine Auto Rig ---
-    cmds.button(
-        label="🦴 Spine Auto Rig Tool",
-        bgc=(0.4, 0.7, 0.6),
-        height=40,
-        command=lambda *_: spline_auto_rig.open_spine_auto_rig_ui(),
-    )
-
-    # --- IK/FK Rig Tools ---
-    cmds.button(
-        label="🔗 IK / FK Rig Tools",
-        bgc=(0.6, 0.6, 0.4),
-        height=40,
-        command=lambda *_: select_tool.open_ui(),
-    )
-
-    # --- Clear Chain Tool ---
-    cmds.button(
-        label="🧹 Limpiar Cadena (Clear Rig)",
-        bgc=(0.5, 0.7, 0.9),
-        height=40,
-        command=lambda *_: clear_chain.create_clean_chain_from_selection(),
-    )
+    # --- Herramientas registradas ---
+    for tool in tool_registry.get_tools():
+        cmds.button(
+            label=tool["label"],
+            bgc=tool["bgc"],
+            height=tool["height"],
+            command=lambda *_, name=tool["name"]: tool_registry.launch(name),
+        )
 
     cmds.separator(height=15, style="in")
 
@@ -59,7 +50,7 @@ def open_main_rig_launcher():
         label="❌ Cerrar",
         bgc=(0.5, 0.2, 0.2),
         height=35,
-        command=lambda *_: cmds.deleteUI(window_name),
+        command=lambda *_: tool_registry.hide_window(window_name),
     )
 
     cmds.showWindow(window_name)
@@ -0,0 +1,496 @@
+"""
+Tools - Matemática de rig vectorizada
+====================================
+
+Funciones NumPy puras (sin dependencia de Maya) para operar sobre muchas matrices
+a la vez. Se usan desde los builders para calcular transformaciones en memoria y
+escribir el resultado en escena en una sola pasada.
+
+Convención:
+    Las matrices siguen la convención de Maya (vector fila):
+        - Filas 0-2: ejes X, Y, Z
+        - Fila 3: traslación
+        - world = local @ parent_world
+    Los ángulos se expresan en grados con rotateOrder xyz.
+"""
+
+import numpy as np
+
+
+MIRROR_PLANES = {
+    "YZ": np.array([-1.0, 1.0, 1.0]),
+    "XZ": np.array([1.0, -1.0, 1.0]),
+    "XY": np.array([1.0, 1.0, -1.0]),
+}
+
+
+def as_matrices(values):
+    """
+    Convierte listas planas de 16 valores (xform/getAttr) a matrices 4x4.
+
+    Args:
+        values: Secuencia de N listas de 16 floats, o array (N, 16) / (N, 4, 4)
+
+    Returns:
+        np.ndarray: Array (N, 4, 4)
+    """
+    return np.asarray(values, dtype=float).reshape(-1, 4, 4)
+
+
+def identity_matrices(count):
+    """Devuelve un array (count, 4, 4) de identidades."""
+    return np.tile(np.eye(4), (count, 1, 1))
+
+
+def local_matrices(world, parent_world):
+    """
+    Calcula matrices locales a partir de matrices world y las de sus padres.
+
+    Args:
+        world (np.ndarray): Matrices world (N, 4, 4)
+        parent_world (np.ndarray): Matrices world de los padres (N, 4, 4)
+
+    Returns:
+        np.ndarray: Matrices locales (N, 4, 4)
+    """
+    return world @ np.linalg.inv(parent_world)
+
+
+def mirror_matrices(matrices, plane="YZ"):
+    """
+    Refleja matrices world a través de un plano con comportamiento "behavior".
+
+    Las posiciones se reflejan y los ejes se invierten para que la matriz siga
+    siendo una rotación propia: rotar ambos lados con los mismos valores produce
+    movimientos simétricos (igual que Mirror Joint > Behavior en Maya).
+
+    Args:
+        matrices (np.ndarray): Matrices (N, 4, 4)
+        plane (str): Plano de simetría "YZ", "XZ" o "XY" (default: "YZ")
+
+    Returns:
+        np.ndarray: Matrices reflejadas (N, 4, 4)
+    """
+    s = MIRROR_PLANES[plane]
+    mirrored = np.array(matrices, dtype=float, copy=True)
+    mirrored[:, :3, :3] = -mirrored[:, :3, :3] * s
+    mirrored[:, 3, :3] = mirrored[:, 3, :3] * s
+    return mirrored
+
+
+def mirror_points(points, plane="YZ"):
+    """Refleja posiciones (…, 3) a través de un plano."""
+    return np.asarray(points, dtype=float) * MIRROR_PLANES[plane]
+
+
+def transform_points(points, matrix):
+    """
+    Transforma puntos (N, 3) por una matriz 4x4 (convención vector fila).
+
+    Args:
+        points (np.ndarray): Puntos (N, 3)
+        matrix (np.ndarray): Matriz (4, 4)
+
+    Returns:
+        np.ndarray: Puntos transformados (N, 3)
+    """
+    points = np.asarray(points, dtype=float)
+    return points @ matrix[:3, :3] + matrix[3, :3]
+
+
+def decompose_matrices(matrices):
+    """
+    Separa traslación, rotación (sin escala) y escala de un grupo de matrices.
+
+    Args:
+        matrices (np.ndarray): Matrices (N, 4, 4)
+
+    Returns:
+        tuple: (translate (N, 3), rotation (N, 3, 3), scale (N, 3))
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    translate = matrices[:, 3, :3].copy()
+    scale = np.linalg.norm(matrices[:, :3, :3], axis=2)
+    rotation = matrices[:, :3, :3] / np.where(scale > 1e-12, scale, 1.0)[:, :, None]
+    return translate, rotation, scale
+
+
+def compose_matrices(translate=None, rotation=None, scale=None, count=None):
+    """
+    Construye matrices 4x4 a partir de traslación, rotación 3x3 y escala.
+
+    Args:
+        translate (np.ndarray): Traslaciones (N, 3)
+        rotation (np.ndarray): Rotaciones (N, 3, 3)
+        scale (np.ndarray): Escalas (N, 3)
+        count (int): Número de matrices si no se pasa ningún componente
+
+    Returns:
+        np.ndarray: Matrices (N, 4, 4)
+    """
+    for component in (translate, rotation, scale):
+        if component is not None:
+            count = len(component)
+            break
+
+    matrices = identity_matrices(count)
+    if rotation is not None:
+        matrices[:, :3, :3] = rotation
+    if scale is not None:
+        matrices[:, :3, :3] *= np.asarray(scale, dtype=float)[:, :, None]
+    if translate is not None:
+        matrices[:, 3, :3] = translate
+    return matrices
+
+
+def euler_xyz_from_matrices(rotation):
+    """
+    Convierte rotaciones 3x3 (o matrices 4x4) a ángulos Euler xyz en grados.
+
+    Args:
+        rotation (np.ndarray): Rotaciones (N, 3, 3) o (N, 4, 4) sin escala
+
+    Returns:
+        np.ndarray: Ángulos (N, 3) en grados
+    """
+    r = np.asarray(rotation, dtype=float)[:, :3, :3]
+    sin_y = np.clip(-r[:, 0, 2], -1.0, 1.0)
+    y = np.arcsin(sin_y)
+    cos_y = np.cos(y)
+
+    x = np.arctan2(r[:, 1, 2], r[:, 2, 2])
+    z = np.arctan2(r[:, 0, 1], r[:, 0, 0])
+
+    # Gimbal lock: Z se fija a 0 y toda la rotación restante va a X
+    gimbal = np.abs(cos_y) < 1e-6
+    if np.any(gimbal):
+        x[gimbal] = np.arctan2(r[gimbal, 1, 0] * sin_y[gimbal], r[gimbal, 1, 1])
+        z[gimbal] = 0.0
+
+    return np.degrees(np.stack([x, y, z], axis=1))
+
+
+def rotations_from_euler_xyz(angles):
+    """
+    Convierte ángulos Euler xyz (grados) a rotaciones 3x3.
+
+    Args:
+        angles (np.ndarray): Ángulos (N, 3) en grados
+
+    Returns:
+        np.ndarray: Rotaciones (N, 3, 3)
+    """
+    a = np.radians(np.asarray(angles, dtype=float).reshape(-1, 3))
+    cx, cy, cz = np.cos(a).T
+    sx, sy, sz = np.sin(a).T
+
+    r = np.empty((len(a), 3, 3))
+    r[:, 0, 0] = cy * cz
+    r[:, 0, 1] = cy * sz
+    r[:, 0, 2] = -sy
+    r[:, 1, 0] = sx * sy * cz - cx * sz
+    r[:, 1, 1] = sx * sy * sz + cx * cz
+    r[:, 1, 2] = sx * cy
+    r[:, 2, 0] = cx * sy * cz + sx * sz
+    r[:, 2, 1] = cx * sy * sz - sx * cz
+    r[:, 2, 2] = cx * cy
+    return r
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=float)
+    length = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(length > 1e-12, length, 1.0), length[..., 0]
+
+
+def solve_aim_orientations(positions, parents, aim_children, up=(0.0, 0.0, 1.0)):
+    """
+    Calcula orientaciones world X-primary / Y-secondary para muchas cadenas a la vez.
+
+    Equivale a Orient Joint con Primary Axis X, Secondary Axis Y y Secondary Axis
+    World Orientation = up, limpiando el jointOrient del último joint.
+
+    Args:
+        positions (np.ndarray): Posiciones world de todos los joints (N, 3)
+        parents (np.ndarray): Índice del padre de cada joint, -1 si es root.
+            Los padres deben aparecer antes que sus hijos.
+        aim_children (np.ndarray): Índice del hijo al que apunta X, -1 si es final
+        up (tuple): Eje world hacia el que apunta Y (default: +Z)
+
+    Returns:
+        np.ndarray: Rotaciones world (N, 3, 3) (filas = ejes X, Y, Z)
+
+    Casos degenerados:
+        - Hueso paralelo a up: Y hereda el eje Y del padre (o world +Y si es root)
+        - Hueso de longitud 0: hereda la orientación del padre
+        - Joint final: hereda la orientación del padre (jointOrient = 0)
+    """
+    positions = np.asarray(positions, dtype=float)
+    parents = np.asarray(parents, dtype=int)
+    aim_children = np.asarray(aim_children, dtype=int)
+    count = len(positions)
+
+    has_child = aim_children >= 0
+    x_axis, bone_length = _normalize(
+        np.where(
+            has_child[:, None], positions[aim_children] - positions, [1.0, 0.0, 0.0]
+        )
+    )
+
+    up = np.broadcast_to(np.asarray(up, dtype=float), (count, 3))
+    y_axis, y_length = _normalize(up - np.sum(up * x_axis, axis=1)[:, None] * x_axis)
+
+    rotations = np.empty((count, 3, 3))
+    rotations[:, 0] = x_axis
+    rotations[:, 1] = y_axis
+    rotations[:, 2] = np.cross(x_axis, y_axis)
+
+    # Casos que dependen del padre: se resuelven en orden jerárquico (pocos joints)
+    inherit = ~has_child | (bone_length < 1e-9)
+    parallel = has_child & ~inherit & (y_length < 1e-9)
+    for i in np.flatnonzero(inherit | parallel):
+        parent = parents[i]
+        if inherit[i]:
+            rotations[i] = rotations[parent] if parent >= 0 else np.eye(3)
+            continue
+        reference = rotations[parent, 1] if parent >= 0 else np.array([0.0, 1.0, 0.0])
+        y, length = _normalize(reference - np.dot(reference, x_axis[i]) * x_axis[i])
+        if length < 1e-9:
+            y, _ = _normalize(np.cross([1.0, 0.0, 0.0], x_axis[i]))
+            if np.linalg.norm(y) < 1e-9:
+                y = np.array([0.0, 0.0, 1.0])
+        rotations[i, 1] = y
+        rotations[i, 2] = np.cross(x_axis[i], y)
+
+    return rotations
+
+
+def solve_pole_vectors(start, middle, end, distance=0.5, fallback=(0.0, 0.0, 1.0)):
+    """
+    Calcula la posición del pole vector de muchos limbs a la vez.
+
+    El pole queda en el plano del limb, en la dirección que va de la proyección
+    del joint medio sobre la línea start→end hacia el joint medio, a una
+    distancia proporcional a la longitud del limb.
+
+    Args:
+        start (np.ndarray): Posiciones world del primer joint (N, 3)
+        middle (np.ndarray): Posiciones world del joint medio (N, 3)
+        end (np.ndarray): Posiciones world del último joint (N, 3)
+        distance (float | np.ndarray): Distancia al joint medio en múltiplos de
+            la longitud del limb (default: 0.5)
+        fallback (tuple): Dirección para limbs rectos, donde el plano no está
+            definido; se proyecta perpendicular al limb (default: +Z, rodilla
+            hacia delante)
+
+    Returns:
+        np.ndarray: Posiciones world de los pole vectors (N, 3)
+    """
+    start, middle, end = (
+        np.atleast_2d(np.asarray(v, dtype=float)) for v in (start, middle, end)
+    )
+    axis, axis_length = _normalize(end - start)
+    to_middle = middle - start
+    projection = start + np.sum(to_middle * axis, axis=1)[:, None] * axis
+    direction, offset = _normalize(middle - projection)
+
+    # Limb recto: dirección de respaldo perpendicular al eje del limb
+    straight = offset < 1e-6 * np.maximum(axis_length, 1.0)
+    if np.any(straight):
+        fallback = np.broadcast_to(np.asarray(fallback, dtype=float), start.shape)
+        side = fallback - np.sum(fallback * axis, axis=1)[:, None] * axis
+        side, side_length = _normalize(side)
+        # Respaldo paralelo al limb: cualquier perpendicular sirve
+        other = np.cross(axis, [0.0, 0.0, 1.0])
+        other = np.where(
+            (np.linalg.norm(other, axis=1) < 1e-9)[:, None],
+            np.cross(axis, [1.0, 0.0, 0.0]),
+            other,
+        )
+        side = np.where((side_length < 1e-9)[:, None], _normalize(other)[0], side)
+        direction = np.where(straight[:, None], side, direction)
+
+    limb_length = np.linalg.norm(to_middle, axis=1) + np.linalg.norm(
+        end - middle, axis=1
+    )
+    return (
+        middle
+        + direction * (np.asarray(distance, dtype=float) * limb_length)[..., None]
+    )
+
+
+def unwrap_degrees(angles, axis=0):
+    """
+    Elimina los saltos de ±360° entre muestras consecutivas de ángulos Euler.
+
+    Args:
+        angles (np.ndarray): Ángulos en grados, con el tiempo en el eje axis
+        axis (int): Eje de las muestras (default: 0)
+
+    Returns:
+        np.ndarray: Ángulos continuos en grados
+    """
+    return np.degrees(np.unwrap(np.radians(angles), axis=axis))
+
+
+def reduce_keys(times, values, tolerance):
+    """
+    Elige las claves mínimas de una curva muestreada (Ramer-Douglas-Peucker).
+
+    Interpolando linealmente entre las claves elegidas, ninguna muestra se
+    separa de su valor original más que tolerance.
+
+    Args:
+        times (np.ndarray): Tiempos de las muestras (K,), crecientes
+        values (np.ndarray): Valores de las muestras (K,)
+        tolerance (float): Error máximo permitido (unidades del canal)
+
+    Returns:
+        np.ndarray: Índices de las claves a conservar, ordenados
+    """
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if len(times) < 3:
+        return np.arange(len(times))
+
+    keep = np.zeros(len(times), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(times) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        t = times[first + 1 : last]
+        slope = (values[last] - values[first]) / (times[last] - times[first])
+        error = np.abs(
+            values[first + 1 : last] - (values[first] + slope * (t - times[first]))
+        )
+        worst = int(np.argmax(error))
+        if error[worst] > tolerance:
+            split = first + 1 + worst
+            keep[split] = True
+            stack += [(first, split), (split, last)]
+    return np.flatnonzero(keep)
+
+
+def quaternions_from_matrices(rotation):
+    """
+    Convierte rotaciones 3x3 (convención vector fila de Maya) a cuaterniones.
+
+    Mismo orden que MQuaternion: (x, y, z, w). Cada cuaternión se elige en el
+    hemisferio w >= 0.
+
+    Args:
+        rotation (np.ndarray): Rotaciones (N, 3, 3) o (N, 4, 4) sin escala
+
+    Returns:
+        np.ndarray: Cuaterniones (N, 4)
+    """
+    # Maya usa vector fila: la matriz "clásica" (vector columna) es la transpuesta
+    m = np.swapaxes(np.asarray(rotation, dtype=float)[:, :3, :3], 1, 2)
+    trace = np.trace(m, axis1=1, axis2=2)
+
+    # Cuatro ramas de Shepperd, se usa la de mayor denominador por estabilidad
+    candidates = np.stack(
+        [
+            trace,
+            m[:, 0, 0] - m[:, 1, 1] - m[:, 2, 2],
+            m[:, 1, 1] - m[:, 0, 0] - m[:, 2, 2],
+            m[:, 2, 2] - m[:, 0, 0] - m[:, 1, 1],
+        ],
+        axis=1,
+    )
+    branch = np.argmax(candidates, axis=1)
+    s = np.sqrt(np.maximum(1.0 + candidates[np.arange(len(m)), branch], 1e-12)) * 2.0
+
+    q = np.empty((len(m), 4))
+    b = branch == 0
+    q[b] = np.stack(
+        [
+            (m[b, 2, 1] - m[b, 1, 2]) / s[b],
+            (m[b, 0, 2] - m[b, 2, 0]) / s[b],
+            (m[b, 1, 0] - m[b, 0, 1]) / s[b],
+            0.25 * s[b],
+        ],
+        axis=1,
+    )
+    b = branch == 1
+    q[b] = np.stack(
+        [
+            0.25 * s[b],
+            (m[b, 0, 1] + m[b, 1, 0]) / s[b],
+            (m[b, 0, 2] + m[b, 2, 0]) / s[b],
+            (m[b, 2, 1] - m[b, 1, 2]) / s[b],
+        ],
+        axis=1,
+    )
+    b = branch == 2
+    q[b] = np.stack(
+        [
+            (m[b, 0, 1] + m[b, 1, 0]) / s[b],
+            0.25 * s[b],
+            (m[b, 1, 2] + m[b, 2, 1]) / s[b],
+            (m[b, 0, 2] - m[b, 2, 0]) / s[b],
+        ],
+        axis=1,
+    )
+    b = branch == 3
+    q[b] = np.stack(
+        [
+            (m[b, 0, 2] + m[b, 2, 0]) / s[b],
+            (m[b, 1, 2] + m[b, 2, 1]) / s[b],
+            0.25 * s[b],
+            (m[b, 1, 0] - m[b, 0, 1]) / s[b],
+        ],
+        axis=1,
+    )
+    q[q[:, 3] < 0] *= -1.0
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+def matrices_from_quaternions(quaternions):
+    """
+    Convierte cuaterniones (x, y, z, w) a rotaciones 3x3 (convención vector fila).
+
+    Args:
+        quaternions (np.ndarray): Cuaterniones (N, 4)
+
+    Returns:
+        np.ndarray: Rotaciones (N, 3, 3)
+    """
+    q = np.asarray(quaternions, dtype=float).reshape(-1, 4)
+    x, y, z, w = (q / np.linalg.norm(q, axis=1, keepdims=True)).T
+    return np.stack(
+        [
+            np.stack(
+                [1 - 2 * (y * y + z * z), 2 * (x * y + z * w), 2 * (x * z - y * w)], 1
+            ),
+            np.stack(
+                [2 * (x * y - z * w), 1 - 2 * (x * x + z * z), 2 * (y * z + x * w)], 1
+            ),
+            np.stack(
+                [2 * (x * z + y * w), 2 * (y * z - x * w), 1 - 2 * (x * x + y * y)], 1
+            ),
+        ],
+        axis=1,
+    )
+
+
+def blend_quaternions(quaternions, weights):
+    """
+    Mezcla varias poses de cuaterniones con pesos (media normalizada).
+
+    Cada pose se lleva al hemisferio de la primera antes de sumar, para que la
+    mezcla siga el camino corto. Con dos poses equivale a un nlerp.
+
+    Args:
+        quaternions (np.ndarray): Cuaterniones (P, N, 4) de P poses
+        weights (np.ndarray): Pesos (P,)
+
+    Returns:
+        np.ndarray: Cuaterniones mezclados (N, 4)
+    """
+    q = np.asarray(quaternions, dtype=float)
+    sign = np.where(np.sum(q * q[:1], axis=-1, keepdims=True) < 0.0, -1.0, 1.0)
+    total = np.einsum("p,pni->ni", np.asarray(weights, dtype=float), q * sign)
+    return _normalize(total)[0]
@@ -0,0 +1,531 @@
+"""
+Tools - Lectura y escritura de escena por lotes
+==============================================
+
+Utilidades para leer datos de muchos nodos en una sola pasada y escribir los
+resultados con un único comando, en lugar de hacer una llamada de cmds por nodo
+y por atributo.
+
+Estrategia:
+    - Lectura: API de OpenMaya 2.0 (no pasa por el intérprete de comandos)
+    - Escritura: un único bloque MEL evaluado de una vez, que sigue siendo
+      deshacible con Ctrl+Z (las escrituras de la API no entran en el undo)
+"""
+
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import maya.mel as mel
+import numpy as np
+
+
+def _selection(nodes):
+    sel = om.MSelectionList()
+    for node in nodes:
+        sel.add(node)
+    return sel
+
+
+def list_subtree(roots, node_type=None):
+    """
+    Lista los nodos de uno o varios subárboles con una sola consulta.
+
+    Args:
+        roots (str | list[str]): Nodos raíz (se incluyen en el resultado)
+        node_type (str): Tipo de nodo a listar, por ejemplo "joint" (default: todos)
+
+    Returns:
+        list[str]: Nodos (fullPath), padres antes que hijos
+    """
+    if isinstance(roots, str):
+        roots = [roots]
+    roots = cmds.ls(roots, long=True) or []
+    if not roots:
+        return []
+
+    kwargs = {"type": node_type} if node_type else {}
+    descendants = (
+        cmds.listRelatives(roots, allDescendents=True, fullPath=True, **kwargs) or []
+    )
+    if node_type:
+        roots = cmds.ls(roots, type=node_type, long=True) or []
+    nodes = list(dict.fromkeys(roots + descendants[::-1]))
+    nodes.sort(key=lambda n: n.count("|"))
+    return nodes
+
+
+def split_by_root(nodes, roots):
+    """
+    Reparte nodos (fullPath) entre el root más cercano por encima de cada uno.
+
+    Args:
+        nodes (list[str]): Nodos en fullPath (por ejemplo de list_subtree)
+        roots (list[str]): Roots en fullPath
+
+    Returns:
+        dict: {root: [nodos]} conservando el orden de nodes
+    """
+    owned = {root: [] for root in roots}
+    for node in nodes:
+        ancestor = node
+        while ancestor and ancestor not in owned:
+            ancestor = ancestor.rsplit("|", 1)[0]
+        if ancestor:
+            owned[ancestor].append(node)
+    return owned
+
+
+def get_full_paths(nodes):
+    """Rutas completas (fullPath) de varios nodos DAG, en el mismo orden."""
+    sel = _selection(nodes)
+    return [sel.getDagPath(i).fullPathName() for i in range(len(nodes))]
+
+
+def get_world_matrices(nodes):
+    """
+    Lee las matrices world de varios nodos DAG en una sola pasada.
+
+    Args:
+        nodes (list[str]): Nombres de los nodos
+
+    Returns:
+        np.ndarray: Matrices (N, 4, 4) en convención de Maya (vector fila)
+    """
+    if not nodes:
+        return np.zeros((0, 4, 4))
+    sel = _selection(nodes)
+    return np.array(
+        [list(sel.getDagPath(i).inclusiveMatrix()) for i in range(len(nodes))]
+    ).reshape(-1, 4, 4)
+
+
+def get_parent_matrices(nodes):
+    """
+    Lee las matrices world de los padres de varios nodos DAG.
+
+    Args:
+        nodes (list[str]): Nombres de los nodos
+
+    Returns:
+        np.ndarray: Matrices (N, 4, 4); identidad para nodos sin padre
+    """
+    if not nodes:
+        return np.zeros((0, 4, 4))
+    sel = _selection(nodes)
+    return np.array(
+        [list(sel.getDagPath(i).exclusiveMatrix()) for i in range(len(nodes))]
+    ).reshape(-1, 4, 4)
+
+
+def sample_matrices(nodes, frames, attribute="worldMatrix"):
+    """
+    Lee un atributo matrix de varios nodos en muchos frames sin mover el tiempo.
+
+    Cada frame se evalúa con un MDGContext: no se cambia currentTime ni se
+    redibuja la escena, y no se hace ninguna consulta de cmds por frame.
+
+    Args:
+        nodes (list[str]): Nombres de los nodos
+        frames (list[float]): Frames a muestrear (unidades de tiempo de la UI)
+        attribute (str): Atributo a leer; si es un array se usa el elemento 0
+            (default: "worldMatrix"; "parentMatrix" para la matriz del padre)
+
+    Returns:
+        np.ndarray: Matrices (F, N, 4, 4) en convención de Maya (vector fila)
+    """
+    frames = np.atleast_1d(np.asarray(frames, dtype=float))
+    result = np.zeros((len(frames), len(nodes), 4, 4))
+    if not nodes:
+        return result
+
+    sel = _selection(nodes)
+    plugs = []
+    for i in range(len(nodes)):
+        plug = om.MFnDependencyNode(sel.getDependNode(i)).findPlug(attribute, False)
+        plugs.append(plug.elementByLogicalIndex(0) if plug.isArray else plug)
+
+    unit = om.MTime.uiUnit()
+    for f, frame in enumerate(frames):
+        with om.MDGContextGuard(om.MDGContext(om.MTime(float(frame), unit))):
+            for n, plug in enumerate(plugs):
+                matrix = om.MFnMatrixData(plug.asMObject()).matrix()
+                result[f, n] = np.reshape(list(matrix), (4, 4))
+    return result
+
+
+def _plug_value(plug):
+    """Valor de un plug numérico en unidades de la UI (grados, cm...)."""
+    attr = plug.attribute()
+    if attr.hasFn(om.MFn.kUnitAttribute):
+        unit = om.MFnUnitAttribute(attr).unitType()
+        if unit == om.MFnUnitAttribute.kAngle:
+            return plug.asMAngle().asUnits(om.MAngle.uiUnit())
+        if unit == om.MFnUnitAttribute.kDistance:
+            return plug.asMDistance().asUnits(om.MDistance.uiUnit())
+    return plug.asDouble()
+
+
+def get_plug_values(plugs, settable_only=False):
+    """
+    Lee muchos atributos numéricos en una sola pasada con la API.
+
+    Args:
+        plugs (list[str]): Atributos ("nodo.atributo")
+        settable_only (bool): Descartar los bloqueados o movidos por otro nodo
+            (los animados con claves sí se conservan)
+
+    Returns:
+        tuple: (plugs list[str], valores np.ndarray (N,)) en unidades de la UI
+    """
+    if not plugs:
+        return [], np.zeros(0)
+    sel = _selection(plugs)
+    names, values = [], []
+    for i, name in enumerate(plugs):
+        plug = sel.getPlug(i)
+        if settable_only:
+            source = plug.source()
+            driven = not source.isNull and not source.node().hasFn(om.MFn.kAnimCurve)
+            if plug.isLocked or driven:
+                continue
+        names.append(name)
+        values.append(_plug_value(plug))
+    return names, np.array(values, dtype=float)
+
+
+def get_curve_data(shapes):
+    """
+    Lee grado, forma, knots y CVs en world space de varias curvas NURBS.
+
+    Args:
+        shapes (list[str]): Shapes nurbsCurve
+
+    Returns:
+        list[dict]: [{"degree", "form", "knots", "points" (N, 3)}, ...]
+            form sigue la convención de MEL: 0 open, 1 closed, 2 periodic
+    """
+    sel = _selection(shapes)
+    data = []
+    for i in range(len(shapes)):
+        fn = om.MFnNurbsCurve(sel.getDagPath(i))
+        points = fn.cvPositions(om.MSpace.kWorld)
+        data.append(
+            {
+                "degree": fn.degree,
+                "form": fn.form - 1,
+                "knots": list(fn.knots()),
+                "points": np.array([[p.x, p.y, p.z] for p in points]),
+            }
+        )
+    return data
+
+
+def mel_string(value):
+    """Escapa un valor para usarlo como string en MEL."""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def mel_set_double3(plug, values):
+    """Devuelve la línea MEL que asigna un atributo double3."""
+    x, y, z = (float(v) for v in values)
+    return f"setAttr {mel_string(plug)} -type double3 {x!r} {y!r} {z!r};"
+
+
+def mel_set_value(plug, value):
+    """Devuelve la línea MEL que asigna un atributo escalar."""
+    return f"setAttr {mel_string(plug)} {float(value)!r};"
+
+
+def mel_set_matrix(plug, matrix):
+    """Devuelve la línea MEL que asigna un atributo matrix (4x4)."""
+    values = " ".join(repr(float(v)) for v in np.asarray(matrix).ravel())
+    return f'setAttr {mel_string(plug)} -type "matrix" {values};'
+
+
+def run_mel_batch(lines):
+    """
+    Ejecuta muchas líneas MEL en una sola evaluación.
+
+    Args:
+        lines (list[str]): Líneas MEL terminadas en ';'
+
+    Returns:
+        Resultado de mel.eval (o None si no hay líneas)
+    """
+    if not lines:
+        return None
+    return mel.eval("\n".join(lines))
+
+
+def set_local_transforms(nodes, matrices, joints=(), write_scale=True):
+    """
+    Escribe matrices locales en varios nodos con una sola evaluación MEL.
+
+    Para joints la rotación se guarda en jointOrient y rotate queda en 0, que es
+    el estado que deja Orient Joint. Para transforms se usa rotate (xyz).
+
+    Args:
+        nodes (list[str]): Nodos destino
+        matrices (np.ndarray): Matrices locales (N, 4, 4)
+        joints (set[str]): Subconjunto de nodos que son joints
+        write_scale (bool): Si es False se conserva la escala actual
+    """
+    from Tools import rig_math
+
+    translate, rotation, scale = rig_math.decompose_matrices(matrices)
+    angles = rig_math.euler_xyz_from_matrices(rotation)
+    joints = set(joints)
+
+    lines = []
+    for node, t, r, s in zip(nodes, translate, angles, scale):
+        lines.append(mel_set_double3(f"{node}.translate", t))
+        if node in joints:
+            lines.append(mel_set_double3(f"{node}.rotate", (0, 0, 0)))
+            lines.append(mel_set_double3(f"{node}.jointOrient", r))
+        else:
+            lines.append(mel_set_double3(f"{node}.rotate", r))
+        if write_scale:
+            lines.append(mel_set_double3(f"{node}.scale", s))
+    run_mel_batch(lines)
+
+
+def mel_create_curve_shape(parent, name, degree, form, knots, points):
+    """
+    Devuelve las líneas MEL que crean una shape NURBS directamente bajo un transform.
+
+    La curva se escribe completa en el atributo .cc, sin transform temporal ni
+    historial.
+
+    Args:
+        parent (str): Transform que recibirá la shape
+        name (str): Nombre de la shape
+        degree (int): Grado de la curva
+        form (int): 0 open, 1 closed, 2 periodic
+        knots (list[float]): Vector de knots (numCVs + degree - 1 valores)
+        points (np.ndarray): CVs en espacio local del parent (N, 3)
+
+    Returns:
+        list[str]: Líneas MEL
+    """
+    points = np.asarray(points, dtype=float)
+    spans = len(points) - degree
+    values = " ".join(repr(float(v)) for v in points.ravel())
+    knot_values = " ".join(repr(float(k)) for k in knots)
+    return [
+        f"createNode nurbsCurve -n {mel_string(name)} -p {mel_string(parent)};",
+        f'setAttr {mel_string(f"{parent}|{name}.cc")} -type "nurbsCurve" '
+        f"{degree} {spans} {form} no 3 {len(knots)} {knot_values} "
+        f"{len(points)} {values};",
+    ]
+
+
+def create_curve_shape(parent, data, points=None, name=None):
+    """
+    Crea una shape NURBS directamente bajo un transform.
+
+    Args:
+        parent (str): Transform que recibirá la shape
+        data (dict): Datos de get_curve_data (degree, form, knots)
+        points (np.ndarray): CVs en espacio local del parent (default: data["points"])
+        name (str): Nombre de la shape (default: {parent}Shape)
+
+    Returns:
+        str: Nombre de la shape creada
+    """
+    name = name or f"{parent.split('|')[-1]}Shape"
+    run_mel_batch(
+        mel_create_curve_shape(
+            parent,
+            name,
+            data["degree"],
+            data["form"],
+            data["knots"],
+            data["points"] if points is None else points,
+        )
+    )
+    return name
+
+
+def get_frame_range(frames=None):
+    """
+    Normaliza una selección de frames.
+
+    Args:
+        frames: None (frame actual), tupla (inicio, fin) inclusiva, o lista de
+            frames sueltos
+
+    Returns:
+        np.ndarray: Frames (F,)
+    """
+    if frames is None:
+        return np.array([cmds.currentTime(query=True)], dtype=float)
+    if isinstance(frames, tuple) and len(frames) == 2:
+        start, end = frames
+        return np.arange(float(start), float(end) + 0.5)
+    return np.atleast_1d(np.asarray(frames, dtype=float))
+
+
+def _curve_type(plug):
+    """Tipo de animCurve que corresponde al atributo de un plug."""
+    attr = plug.attribute()
+    if attr.hasFn(om.MFn.kUnitAttribute):
+        unit = om.MFnUnitAttribute(attr).unitType()
+        if unit == om.MFnUnitAttribute.kAngle:
+            return "animCurveTA"
+        if unit == om.MFnUnitAttribute.kDistance:
+            return "animCurveTL"
+    return "animCurveTU"
+
+
+def mel_anim_curve(plug, curve_type, times, values, name=None, tangent=None):
+    """
+    Devuelve el bloque MEL que crea una animCurve con todas sus claves y la
+    conecta a un plug.
+
+    Las claves se escriben con un único setAttr sobre .ktv (como en un .ma), en
+    lugar de un setKeyframe por clave.
+
+    Args:
+        plug (str): Atributo destino ("nodo.rotateX")
+        curve_type (str): animCurveTA, animCurveTL o animCurveTU
+        times (np.ndarray): Frames (K,)
+        values (np.ndarray): Valores (K,) en unidades de la UI (grados, cm...)
+        name (str): Nombre de la curva (default: {nodo}_{atributo})
+        tangent (str): Tipo de tangente de todas las claves, por ejemplo
+            "linear" (default: el de la curva)
+
+    Returns:
+        str: Bloque MEL
+    """
+    name = name or plug.split("|")[-1].replace(".", "_")
+    pairs = " ".join(f"{float(t)!r} {float(v)!r}" for t, v in zip(times, values))
+    q = mel_string
+    tangent_line = (
+        f"keyTangent -itt {tangent} -ott {tangent} $curve; " if tangent else ""
+    )
+    return (
+        f"{{ string $curve = `createNode {curve_type} -n {q(name)}`; "
+        f'setAttr -s {len(times)} ($curve + ".ktv[0:{len(times) - 1}]") {pairs}; '
+        f"{tangent_line}"
+        f'connectAttr -f ($curve + ".output") {q(plug)}; }}'
+    )
+
+
+def mel_key_curve(plug, times, values, ranges, tangent=None, shared_curve=None):
+    """
+    Devuelve el bloque MEL que escribe claves en la animCurve que ya mueve un
+    plug, sin sustituirla.
+
+    Solo se borran las claves que caen dentro de los tramos indicados; las demás
+    conservan tiempo, valor, tangentes y pesos, y la curva su infinito.
+
+    Args:
+        plug (str): Atributo animado ("nodo.rotateX")
+        times (np.ndarray): Frames (K,)
+        values (np.ndarray): Valores (K,) en unidades de la UI (grados, cm...)
+        ranges (list[tuple]): Tramos (inicio, fin) cuyas claves se sustituyen
+        tangent (str): Tipo de tangente de las claves nuevas (default: el de Maya)
+        shared_curve (str): Curva del plug si la comparten otros atributos: se
+            duplica y la copia se conecta al plug para no tocarlos
+
+    Returns:
+        str: Bloque MEL
+    """
+    q = mel_string
+    lines = []
+    if shared_curve:
+        lines.append(
+            f"string $copy[] = `duplicate {q(shared_curve)}`; "
+            f'connectAttr -f ($copy[0] + ".output") {q(plug)};'
+        )
+    spans = " ".join(f'-t "{float(a)!r}:{float(b)!r}"' for a, b in ranges)
+    lines.append(f"cutKey -clear {spans} {q(plug)};")
+    tangent_flags = f"-itt {tangent} -ott {tangent} " if tangent else ""
+    lines += [
+        f"setKeyframe -t {float(t)!r} -v {float(v)!r} {tangent_flags}{q(plug)};"
+        for t, v in zip(times, values)
+    ]
+    return "{ " + " ".join(lines) + " }"
+
+
+def _frame_spans(frames):
+    """Tramos continuos (inicio, fin) de unos frames ordenados o sueltos."""
+    frames = np.unique(frames)
+    breaks = np.flatnonzero(np.diff(frames) > 1.0 + 1e-6) + 1
+    return [(run[0], run[-1]) for run in np.split(frames, breaks)]
+
+
+def bake_channels(channels, frames, tolerance=None, tangent=None):
+    """
+    Escribe claves en muchos atributos con una sola evaluación MEL.
+
+    Los canales sin animar reciben una animCurve nueva con todas sus claves en
+    una sola escritura. Si el canal ya tiene una animCurve, se escribe en ella:
+    solo se sustituyen las claves de los frames horneados (de todo el tramo si
+    los frames son continuos) y el resto de la curva no cambia. Una curva que
+    comparten varios atributos se duplica antes para este canal.
+
+    Antes de escribir nada se comprueba que ningún canal esté bloqueado ni
+    animado con una curva de una referencia; si los hay, no se escribe ninguno.
+
+    Args:
+        channels (dict): {"nodo.atributo": valores (F,)} en unidades de la UI
+        frames (np.ndarray): Frames de las claves (F,)
+        tolerance (float): Si se indica, se eliminan las claves que la
+            interpolación lineal reproduce con un error menor (rig_math.reduce_keys)
+        tangent (str): Tipo de tangente de las claves nuevas
+            (default: "linear" si hay tolerance, el de Maya si no)
+
+    Returns:
+        int: Número de canales escritos
+    """
+    from Tools import rig_math
+
+    frames = np.asarray(frames, dtype=float)
+    if not channels or not len(frames):
+        return 0
+    if tolerance is not None and tangent is None:
+        tangent = "linear"
+    plug_names = list(channels)
+    sel = _selection(plug_names)
+
+    # --- Comprobación previa: el lote no debe fallar a medias ---
+    curves, blocked = {}, []
+    for i, name in enumerate(plug_names):
+        plug = sel.getPlug(i)
+        source = plug.source()
+        if plug.isLocked:
+            blocked.append(name)
+        elif not source.isNull and source.node().hasFn(om.MFn.kAnimCurve):
+            curve = om.MFnDependencyNode(source.node())
+            if curve.isFromReferencedFile:
+                blocked.append(name)
+            else:
+                shared = len(source.destinations()) > 1
+                curves[name] = curve.name() if shared else None
+    if blocked:
+        cmds.warning(
+            f"⚠️ Canales bloqueados o con curvas referenciadas, no se escribe "
+            f"ninguna clave: {blocked}"
+        )
+        return 0
+
+    spans = _frame_spans(frames)
+    lines = []
+    for i, name in enumerate(plug_names):
+        times, values = frames, np.asarray(channels[name], dtype=float)
+        if tolerance is not None:
+            keys = rig_math.reduce_keys(times, values, tolerance)
+            times, values = times[keys], values[keys]
+
+        if name in curves:
+            lines.append(
+                mel_key_curve(name, times, values, spans, tangent, curves[name])
+            )
+        else:
+            lines.append(
+                mel_anim_curve(
+                    name, _curve_type(sel.getPlug(i)), times, values, tangent=tangent
+                )
+            )
+    run_mel_batch(lines)
+    return len(plug_names)
@@ -0,0 +1,201 @@
+"""
+Tools - Registro de herramientas
+===============================
+
+Registro central de las herramientas que aparecen en el Rigging Tools Launcher.
+Cada herramienta declara su punto de entrada como texto ("paquete.modulo:funcion")
+y el módulo solo se importa la primera vez que se usa.
+
+También incluye utilidades para cachear ventanas: en lugar de destruir y
+reconstruir una interfaz cada vez que se abre, se oculta al cerrarla y se vuelve
+a mostrar la existente. Cada cambio del registro incrementa su versión; las
+ventanas construidas a partir del registro (el launcher) se reconstruyen si la
+versión con la que se crearon ya no es la actual. Las ventanas guardan también
+el módulo que las construye, para descartarlas cuando ese módulo se recarga en
+caliente (Remote.reloader) y no seguir llamando a funciones antiguas.
+
+Uso:
+    >>> from Tools import tool_registry
+    >>> tool_registry.register_tool(
+    ...     "my_tool", "🧰 Mi herramienta", "My_Package.my_ui:open_ui"
+    ... )
+    >>> tool_registry.launch("my_tool")
+"""
+
+import importlib
+
+import maya.cmds as cmds
+
+
+_tools = {}
+_resolved = {}
+_version = 0
+_window_versions = {}
+# Se conserva al recargar este módulo: las ventanas siguen abiertas en Maya
+_window_owners = globals().get("_window_owners", {})
+
+
+def register_tool(name, label, entry_point, bgc=(0.4, 0.4, 0.4), height=40):
+    """
+    Registra una herramienta en el launcher.
+
+    Args:
+        name (str): Identificador único de la herramienta
+        label (str): Texto del botón en el launcher
+        entry_point (str): Punto de entrada con formato "paquete.modulo:funcion"
+        bgc (tuple): Color de fondo del botón (default: gris)
+        height (int): Altura del botón (default: 40)
+
+    Returns:
+        dict: Entrada registrada
+    """
+    if ":" not in entry_point:
+        raise ValueError(
+            f"Punto de entrada inválido '{entry_point}' (se espera 'modulo:funcion')."
+        )
+
+    entry = {
+        "name": name,
+        "label": label,
+        "entry_point": entry_point,
+        "bgc": bgc,
+        "height": height,
+    }
+    _tools[name] = entry
+    _resolved.pop(name, None)
+    _bump_version()
+    return entry
+
+
+def unregister_tool(name):
+    """Elimina una herramienta del registro."""
+    if _tools.pop(name, None) is not None:
+        _bump_version()
+    _resolved.pop(name, None)
+
+
+def _bump_version():
+    global _version
+    _version += 1
+
+
+def get_version():
+    """Versión del registro: cambia cada vez que se añade o quita una herramienta."""
+    return _version
+
+
+def get_tools():
+    """Devuelve las herramientas registradas en orden de registro."""
+    return list(_tools.values())
+
+
+def resolve(name):
+    """
+    Importa (solo la primera vez) y devuelve la función de una herramienta.
+
+    Args:
+        name (str): Identificador de la herramienta
+
+    Returns:
+        callable: Función de entrada de la herramienta
+    """
+    if name not in _resolved:
+        if name not in _tools:
+            raise KeyError(f"Herramienta no registrada: {name}")
+        module_name, func_name = _tools[name]["entry_point"].split(":", 1)
+        module = importlib.import_module(module_name)
+        _resolved[name] = getattr(module, func_name)
+    return _resolved[name]
+
+
+def clear_resolved():
+    """Olvida las funciones ya importadas (tras recargar módulos en caliente)."""
+    _resolved.clear()
+
+
+def launch(name, *args, **kwargs):
+    """Ejecuta la función de entrada de una herramienta registrada."""
+    return resolve(name)(*args, **kwargs)
+
+
+def show_cached_window(window_name, rebuild=False, version=None, owner=None):
+    """
+    Vuelve a mostrar una ventana existente en lugar de reconstruirla.
+
+    Args:
+        window_name (str): Nombre de la ventana de Maya
+        rebuild (bool): Si es True, elimina la ventana para reconstruirla
+        version: Versión de los datos con los que se construye la ventana
+            (p. ej. get_version()); si cambió desde que se creó, se reconstruye
+        owner (str): Módulo que construye la ventana (normalmente __name__)
+
+    Returns:
+        bool: True si la ventana ya existía y se mostró, False si hay que construirla
+    """
+    stale = version is not None and _window_versions.get(window_name) != version
+    if version is not None:
+        _window_versions[window_name] = version
+    if owner:
+        _window_owners[window_name] = owner
+    if not cmds.window(window_name, exists=True):
+        return False
+    if rebuild or stale:
+        cmds.deleteUI(window_name)
+        return False
+    cmds.showWindow(window_name)
+    return True
+
+
+def discard_windows(modules):
+    """
+    Elimina las ventanas cacheadas construidas por los módulos indicados.
+
+    Args:
+        modules (list[str]): Módulos recargados
+
+    Returns:
+        list[str]: Ventanas eliminadas (se reconstruyen al volver a abrirlas)
+    """
+    modules = set(modules)
+    discarded = []
+    for window_name, owner in list(_window_owners.items()):
+        if owner not in modules:
+            continue
+        del _window_owners[window_name]
+        if cmds.window(window_name, exists=True):
+            cmds.deleteUI(window_name)
+            discarded.append(window_name)
+    return discarded
+
+
+def hide_window(window_name):
+    """Oculta una ventana cacheada sin destruirla."""
+    if cmds.window(window_name, exists=True):
+        cmds.window(window_name, edit=True, visible=False)
+
+
+# Herramientas incluidas en el repositorio
+register_tool(
+    "auto_tail",
+    "🐍 Auto Tail Rig Tool",
+    "Auto_Tail.at_ui:auto_tail_ui",
+    bgc=(0.3, 0.5, 0.8),
+)
+register_tool(
+    "spine_auto_rig",
+    "🦴 Spine Auto Rig Tool",
+    "Auto_Column.spline_auto_rig:open_spine_auto_rig_ui",
+    bgc=(0.4, 0.7, 0.6),
+)
+register_tool(
+    "ikfk_tools",
+    "🔗 IK / FK Rig Tools",
+    "Auto_Chain_IKFK.select_tool:open_ui",
+    bgc=(0.6, 0.6, 0.4),
+)
+register_tool(
+    "clear_chain",
+    "🧹 Limpiar Cadena (Clear Rig)",
+    "Tools.clear_chain:create_clean_chain_from_selection",
+    bgc=(0.5, 0.7, 0.9),
+)
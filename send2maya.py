@@ -1,21 +1,211 @@
-import socket
+import argparse
+import json
 import sys
 from pathlib import Path
 
-HOST = "127.0.0.1"
-PORT = 4434
+from Remote import client, dispatcher, protocol, reloader, server, watcher
 
+HOST = client.HOST
+PORT = client.PORT
 
-def enviar_archivo_a_maya(file_path: str):
+
+# Transporte de las llamadas: "commandPort" o "server" (Remote.server en Maya)
+TRANSPORT = "commandPort"
+
+
+def _get_client(host, port):
+    if TRANSPORT == "server":
+        # Los logs del servidor llegan en vivo mientras Maya ejecuta
+        return client.get_client(
+            host, port, transport="server", on_log=lambda _, text: print(text, end="")
+        )
+    return client.get_client(host, port)
+
+
+def enviar_archivo_a_maya(file_path: str, host: str = HOST, port: int = PORT):
+    """
+    Ejecuta un archivo en Maya y muestra el resultado.
+
+    Returns:
+        bool: True si se ejecutó sin errores
+    """
     safe_path = str(file_path).replace("\\", "/")
-    maya_cmd = f"exec(open(r'{safe_path}', encoding='utf-8').read())"
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.connect((HOST, PORT))
-            s.send(f'python("{maya_cmd}")\r\n'.encode())
-            print(f"✅ Ejecutado en Maya con UTF-8: {safe_path}")
-    except Exception as e:
+        reply = _get_client(host, port).exec_file(safe_path, raise_errors=False)
+    except (OSError, protocol.ProtocolError) as e:
+        print("❌ Error:", e)
+        return False
+
+    if reply.get("output") and TRANSPORT != "server":
+        print(reply["output"], end="")
+    if not reply.get("ok"):
+        print(f"❌ Error en Maya al ejecutar {safe_path}: {reply.get('error')}")
+        print(reply.get("traceback", ""))
+        return False
+    print(f"✅ Ejecutado en Maya con UTF-8: {safe_path}")
+    return True
+
+
+def recargar_en_maya(files=(), host: str = HOST, port: int = PORT):
+    """
+    Recarga en Maya los módulos cambiados (y los indicados) con sus dependientes.
+
+    Returns:
+        bool: True si todos los módulos se recargaron sin errores
+    """
+    modules = [reloader.module_name_from_path(f) or str(f) for f in files]
+    try:
+        result = _get_client(host, port).reload(modules)
+    except (OSError, protocol.ProtocolError, protocol.RemoteError) as e:
         print("❌ Error:", e)
+        return False
+
+    for name in result["reloaded"]:
+        print(f"🔄 Recargado en Maya: {name}")
+    for name in result.get("windows", []):
+        print(f"🗑️ Ventana descartada (se reconstruye al abrirla): {name}")
+    for name, error in result["errors"].items():
+        print(f"❌ Error recargando {name}: {error}")
+    if not result["reloaded"] and not result["errors"]:
+        print("✅ No hay módulos cambiados que recargar.")
+    return not result["errors"]
+
+
+def repartir_en_maya(files, endpoints):
+    """
+    Reparte la ejecución de varios archivos entre varias instancias de Maya.
+
+    Returns:
+        bool: True si todos los archivos se ejecutaron sin errores
+    """
+    jobs = [
+        {"op": "exec_file", "path": str(Path(f).resolve()).replace("\\", "/")}
+        for f in files
+    ]
+    results = dispatcher.dispatch(jobs, endpoints)
+    for res in results:
+        host, port = res.endpoint or ("?", "?")
+        if res.ok:
+            print(f"✅ [{host}:{port}] {res.job['path']}")
+        else:
+            print(f"❌ [{host}:{port}] {res.job['path']}: {res.error}")
+    return all(res.ok for res in results)
+
+
+def llamar_en_maya(name, arguments="[]", bundle=False, host=HOST, port=PORT):
+    """
+    Llama a una función registrada en Remote.rpc con argumentos JSON.
+
+    Args:
+        name (str): Nombre de la llamada ("create_ik_system", ...)
+        arguments (str): Lista JSON (posicionales) u objeto JSON (por nombre)
+        bundle (bool): Enviar antes el código del repositorio en memoria
+
+    Returns:
+        bool: True si la llamada terminó sin errores
+    """
+    parsed = json.loads(arguments)
+    args, kwargs = (parsed, {}) if isinstance(parsed, list) else ([], parsed)
+    maya = _get_client(host, port)
+    try:
+        if bundle:
+            print(f"📦 Bundle enviado: {len(maya.push_bundle())} módulos")
+        result = maya.rpc(name, *args, **kwargs)
+    except (OSError, protocol.ProtocolError, protocol.RemoteError) as e:
+        print("❌ Error:", e)
+        return False
+    print(f"✅ {name} → {json.dumps(result, default=repr)}")
+    return True
+
+
+def vigilar_y_recargar(host: str = HOST, port: int = PORT):
+    """Recarga en Maya los módulos afectados cada vez que se guardan cambios."""
+    print("👀 Vigilando cambios (Ctrl+C para salir)...")
+    maya = _get_client(host, port)
+    try:
+        for batch, result in watcher.watch_and_reload(maya):
+            print(f"📝 {len(batch)} archivo(s) cambiado(s)")
+            if isinstance(result, Exception):
+                print("❌ Error:", result)
+                continue
+            for name in result["reloaded"]:
+                print(f"🔄 Recargado en Maya: {name}")
+            for name, error in result["errors"].items():
+                print(f"❌ Error recargando {name}: {error}")
+    except KeyboardInterrupt:
+        print("👋 Vigilancia detenida.")
+    return True
+
+
+def _endpoint(text):
+    host, _, port = text.rpartition(":")
+    return (host or HOST, int(port))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ejecuta archivos .py en Maya.")
+    parser.add_argument("files", nargs="*", help="Archivos .py a ejecutar")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument(
+        "--server",
+        action="store_true",
+        help="Usar el servidor de comandos de Remote.server (puerto 4450 por defecto)",
+    )
+    parser.add_argument(
+        "--endpoint",
+        action="append",
+        type=_endpoint,
+        help="host:puerto de otra instancia de Maya (repetible); "
+        "los archivos se reparten entre todas",
+    )
+    parser.add_argument(
+        "--call",
+        metavar="NOMBRE",
+        help="Llamar a una función registrada en Remote.rpc",
+    )
+    parser.add_argument(
+        "--args",
+        default="[]",
+        help='Argumentos JSON de --call: lista ["a", 1] u objeto {"clave": 1}',
+    )
+    parser.add_argument(
+        "--bundle",
+        action="store_true",
+        help="Enviar el código del repositorio en memoria antes de --call",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Vigilar los paquetes y recargar en Maya lo que cambie",
+    )
+    parser.add_argument(
+        "--reload",
+        action="store_true",
+        help="Recargar los módulos cambiados en lugar de ejecutar los archivos",
+    )
+    args = parser.parse_args(argv)
+
+    global TRANSPORT
+    TRANSPORT = "server" if args.server else "commandPort"
+    if args.port is None:
+        args.port = server.SERVER_PORT if args.server else PORT
+
+    if args.call:
+        ok = llamar_en_maya(args.call, args.args, args.bundle, args.host, args.port)
+    elif args.watch:
+        ok = vigilar_y_recargar(args.host, args.port)
+    elif args.reload:
+        ok = recargar_en_maya(args.files, args.host, args.port)
+    elif args.endpoint:
+        ok = repartir_en_maya(args.files, args.endpoint)
+    else:
+        # Todos los archivos reutilizan la misma conexión
+        ok = True
+        for file_path in args.files:
+            ok &= enviar_archivo_a_maya(Path(file_path).resolve(), args.host, args.port)
+    client.close_all()
+    return 0 if ok else 1
 
 
 if __name__ == "__main__":
@@ -23,5 +213,4 @@ if __name__ == "__main__":
         print("⚠️ Pasa el archivo .py como argumento")
         sys.exit(1)
 
-    file_path = Path(sys.argv[1]).resolve()
-    enviar_archivo_a_maya(file_path)
+    sys.exit(main())